@@ -8,9 +8,13 @@ This module exposes REST API endpoints for:
 4. Resource allocation insights
 """
 
-from typing import Dict, List, Any, Optional
-from fastapi import APIRouter, HTTPException, Query, Depends
+from typing import Callable, Dict, List, Any, Optional, Tuple, Type
+from fastapi import APIRouter, HTTPException, Query, Depends, File, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
+from contextlib import asynccontextmanager
+import io
 import logging
 from datetime import datetime
 
@@ -24,11 +28,33 @@ from ..services.dss_service import (
     EligibilityStatus,
     InterventionPriority
 )
+from ..services.dss_streaming import iter_villages, iter_holders, detect_format, iter_line_batches
+from ..services.dss_parallel import bulk_eligibility_executor
+from ..services.dss_aggregates import dss_aggregates
+from ..services.dss_cache import eligibility_cache
+from ..services.dss_scenarios import ScenarioVariant
+from ..services.dss_join import VillageView
+from ..services.dss_village_store import village_store
+from ..services.dss_peers import PEER_FEATURES, village_peer_index
+from ..services.dss_analytics import dss_analytics
+from ..services.dss_eligibility_index import eligibility_index
+from ..services.dss_rule_impact import holder_attribute_index
+from ..services.dss_json import DSSJSONResponse, dumps, projection
+from ..services.dss_ingest import TableValidationError, detect_table_format, read_holder_columns, read_village_columns
+from ..services.dss_jobs import PolicyJob, policy_jobs, SOURCE_AGGREGATES, SOURCE_STORED, JOB_FAILED
 
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def dss_lifespan(app):
+    """Restore the persisted FRA holders on startup; write pending index changes and analytics counters on shutdown"""
+    await run_in_threadpool(restore_stored_holders)
+    yield
+    await run_in_threadpool(eligibility_index.close)
+    await run_in_threadpool(dss_analytics.close)
+
 # Initialize router
-router = APIRouter(prefix="/dss", tags=["Decision Support System"])
+router = APIRouter(prefix="/dss", tags=["Decision Support System"], lifespan=dss_lifespan)
 
 # Request/Response models
 class FRAHolderRequest(BaseModel):
@@ -86,6 +112,11 @@ class SchemeEligibilityResponse(BaseModel):
     required_documents: List[str]
     timeline_months: Optional[int] = None
 
+class BulkSchemeEligibilityResponse(SchemeEligibilityResponse):
+    """Scheme eligibility in bulk responses, where exclude_fields may omit the reasons and documents"""
+    reasons: Optional[List[str]] = None
+    required_documents: Optional[List[str]] = None
+
 class InterventionRecommendationResponse(BaseModel):
     """Response model for intervention recommendations"""
     village_code: str
@@ -99,6 +130,10 @@ class InterventionRecommendationResponse(BaseModel):
     impact_score: float = Field(ge=0.0, le=1.0)
     reasoning: str
 
+class BulkInterventionRecommendationResponse(InterventionRecommendationResponse):
+    """Intervention recommendation in bulk responses, where exclude_fields may omit the reasoning"""
+    reasoning: Optional[str] = None
+
 class PolicyRecommendationsResponse(BaseModel):
     """Response model for policy recommendations"""
     summary: Dict[str, Any]
@@ -111,12 +146,141 @@ class PolicyRecommendationsResponse(BaseModel):
 class EligibilityAnalysisRequest(BaseModel):
     """Request for bulk eligibility analysis"""
     fra_holders: List[FRAHolderRequest]
-    schemes_filter: Optional[List[str]] = None
+    schemes_filter: Optional[List[str]] = Field(default=None, description="Only assess these schemes")
+    exclude_fields: Optional[List[str]] = Field(default=None, description="Result fields to omit, e.g. reasons and required_documents")
+
+class StoredVillageSelection(BaseModel):
+    """Villages taken from the server-side profile store, by code and/or admin region"""
+    village_codes: Optional[List[str]] = None
+    state: Optional[str] = None
+    district: Optional[str] = None
+    block: Optional[str] = None
 
 class VillageAnalysisRequest(BaseModel):
     """Request for bulk village analysis"""
+    villages: List[VillageProfileRequest] = Field(default_factory=list)
+    stored: Optional[StoredVillageSelection] = Field(default=None, description="Add villages from the profile store instead of sending full profiles")
+    priority_filter: Optional[str] = Field(default=None, description="Only build interventions of this priority")
+    exclude_fields: Optional[List[str]] = Field(default=None, description="Result fields to omit, e.g. reasoning")
+
+class TopPriorityRequest(BaseModel):
+    """Request for top-K priority villages or interventions"""
+    villages: List[VillageProfileRequest] = Field(default_factory=list)
+    stored: Optional[StoredVillageSelection] = Field(default=None, description="Add villages from the profile store instead of sending full profiles")
+    k: int = Field(default=100, gt=0, le=10000)
+    state: Optional[str] = None
+    district: Optional[str] = None
+    intervention_type: Optional[str] = None
+
+class PriorityVillageResponse(BaseModel):
+    """Response model for a ranked priority village"""
+    village_code: str
+    village_name: str
+    district: str
+    state: str
+    top_impact_score: float = Field(ge=0.0, le=1.0)
+    interventions: List[InterventionRecommendationResponse]
+
+class ScenarioVariantRequest(BaseModel):
+    """Rule parameter overrides for one what-if scenario"""
+    name: str
+    scheme_rules: Dict[str, Dict[str, Any]] = Field(default_factory=dict, description="Overrides keyed by scheme, e.g. {\"PM_KISAN\": {\"max_annual_income\": 250000}}")
+    intervention_rules: Dict[str, Dict[str, Any]] = Field(default_factory=dict, description="Overrides keyed by intervention type, e.g. {\"water_infrastructure\": {\"trigger_conditions\": [\"water_index < 60\"]}}")
+
+class ScenarioRequest(BaseModel):
+    """Request to compare rule variants against one population"""
+    villages: List[VillageProfileRequest]
+    fra_holders: List[FRAHolderRequest]
+    variants: List[ScenarioVariantRequest] = Field(min_length=1, max_length=64)
+    include_baseline: bool = True
+
+class BudgetOptimizationRequest(BaseModel):
+    """Request to fund the most valuable interventions within per-ministry or per-state budgets"""
+    villages: List[VillageProfileRequest] = Field(default_factory=list)
+    stored: Optional[StoredVillageSelection] = Field(default=None, description="Add villages from the profile store instead of sending full profiles")
+    budgets: Dict[str, float] = Field(min_length=1, description="Budget per implementing ministry or state (annual when years > 1)")
+    group_by: str = Field(default="ministry", pattern="^(ministry|state)$")
+    years: int = Field(default=1, ge=1, le=20, description="Phase the plan over this many years; unspent budget carries over")
+    intervention_types: Optional[List[str]] = Field(default=None, description="Only consider these intervention types")
+    max_listed: int = Field(default=1000, ge=0, description="Cap on listed funded interventions")
+
+class InterventionClusterRequest(BaseModel):
+    """Request to cluster neighbouring priority villages for bundled procurement"""
+    villages: List[VillageProfileRequest] = Field(default_factory=list)
+    stored: Optional[StoredVillageSelection] = Field(default=None, description="Add villages from the profile store instead of sending full profiles")
+    priorities: List[str] = Field(default_factory=lambda: ["CRITICAL"], min_length=1, description="Cluster villages with interventions of these priorities")
+    intervention_types: Optional[List[str]] = Field(default=None, description="Only consider these intervention types")
+    eps_km: float = Field(default=5.0, gt=0, le=500, description="Neighbourhood radius in km")
+    min_villages: int = Field(default=3, ge=1, description="Villages within eps_km (itself included) that make a village a cluster core")
+    max_listed: int = Field(default=1000, ge=0, description="Cap on listed clusters")
+    max_listed_villages: Optional[int] = Field(default=None, ge=0, description="Cap on village codes listed per cluster")
+
+class CohortTermRequest(BaseModel):
+    """One (scheme, status) condition of an eligibility cohort"""
+    scheme: SchemeType
+    status: EligibilityStatus
+
+class EligibilityCohortRequest(BaseModel):
+    """Cohort of indexed FRA holders selected by eligibility status and region"""
+    all_of: List[CohortTermRequest] = Field(default_factory=list, description="Holders must match every condition")
+    any_of: List[CohortTermRequest] = Field(default_factory=list, description="Holders must match at least one condition")
+    none_of: List[CohortTermRequest] = Field(default_factory=list, description="Holders must match none of the conditions")
+    state: Optional[str] = None
+    district: Optional[str] = Field(default=None, description="Requires state")
+    include_status_counts: bool = Field(default=False, description="Also count the cohort per scheme and status")
+    offset: int = Field(default=0, ge=0)
+    limit: int = Field(default=1000, ge=0, le=100000, description="Cap on listed holder_ids")
+
+class RuleImpactRequest(BaseModel):
+    """Proposed scheme threshold changes to check against the stored FRA holders"""
+    scheme_rules: Dict[str, Dict[str, Any]] = Field(min_length=1, description="Overrides keyed by scheme, e.g. {\"PM_KISAN\": {\"max_annual_income\": 250000}}")
+    max_listed: int = Field(default=1000, ge=0, description="Cap on listed status changes")
+
+class GapCubeRequest(BaseModel):
+    """Request for hierarchical coverage gap rollups"""
+    villages: List[VillageProfileRequest]
+    fra_holders: List[FRAHolderRequest] = Field(default_factory=list)
+
+class VillageViewRequest(BaseModel):
+    """Request for combined per-village views"""
     villages: List[VillageProfileRequest]
-    priority_filter: Optional[str] = None
+    fra_holders: List[FRAHolderRequest]
+    village_codes: Optional[List[str]] = None
+
+class VillageViewResponse(BaseModel):
+    """Response model for a village joined with its FRA holders"""
+    village_code: str
+    village_name: Optional[str] = None
+    district: Optional[str] = None
+    state: Optional[str] = None
+    holder_count: int
+    individual_benefits: float
+    eligibility_counts: Dict[str, Dict[str, int]]
+    interventions: List[InterventionRecommendationResponse]
+    intervention_cost: float
+    total_investment: float
+
+class PolicyJobReferenceRequest(BaseModel):
+    """Request for a background policy job over data already held by the server"""
+    source: str = Field(pattern=f"^({SOURCE_STORED}|{SOURCE_AGGREGATES})$", description="'stored' datasets under DSS_DATA_DIR or the 'aggregates' store")
+    villages_dataset: Optional[str] = Field(default=None, description="Stored village dataset (NDJSON or CSV), required for source 'stored'")
+    holders_dataset: Optional[str] = Field(default=None, description="Stored FRA holder dataset (NDJSON or CSV), required for source 'stored'")
+    max_listed_per_section: int = Field(default=1000, ge=0)
+
+class PolicyJobResponse(BaseModel):
+    """Status of a background policy job"""
+    job_id: str
+    source: str
+    status: str
+    progress: float = Field(ge=0.0, le=100.0)
+    created_at: str
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    error: Optional[str] = None
+    inputs: Dict[str, str]
+    records_processed: int
+    scheme_rules_version: Optional[str] = None
+    summary: Optional[Dict[str, Any]] = None
 
 # Helper functions
 def convert_fra_holder_request(request: FRAHolderRequest) -> FRAHolder:
@@ -168,6 +332,60 @@ def convert_village_request(request: VillageProfileRequest) -> VillageProfile:
         longitude=request.longitude
     )
 
+def matches_admin_filter(village: VillageProfile, stored: StoredVillageSelection) -> bool:
+    return (
+        (stored.state is None or village.state == stored.state)
+        and (stored.district is None or village.district == stored.district)
+        and (stored.block is None or village.block == stored.block)
+    )
+
+def resolve_villages(villages: List[VillageProfileRequest], stored: Optional[StoredVillageSelection]) -> List[VillageProfile]:
+    """
+    Submitted village profiles followed by those selected from the profile store
+    
+    Stored villages are selected by village_codes (in request order) or, without
+    codes, by admin region. Unknown village codes raise a 404.
+    """
+    profiles = [convert_village_request(v) for v in villages]
+    if stored is None:
+        return profiles
+    
+    if stored.village_codes is not None:
+        found, missing = village_store.get_many(stored.village_codes)
+        if missing:
+            raise HTTPException(status_code=404, detail={"message": "Villages not in the profile store", "village_codes": missing[:100]})
+        selected = [v for v in found if matches_admin_filter(v, stored)]
+    else:
+        selected = village_store.select(stored.state, stored.district, stored.block)
+    return profiles + selected
+
+def convert_village_view_response(view: VillageView) -> VillageViewResponse:
+    """Convert domain model to response model"""
+    return VillageViewResponse(
+        village_code=view.village_code,
+        village_name=view.village.village_name if view.village else None,
+        district=view.village.district if view.village else None,
+        state=view.village.state if view.village else None,
+        holder_count=view.holder_count,
+        individual_benefits=view.individual_benefits,
+        eligibility_counts=view.eligibility_counts,
+        interventions=[convert_intervention_response(i) for i in view.interventions],
+        intervention_cost=view.intervention_cost,
+        total_investment=view.total_investment
+    )
+
+def convert_scenario_variant_request(request: ScenarioVariantRequest) -> ScenarioVariant:
+    """Convert request model to domain model; raises ValueError for unknown schemes"""
+    return ScenarioVariant(
+        name=request.name,
+        scheme_rules={SchemeType(scheme): overrides for scheme, overrides in request.scheme_rules.items()},
+        intervention_rules=request.intervention_rules
+    )
+
+def convert_policy_job_response(job: PolicyJob) -> PolicyJobResponse:
+    """Convert a background job to its status response"""
+    return PolicyJobResponse(**{name: value for name, value in job.to_dict().items() if name in PolicyJobResponse.model_fields})
+
 def convert_eligibility_response(eligibility: SchemeEligibility) -> SchemeEligibilityResponse:
     """Convert domain model to response model"""
     return SchemeEligibilityResponse(
@@ -195,6 +413,126 @@ def convert_intervention_response(intervention: InterventionRecommendation) -> I
         reasoning=intervention.reasoning
     )
 
+def convert_priority_village_response(village: VillageProfile, interventions: List[InterventionRecommendation]) -> PriorityVillageResponse:
+    """Convert a ranked village and its interventions to a response model"""
+    return PriorityVillageResponse(
+        village_code=village.village_code,
+        village_name=village.village_name,
+        district=village.district,
+        state=village.state,
+        top_impact_score=max(i.impact_score for i in interventions),
+        interventions=[convert_intervention_response(i) for i in interventions]
+    )
+
+def parse_schemes_filter(schemes_filter: Optional[List[str]]) -> Optional[List[SchemeType]]:
+    """Schemes named in a schemes_filter, or None for every scheme; unknown names match nothing"""
+    if not schemes_filter:
+        return None
+    return [scheme for scheme in SchemeType if scheme.value in schemes_filter]
+
+def parse_priority_filter(priority_filter: Optional[str]) -> Optional[InterventionPriority]:
+    """Priority named in a priority_filter (case-insensitive), or None for every priority"""
+    if not priority_filter:
+        return None
+    try:
+        return InterventionPriority(priority_filter.upper())
+    except ValueError:
+        raise ValueError(f"Unknown priority_filter '{priority_filter}'; use one of {', '.join(p.value for p in InterventionPriority)}")
+
+def parse_priorities(priorities: List[str]) -> List[InterventionPriority]:
+    """Priorities named in a request (case-insensitive)"""
+    unknown = [p for p in priorities if p.upper() not in InterventionPriority.__members__]
+    if unknown:
+        raise ValueError(f"Unknown priorities {', '.join(unknown)}; use any of {', '.join(p.value for p in InterventionPriority)}")
+    return [InterventionPriority(p.upper()) for p in priorities]
+
+def excludable_fields(response_model: Type[BaseModel]) -> List[str]:
+    """Fields exclude_fields may drop: those the response model does not require"""
+    return [name for name, field in response_model.model_fields.items() if not field.is_required()]
+
+def project_results(results: List[Any], project: Optional[Callable[[Any], Dict[str, Any]]]) -> List[Any]:
+    """Apply an exclude_fields projection to engine results"""
+    return results if project is None else [project(result) for result in results]
+
+def evaluate_holder_lines(
+    batch: List[Tuple[int, str]],
+    schemes: Optional[List[SchemeType]],
+    project: Optional[Callable[[Any], Dict[str, Any]]] = None
+) -> List[bytes]:
+    """Validate and assess a batch of NDJSON FRA holder lines; one output line per input line, in order"""
+    parsed = []
+    for line_number, text in batch:
+        try:
+            parsed.append((line_number, convert_fra_holder_request(FRAHolderRequest.model_validate_json(text))))
+        except ValueError as e:
+            parsed.append((line_number, e))
+    
+    holders = [holder for _, holder in parsed if isinstance(holder, FRAHolder)]
+    assessed = iter(eligibility_cache.assess_many(holders, schemes))
+    
+    output = []
+    for line_number, holder in parsed:
+        if not isinstance(holder, FRAHolder):
+            output.append(dumps({"line": line_number, "error": str(holder)}))
+            continue
+        eligibilities = next(assessed)
+        dss_analytics.record_eligibility(holder, eligibilities)
+        output.append(dumps({"holder_id": holder.holder_id, "eligibilities": project_results(eligibilities, project)}))
+    return output
+
+def evaluate_village_lines(
+    batch: List[Tuple[int, str]],
+    priority: Optional[InterventionPriority],
+    project: Optional[Callable[[Any], Dict[str, Any]]] = None
+) -> List[bytes]:
+    """Validate and prioritize a batch of NDJSON village lines; one output line per input line, in order"""
+    output = []
+    for line_number, text in batch:
+        try:
+            village = convert_village_request(VillageProfileRequest.model_validate_json(text))
+        except ValueError as e:
+            output.append(dumps({"line": line_number, "error": str(e)}))
+            continue
+        interventions = dss_engine.prioritize_village_interventions(village, priority)
+        dss_analytics.record_interventions(village, interventions)
+        output.append(dumps({"village_code": village.village_code, "interventions": project_results(interventions, project)}))
+    return output
+
+def evaluate_villages(
+    villages: List[VillageProfileRequest],
+    stored: Optional[StoredVillageSelection],
+    priority: Optional[InterventionPriority],
+    project: Optional[Callable[[Any], Dict[str, Any]]] = None
+) -> Dict[str, List[Any]]:
+    """Resolve submitted and stored villages and prioritize the interventions of each, keyed by village_code"""
+    results = {}
+    for village in resolve_villages(villages, stored):
+        interventions = dss_engine.prioritize_village_interventions(village, priority)
+        dss_analytics.record_interventions(village, interventions)
+        results[village.village_code] = project_results(interventions, project)
+    return results
+
+def restore_stored_holders() -> int:
+    """
+    Rebuild the aggregate store and attribute indexes from the holders persisted with the eligibility index
+
+    The index file is the one persisted copy of the stored FRA holders; the in-memory
+    aggregates are restored from it after a restart (and the index itself re-assessed
+    when the scheme rules changed since it was saved).
+    """
+    holders = eligibility_index.stored_holders()
+    if not holders:
+        return 0
+    eligibilities = eligibility_cache.assess_many(holders)
+    for holder, results in zip(holders, eligibilities):
+        dss_aggregates.add_holder(holder, results)
+    holder_attribute_index.rebuild(holders)
+    if eligibility_index.stale:
+        eligibility_index.rebuild(holders)
+        eligibility_index.request_save()
+    logger.info(f"Restored {len(holders)} stored FRA holders from the eligibility index")
+    return len(holders)
+
 # API Endpoints
 
 @router.get("/health")
@@ -219,48 +557,219 @@ async def assess_individual_eligibility(fra_holder: FRAHolderRequest):
         # Convert request to domain model
         holder = convert_fra_holder_request(fra_holder)
         
-        # Assess eligibility using DSS engine
-        eligibilities = dss_engine.assess_individual_eligibility(holder)
+        # Assess eligibility using DSS engine (cached by holder content and rules version)
+        eligibilities = eligibility_cache.assess(holder)
+        dss_analytics.record_eligibility(holder, eligibilities)
         
-        # Convert to response models
-        response = [convert_eligibility_response(e) for e in eligibilities]
-        
-        logger.info(f"Assessed eligibility for FRA holder {fra_holder.holder_id}: {len(response)} schemes evaluated")
-        return response
+        # Encode the engine dataclasses directly; their fields match SchemeEligibilityResponse
+        logger.info(f"Assessed eligibility for FRA holder {fra_holder.holder_id}: {len(eligibilities)} schemes evaluated")
+        return DSSJSONResponse(eligibilities)
         
     except Exception as e:
         logger.error(f"Error assessing individual eligibility: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing eligibility assessment: {str(e)}")
 
-@router.post("/eligibility/bulk", response_model=Dict[str, List[SchemeEligibilityResponse]])
+@router.post("/eligibility/bulk", response_model=Dict[str, List[BulkSchemeEligibilityResponse]])
 async def assess_bulk_eligibility(request: EligibilityAnalysisRequest):
     """
     Assess CSS scheme eligibility for multiple FRA holders
     
-    Optionally filter by specific schemes using schemes_filter parameter
+    Optionally assess only specific schemes using schemes_filter (the other schemes'
+    rules are not evaluated) and omit result fields using exclude_fields.
+    Previously assessed holders are served from the eligibility cache; the remaining
+    holders are assessed across a process pool when they exceed DSS_BULK_SHARD_SIZE.
     """
     try:
         results = {}
+        schemes = parse_schemes_filter(request.schemes_filter)
+        project = projection(SchemeEligibility, request.exclude_fields, excludable_fields(BulkSchemeEligibilityResponse))
+        holders = [convert_fra_holder_request(h) for h in request.fra_holders]
+        all_eligibilities, missing, rules_version = eligibility_cache.lookup_many(holders, schemes)
         
-        for fra_holder_req in request.fra_holders:
-            # Convert and assess
-            holder = convert_fra_holder_request(fra_holder_req)
-            eligibilities = dss_engine.assess_individual_eligibility(holder)
-            
-            # Filter by schemes if specified
-            if request.schemes_filter:
-                eligibilities = [e for e in eligibilities if e.scheme.value in request.schemes_filter]
-            
-            # Convert to response
-            results[fra_holder_req.holder_id] = [convert_eligibility_response(e) for e in eligibilities]
+        if missing:
+            missing_holders = [holders[i] for i in missing]
+            assessed = await bulk_eligibility_executor.assess_async(missing_holders, schemes)
+            eligibility_cache.store_many(missing_holders, assessed, rules_version, schemes)
+            for index, eligibilities in zip(missing, assessed):
+                all_eligibilities[index] = eligibilities
+        
+        for fra_holder_req, holder, eligibilities in zip(request.fra_holders, holders, all_eligibilities):
+            dss_analytics.record_eligibility(holder, eligibilities)
+            results[fra_holder_req.holder_id] = project_results(eligibilities, project)
         
         logger.info(f"Bulk eligibility assessment completed for {len(request.fra_holders)} FRA holders")
-        return results
+        return DSSJSONResponse(results)
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in bulk eligibility assessment: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing bulk assessment: {str(e)}")
 
+@router.post("/eligibility/bulk/stream")
+async def stream_bulk_eligibility(
+    holders_file: UploadFile = File(..., description="FRA holders as NDJSON, one object per line"),
+    schemes_filter: Optional[List[str]] = Query(None, description="Only assess these schemes"),
+    exclude_fields: Optional[List[str]] = Query(None, description="Result fields to omit, e.g. reasons and required_documents")
+):
+    """
+    Stream CSS scheme eligibility for an NDJSON upload of FRA holders
+    
+    Holders are read, validated and assessed in small batches (DSS_STREAM_BATCH_SIZE)
+    and one NDJSON line per holder ({"holder_id", "eligibilities"}) is sent as soon as
+    its batch is evaluated, so server memory stays flat for any number of holders.
+    Invalid lines produce {"line", "error"} entries without stopping the stream.
+    """
+    schemes = parse_schemes_filter(schemes_filter)
+    try:
+        project = projection(SchemeEligibility, exclude_fields, excludable_fields(BulkSchemeEligibilityResponse))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    def lines():
+        count = 0
+        for batch in iter_line_batches(io.TextIOWrapper(holders_file.file, encoding="utf-8")):
+            yield b"".join(line + b"\n" for line in evaluate_holder_lines(batch, schemes, project))
+            count += len(batch)
+        logger.info(f"Streamed bulk eligibility assessment for {count} FRA holders")
+    
+    # Starlette iterates the synchronous generator in its threadpool, off the event loop
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.post("/eligibility/upload")
+async def assess_uploaded_eligibility(
+    holders_file: UploadFile = File(..., description="FRA holders as CSV, Parquet or Arrow IPC"),
+    schemes_filter: Optional[List[str]] = Query(None, description="Only assess these schemes")
+):
+    """
+    Assess CSS scheme eligibility for an uploaded FRA holder table
+    
+    District spreadsheets are read straight into columns, validated with vectorized
+    range checks (the same bounds as FRAHolderRequest) and assessed in one columnar
+    pass, without building a request model per row. Returns eligibility counts per
+    scheme and status and eligible amount totals per scheme. Validation failures
+    return 400 with the violated columns and the first offending rows.
+    """
+    try:
+        table_format = detect_table_format(holders_file.filename, holders_file.content_type)
+        holders = await run_in_threadpool(read_holder_columns, holders_file.file, table_format)
+        eligibility = await run_in_threadpool(dss_engine.assess_eligibility_columnar, holders, parse_schemes_filter(schemes_filter))
+        dss_analytics.record_eligibility_columns(holders, eligibility)
+        
+        logger.info(f"Assessed eligibility for {len(holders)} uploaded FRA holders ({table_format})")
+        return {
+            "total_fra_holders": len(holders),
+            "eligibility": eligibility.status_counts(),
+            "eligible_amount": eligibility.total_eligible_amount()
+        }
+        
+    except TableValidationError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e), "violations": e.violations})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input file: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error assessing uploaded eligibility: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error processing uploaded holders: {str(e)}")
+
+@router.get("/eligibility/cache")
+async def get_eligibility_cache_stats():
+    """Hit/miss counters and occupancy of the eligibility result cache"""
+    return eligibility_cache.stats()
+
+@router.delete("/eligibility/cache")
+async def clear_eligibility_cache():
+    """Drop all cached eligibility results"""
+    eligibility_cache.clear()
+    return eligibility_cache.stats()
+
+@router.post("/eligibility/index/query")
+async def query_eligibility_index(request: EligibilityCohortRequest):
+    """
+    Cohort of stored FRA holders from the eligibility bitmap index
+    
+    The index keeps a compressed bitmap of holders per (scheme, status), state and
+    district, so a cohort is answered by AND/OR/AND-NOT of bitmaps without
+    re-assessing anyone. Holders enter the index through /aggregates/holders.
+    """
+    try:
+        def query() -> Dict[str, Any]:
+            rows = eligibility_index.cohort(
+                [(term.scheme, term.status) for term in request.all_of],
+                [(term.scheme, term.status) for term in request.any_of],
+                [(term.scheme, term.status) for term in request.none_of],
+                request.state,
+                request.district
+            )
+            result = {
+                "count": len(rows),
+                "holder_ids": eligibility_index.holder_ids(rows, request.offset, request.limit),
+                "stale": eligibility_index.stale
+            }
+            if request.include_status_counts:
+                result["status_counts"] = eligibility_index.status_counts(rows)
+            return result
+        
+        return await run_in_threadpool(query)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error querying eligibility index: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error querying eligibility index: {str(e)}")
+
+@router.get("/eligibility/index")
+async def get_eligibility_index_stats(
+    state: Optional[str] = Query(None, description="Count holders in this state only"),
+    district: Optional[str] = Query(None, description="Count holders in this district only (requires state)")
+):
+    """Size and staleness of the eligibility index, with holders per scheme and status"""
+    try:
+        rows = eligibility_index.cohort(state=state, district=district)
+        return {**eligibility_index.stats(), "status_counts": eligibility_index.status_counts(rows)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/eligibility/index/rebuild")
+async def rebuild_eligibility_index():
+    """
+    Re-assess the aggregate store's FRA holders and rebuild the eligibility index
+    
+    Needed after scheme rules change (the index reports itself stale). The stored
+    holders are restored from the index file on startup, so the two stay in step.
+    """
+    try:
+        _, holders = dss_aggregates.snapshot()
+        await run_in_threadpool(eligibility_index.rebuild, holders)
+        await run_in_threadpool(holder_attribute_index.rebuild, holders)
+        await run_in_threadpool(eligibility_index.save)
+        return eligibility_index.stats()
+        
+    except Exception as e:
+        logger.error(f"Error rebuilding eligibility index: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error rebuilding eligibility index: {str(e)}")
+
+@router.post("/eligibility/rules/impact")
+async def rule_change_impact(request: RuleImpactRequest):
+    """
+    Stored FRA holders whose eligibility a proposed threshold change would flip
+    
+    Thresholds (PM_KISAN max_annual_income and min_land_area, MGNREGA min_age,
+    AYUSHMAN_BHARAT max_annual_income) are answered from sorted income, land area and
+    age indexes over the holders posted to /aggregates/holders: only holders between
+    the current and proposed value are re-assessed, and each status change is returned
+    with its before and after status.
+    """
+    try:
+        overrides = {SchemeType(scheme): parameters for scheme, parameters in request.scheme_rules.items()}
+        impact = await run_in_threadpool(holder_attribute_index.impact, overrides)
+        return impact.to_dict(request.max_listed)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error analyzing rule change impact: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error analyzing rule change impact: {str(e)}")
+
 @router.post("/interventions/village", response_model=List[InterventionRecommendationResponse])
 async def prioritize_village_interventions(village: VillageProfileRequest):
     """
@@ -275,46 +784,272 @@ async def prioritize_village_interventions(village: VillageProfileRequest):
         
         # Generate intervention recommendations
         interventions = dss_engine.prioritize_village_interventions(village_profile)
+        dss_analytics.record_interventions(village_profile, interventions)
         
-        # Convert to response models
-        response = [convert_intervention_response(i) for i in interventions]
-        
-        logger.info(f"Generated {len(response)} intervention recommendations for village {village.village_code}")
-        return response
+        logger.info(f"Generated {len(interventions)} intervention recommendations for village {village.village_code}")
+        return DSSJSONResponse(interventions)
         
     except Exception as e:
         logger.error(f"Error generating village interventions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing village interventions: {str(e)}")
 
-@router.post("/interventions/bulk", response_model=Dict[str, List[InterventionRecommendationResponse]])
+@router.get("/interventions/village/{village_code}", response_model=List[InterventionRecommendationResponse])
+async def prioritize_stored_village_interventions(village_code: str):
+    """Prioritized intervention recommendations for a village in the profile store"""
+    stored = village_store.get(village_code)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Village not in the profile store")
+    interventions = dss_engine.prioritize_village_interventions(stored.profile)
+    dss_analytics.record_interventions(stored.profile, interventions)
+    return DSSJSONResponse(interventions)
+
+@router.post("/interventions/bulk", response_model=Dict[str, List[BulkInterventionRecommendationResponse]])
 async def bulk_village_analysis(request: VillageAnalysisRequest):
     """
     Generate intervention recommendations for multiple villages
     
-    Optionally filter by priority level using priority_filter parameter
+    Villages can be sent in full or selected from the profile store by village_code
+    or admin region (stored). Optionally build only interventions of one priority level
+    using priority_filter (villages that cannot reach it are skipped early) and omit
+    result fields using exclude_fields.
     """
     try:
-        results = {}
+        priority = parse_priority_filter(request.priority_filter)
+        project = projection(InterventionRecommendation, request.exclude_fields, excludable_fields(BulkInterventionRecommendationResponse))
+        
+        # A store selection can cover every stored village; evaluate off the event loop
+        results = await run_in_threadpool(evaluate_villages, request.villages, request.stored, priority, project)
         
-        for village_req in request.villages:
-            # Convert and analyze
-            village_profile = convert_village_request(village_req)
-            interventions = dss_engine.prioritize_village_interventions(village_profile)
-            
-            # Filter by priority if specified
-            if request.priority_filter:
-                interventions = [i for i in interventions if i.priority.value == request.priority_filter]
-            
-            # Convert to response
-            results[village_req.village_code] = [convert_intervention_response(i) for i in interventions]
-        
-        logger.info(f"Bulk village analysis completed for {len(request.villages)} villages")
-        return results
+        logger.info(f"Bulk village analysis completed for {len(results)} villages")
+        return DSSJSONResponse(results)
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in bulk village analysis: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing bulk village analysis: {str(e)}")
 
+@router.post("/interventions/bulk/stream")
+async def stream_bulk_village_analysis(
+    villages_file: UploadFile = File(..., description="Village profiles as NDJSON, one object per line"),
+    priority_filter: Optional[str] = Query(None, description="Only build interventions of this priority"),
+    exclude_fields: Optional[List[str]] = Query(None, description="Result fields to omit, e.g. reasoning")
+):
+    """
+    Stream intervention recommendations for an NDJSON upload of villages
+    
+    Villages are evaluated in small batches and one NDJSON line per village
+    ({"village_code", "interventions"}) is sent as soon as its batch is evaluated.
+    Invalid lines produce {"line", "error"} entries without stopping the stream.
+    """
+    try:
+        priority = parse_priority_filter(priority_filter)
+        project = projection(InterventionRecommendation, exclude_fields, excludable_fields(BulkInterventionRecommendationResponse))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    def lines():
+        count = 0
+        for batch in iter_line_batches(io.TextIOWrapper(villages_file.file, encoding="utf-8")):
+            yield b"".join(line + b"\n" for line in evaluate_village_lines(batch, priority, project))
+            count += len(batch)
+        logger.info(f"Streamed bulk village analysis for {count} villages")
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.post("/interventions/upload")
+async def prioritize_uploaded_villages(
+    villages_file: UploadFile = File(..., description="Village profiles as CSV, Parquet or Arrow IPC")
+):
+    """
+    Prioritize interventions for an uploaded village table
+    
+    The table is validated column by column (the same bounds as VillageProfileRequest)
+    and every intervention trigger is evaluated over it in one columnar pass. Returns,
+    per intervention type, triggered village counts, priority counts and estimated cost.
+    """
+    try:
+        table_format = detect_table_format(villages_file.filename, villages_file.content_type)
+        villages = await run_in_threadpool(read_village_columns, villages_file.file, table_format)
+        interventions = await run_in_threadpool(dss_engine.prioritize_interventions_columnar, villages)
+        dss_analytics.record_intervention_columns(villages, interventions)
+        
+        triggered = interventions.triggered.sum(axis=1)
+        priority_counts = interventions.priority_counts()
+        logger.info(f"Prioritized interventions for {len(villages)} uploaded villages ({table_format})")
+        return {
+            "total_villages": len(villages),
+            "interventions": {
+                intervention_type: {
+                    "triggered_villages": int(triggered[row]),
+                    "priority_counts": priority_counts[intervention_type],
+                    "estimated_cost": float(triggered[row] * interventions.estimated_cost[row])
+                }
+                for row, intervention_type in enumerate(interventions.intervention_types)
+            }
+        }
+        
+    except TableValidationError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e), "violations": e.violations})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input file: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error prioritizing uploaded villages: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error processing uploaded villages: {str(e)}")
+
+@router.post("/interventions/top", response_model=List[InterventionRecommendationResponse])
+async def top_priority_interventions(request: TopPriorityRequest):
+    """
+    Top-K interventions by impact score across the submitted villages
+    
+    Optionally restricted to a state, district and/or intervention type.
+    Selection uses a K-sized heap rather than sorting every intervention.
+    """
+    try:
+        villages = await run_in_threadpool(resolve_villages, request.villages, request.stored)
+        interventions = await run_in_threadpool(
+            dss_engine.top_priority_interventions,
+            villages, request.k, request.state, request.district, request.intervention_type
+        )
+        return DSSJSONResponse(interventions)
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error selecting top interventions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error selecting top interventions: {str(e)}")
+
+@router.post("/villages/top", response_model=List[PriorityVillageResponse])
+async def top_priority_villages(request: TopPriorityRequest):
+    """Top-K villages ranked by their highest intervention impact score"""
+    try:
+        villages = await run_in_threadpool(resolve_villages, request.villages, request.stored)
+        ranked = await run_in_threadpool(
+            dss_engine.top_priority_villages,
+            villages, request.k, request.state, request.district, request.intervention_type
+        )
+        return [convert_priority_village_response(village, interventions) for village, interventions in ranked]
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error selecting top villages: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error selecting top villages: {str(e)}")
+
+@router.post("/villages/store")
+async def load_village_store(
+    villages: List[VillageProfileRequest],
+    replace: bool = Query(False, description="Delete stored villages missing from this load")
+):
+    """
+    Bulk load village profiles into the server-side profile store
+    
+    Existing villages are replaced; a village's version only changes when its
+    profile does. Intervention endpoints can then select villages by code or
+    admin region instead of sending full profiles.
+    """
+    try:
+        counts = await run_in_threadpool(village_store.bulk_load, (convert_village_request(v) for v in villages), replace)
+        return {**counts, "version": village_store.version}
+        
+    except Exception as e:
+        logger.error(f"Error loading village store: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error loading village store: {str(e)}")
+
+@router.get("/villages/store")
+async def get_village_store_stats():
+    """Size, version and per-state village counts of the profile store"""
+    return village_store.stats()
+
+@router.get("/villages/store/{village_code}")
+async def get_stored_village(village_code: str):
+    """A stored village profile with its version"""
+    stored = village_store.get(village_code)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Village not in the profile store")
+    return DSSJSONResponse(stored)
+
+@router.get("/villages/store/{village_code}/peers")
+async def get_peer_villages(
+    village_code: str,
+    k: int = Query(10, ge=1, le=1000, description="Number of peer villages"),
+    scope: str = Query("national", pattern="^(national|state|district)$", description="Restrict peers to the village's state or district")
+):
+    """
+    Stored villages most similar to a stored village
+    
+    Similarity is Euclidean distance over the six infrastructure indices plus forest
+    cover and agricultural land percentages, answered from a KD-tree index that
+    follows the profile store as villages are loaded, updated and deleted.
+    """
+    try:
+        peers = await run_in_threadpool(village_peer_index.nearest, village_code, k, scope)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Village not in the profile store")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "village_code": village_code,
+        "scope": scope,
+        "features": list(PEER_FEATURES),
+        "peers": [
+            {
+                "village_code": peer.village_code,
+                "village_name": peer.village_name,
+                "block": peer.block,
+                "district": peer.district,
+                "state": peer.state,
+                "distance": distance,
+                **{feature: getattr(peer, feature) for feature in PEER_FEATURES}
+            }
+            for peer, distance in peers
+        ]
+    }
+
+@router.put("/villages/store/{village_code}")
+async def upsert_stored_village(village_code: str, village: VillageProfileRequest):
+    """Insert or replace one stored village profile"""
+    if village.village_code != village_code:
+        raise HTTPException(status_code=400, detail="village_code in the path and body differ")
+    version, changed = village_store.upsert(convert_village_request(village))
+    return {"village_code": village_code, "version": version, "changed": changed, "store_version": village_store.version}
+
+@router.delete("/villages/store/{village_code}")
+async def delete_stored_village(village_code: str):
+    """Remove a village from the profile store"""
+    if not village_store.delete(village_code):
+        raise HTTPException(status_code=404, detail="Village not in the profile store")
+    return {"deleted": village_code, "store_version": village_store.version}
+
+@router.post("/villages/views", response_model=List[VillageViewResponse])
+async def village_views(request: VillageViewRequest):
+    """
+    Villages joined with their FRA holders on village_code
+    
+    For each village (optionally only village_codes): infrastructure interventions and their
+    cost, the total individual benefits its holders are eligible for, and per-scheme eligibility
+    counts. Holders whose village is not submitted are reported under their village_code
+    without a profile.
+    """
+    try:
+        villages = [convert_village_request(v) for v in request.villages]
+        holders = [convert_fra_holder_request(h) for h in request.fra_holders]
+        views = await run_in_threadpool(dss_engine.village_views, villages, holders, request.village_codes)
+        
+        logger.info(f"Built {len(views)} village views for {len(holders)} FRA holders")
+        return [convert_village_view_response(view) for view in views]
+        
+    except Exception as e:
+        logger.error(f"Error building village views: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error building village views: {str(e)}")
+
 @router.post("/policy/recommendations", response_model=PolicyRecommendationsResponse)
 async def generate_policy_recommendations(
     villages: List[VillageProfileRequest],
@@ -336,6 +1071,7 @@ async def generate_policy_recommendations(
         
         # Generate policy recommendations
         recommendations = dss_engine.generate_policy_recommendations(village_profiles, holder_profiles)
+        dss_analytics.record_policy_report()
         
         # Convert to response model
         response = PolicyRecommendationsResponse(
@@ -354,6 +1090,343 @@ async def generate_policy_recommendations(
         logger.error(f"Error generating policy recommendations: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing policy recommendations: {str(e)}")
 
+@router.post("/policy/recommendations/stream", response_model=PolicyRecommendationsResponse)
+async def generate_policy_recommendations_streaming(
+    villages_file: UploadFile = File(..., description="Village profiles as NDJSON or CSV"),
+    holders_file: UploadFile = File(..., description="FRA holders as NDJSON or CSV"),
+    max_listed_per_section: int = Query(1000, ge=0, description="Cap on listed regional priorities and timeline entries")
+):
+    """
+    Generate policy recommendations from uploaded NDJSON or CSV files
+    
+    Records are streamed from the uploads through incremental accumulators, so memory
+    stays constant regardless of the number of villages and FRA holders. Full counts of
+    the capped listings are returned under summary.section_totals.
+    """
+    try:
+        villages_format = detect_format(villages_file.filename, villages_file.content_type)
+        holders_format = detect_format(holders_file.filename, holders_file.content_type)
+        villages = iter_villages(io.TextIOWrapper(villages_file.file, encoding="utf-8", newline=""), villages_format)
+        holders = iter_holders(io.TextIOWrapper(holders_file.file, encoding="utf-8", newline=""), holders_format)
+        
+        # Run the engine off the event loop; the iterators read the spooled uploads lazily
+        recommendations = await run_in_threadpool(
+            dss_engine.generate_policy_recommendations_streaming, villages, holders, max_listed_per_section
+        )
+        
+        dss_analytics.record_policy_report()
+        summary = recommendations["summary"]
+        logger.info(f"Generated streaming policy recommendations for {summary['total_villages_analyzed']} villages and {summary['total_fra_holders']} FRA holders")
+        return PolicyRecommendationsResponse(**recommendations)
+        
+    except ValueError as e:
+        logger.error(f"Invalid streaming policy input: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Invalid input file: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error generating streaming policy recommendations: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error processing policy recommendations: {str(e)}")
+
+@router.post("/jobs/policy", response_model=PolicyJobResponse, status_code=202)
+async def submit_policy_job(
+    villages_file: UploadFile = File(..., description="Village profiles as NDJSON or CSV"),
+    holders_file: UploadFile = File(..., description="FRA holders as NDJSON or CSV"),
+    max_listed_per_section: int = Query(1000, ge=0, description="Cap on listed regional priorities and timeline entries")
+):
+    """
+    Queue a background policy recommendations run over uploaded NDJSON or CSV files
+    
+    The uploads are stored with the job and the engine runs on a background worker pool.
+    Poll /jobs/{job_id} for status and progress, then fetch /jobs/{job_id}/result.
+    """
+    try:
+        job = await run_in_threadpool(
+            policy_jobs.submit_upload,
+            villages_file.file, villages_file.filename or "",
+            holders_file.file, holders_file.filename or "",
+            max_listed_per_section
+        )
+        return convert_policy_job_response(job)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input file: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error submitting policy job: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error submitting policy job: {str(e)}")
+
+@router.post("/jobs/policy/reference", response_model=PolicyJobResponse, status_code=202)
+async def submit_policy_job_by_reference(request: PolicyJobReferenceRequest):
+    """
+    Queue a background policy recommendations run over data already on the server
+    
+    Source 'stored' reads NDJSON/CSV datasets from the server's data directory;
+    source 'aggregates' runs over a snapshot of the incremental aggregate store.
+    """
+    try:
+        if request.source == SOURCE_AGGREGATES:
+            villages, holders = dss_aggregates.snapshot()
+            job = await run_in_threadpool(policy_jobs.submit_snapshot, villages, holders, request.max_listed_per_section)
+        else:
+            if not request.villages_dataset or not request.holders_dataset:
+                raise ValueError("villages_dataset and holders_dataset are required for stored data")
+            job = policy_jobs.submit_stored(request.villages_dataset, request.holders_dataset, request.max_listed_per_section)
+        return convert_policy_job_response(job)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error submitting policy job: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error submitting policy job: {str(e)}")
+
+@router.get("/jobs", response_model=List[PolicyJobResponse])
+async def list_policy_jobs():
+    """All background policy jobs, newest first"""
+    return [convert_policy_job_response(job) for job in policy_jobs.list_jobs()]
+
+@router.get("/jobs/{job_id}", response_model=PolicyJobResponse)
+async def get_policy_job(job_id: str):
+    """Status and progress (percent of input consumed) of a background policy job"""
+    job = policy_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return convert_policy_job_response(job)
+
+@router.get("/jobs/{job_id}/result", response_model=PolicyRecommendationsResponse)
+async def get_policy_job_result(job_id: str):
+    """Policy report of a completed job, served from its stored result"""
+    job = policy_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == JOB_FAILED:
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    path = policy_jobs.result_path(job_id)
+    if path is None:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status} ({job.progress:.1f}%)")
+    return FileResponse(path, media_type="application/json")
+
+@router.delete("/jobs/{job_id}")
+async def delete_policy_job(job_id: str):
+    """Remove a finished job and its stored inputs and result"""
+    if not policy_jobs.delete(job_id):
+        raise HTTPException(status_code=404, detail="Job not found or still running")
+    return {"deleted": job_id}
+
+@router.post("/budget/optimize")
+async def optimize_budget(request: BudgetOptimizationRequest):
+    """
+    Fund the interventions with the most impact within each budget
+    
+    Every triggered intervention is valued at impact_score x success_probability x
+    estimated_beneficiaries and each ministry's (or state's) budget buys the most value
+    it can, filled in value-per-cost order. Each group reports its LP upper bound and
+    optimality gap; with years > 1 budgets are annual and the plan is phased by year.
+    """
+    try:
+        villages = resolve_villages(request.villages, request.stored)
+        plan = await run_in_threadpool(
+            dss_engine.optimize_budget, villages, request.budgets, request.group_by, request.years, request.intervention_types
+        )
+        
+        logger.info(f"Optimized {request.group_by} budgets over {len(plan.candidates)} candidate interventions in {len(villages)} villages")
+        return plan.to_dict(request.max_listed)
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error optimizing budget: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error optimizing budget: {str(e)}")
+
+@router.post("/interventions/clusters")
+async def cluster_priority_villages(request: InterventionClusterRequest):
+    """
+    Cluster neighbouring villages needing priority interventions for bundled procurement
+    
+    Villages with a triggered intervention of the requested priorities are grouped
+    DBSCAN-style by haversine distance: villages with min_villages villages within
+    eps_km seed a cluster. Each cluster reports its villages, centroid and radius, and
+    combined cost and beneficiaries in total and per intervention type, largest first.
+    """
+    try:
+        villages = resolve_villages(request.villages, request.stored)
+        priorities = parse_priorities(request.priorities)
+        clusters = await run_in_threadpool(
+            dss_engine.cluster_priority_villages, villages, priorities, request.intervention_types, request.eps_km, request.min_villages
+        )
+        
+        logger.info(f"Clustered {len(clusters.village)} priority villages of {len(villages)} into {clusters.cluster_count} clusters")
+        return clusters.to_dict(request.max_listed, request.max_listed_villages)
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error clustering priority villages: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error clustering priority villages: {str(e)}")
+
+@router.post("/coverage/gaps")
+async def coverage_gap_cube(
+    request: GapCubeRequest,
+    state: Optional[str] = Query(None, description="Return only this state's subtree"),
+    district: Optional[str] = Query(None, description="Return only this district's subtree"),
+    block: Optional[str] = Query(None, description="Return only this block (requires state and district)"),
+    depth: int = Query(3, ge=0, le=3, description="Admin levels to expand below the returned node")
+):
+    """
+    Coverage gaps rolled up state -> district -> block
+    
+    Every infrastructure gap (villages below the index thresholds) and eligibility gap
+    (FRA holders without bank accounts or Aadhaar) is counted per block in one grouped
+    pass and summed up the hierarchy. FRA holders are placed in their village's state, district
+    and block via their village_code; holders of unknown villages are counted under 'Unassigned'.
+    """
+    try:
+        villages = [convert_village_request(v) for v in request.villages]
+        holders = [convert_fra_holder_request(h) for h in request.fra_holders]
+        cube = await run_in_threadpool(dss_engine.coverage_gap_cube, villages, holders)
+        
+        node = cube.subtree(state, district, block, depth)
+        if node is None:
+            raise HTTPException(status_code=404, detail="No villages or FRA holders in the requested region")
+        return node
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error building coverage gap cube: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error building coverage gap cube: {str(e)}")
+
+@router.post("/scenarios")
+async def compare_rule_scenarios(request: ScenarioRequest):
+    """
+    What-if comparison of scheme and intervention rule variants
+    
+    Each variant overrides parameters of the current rules (e.g. PM-KISAN max_annual_income,
+    or a water trigger of "water_index < 60"). All variants are evaluated against the submitted
+    villages and FRA holders in one vectorized pass and returned with per-variant eligibility
+    counts, benefit totals and intervention costs, plus differences from the baseline rules.
+    """
+    try:
+        variants = [convert_scenario_variant_request(v) for v in request.variants]
+        villages = [convert_village_request(v) for v in request.villages]
+        holders = [convert_fra_holder_request(h) for h in request.fra_holders]
+        
+        comparison = await run_in_threadpool(
+            dss_engine.run_what_if_scenarios, villages, holders, variants, request.include_baseline
+        )
+        
+        logger.info(f"Compared {len(variants)} rule scenarios for {len(villages)} villages and {len(holders)} FRA holders")
+        return comparison
+        
+    except ValueError as e:
+        logger.error(f"Invalid scenario request: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Invalid scenario: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error comparing rule scenarios: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error comparing rule scenarios: {str(e)}")
+
+@router.post("/aggregates/villages")
+async def upsert_aggregate_villages(villages: List[VillageProfileRequest]):
+    """
+    Insert or update villages in the maintained policy aggregates
+    
+    Each village's previous contribution to every report section is replaced by its new one
+    """
+    try:
+        # Every village is re-evaluated by the engine; keep that off the event loop
+        await run_in_threadpool(dss_aggregates.upsert_villages, (convert_village_request(v) for v in villages))
+        
+        logger.info(f"Upserted {len(villages)} villages into DSS aggregates")
+        return {"upserted": len(villages), "total_villages": dss_aggregates.total_villages}
+        
+    except Exception as e:
+        logger.error(f"Error updating village aggregates: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error updating village aggregates: {str(e)}")
+
+@router.delete("/aggregates/villages/{village_code}")
+async def delete_aggregate_village(village_code: str):
+    """Remove a village's contribution from the maintained policy aggregates"""
+    if not dss_aggregates.delete_village(village_code):
+        raise HTTPException(status_code=404, detail=f"Village {village_code} not found in aggregates")
+    return {"deleted": village_code, "total_villages": dss_aggregates.total_villages}
+
+@router.post("/aggregates/holders")
+async def upsert_aggregate_holders(fra_holders: List[FRAHolderRequest]):
+    """
+    Insert or update FRA holders in the maintained policy aggregates
+    
+    Each holder is assessed once and applied to the aggregates and the eligibility index,
+    and indexed by income, land area and age for rule-change impact queries
+    """
+    try:
+        holders = [convert_fra_holder_request(h) for h in fra_holders]
+        eligibilities = await run_in_threadpool(eligibility_cache.assess_many, holders)
+        for holder, results in zip(holders, eligibilities):
+            dss_aggregates.add_holder(holder, results)
+        eligibility_index.upsert_many(holders, eligibilities)
+        holder_attribute_index.upsert_many(holders)
+        eligibility_index.request_save()
+        
+        logger.info(f"Upserted {len(fra_holders)} FRA holders into DSS aggregates")
+        return {
+            "upserted": len(fra_holders),
+            "total_fra_holders": dss_aggregates.total_fra_holders,
+            "indexed_fra_holders": len(eligibility_index)
+        }
+        
+    except Exception as e:
+        logger.error(f"Error updating holder aggregates: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error updating holder aggregates: {str(e)}")
+
+@router.delete("/aggregates/holders/{holder_id}")
+async def delete_aggregate_holder(holder_id: str):
+    """Remove an FRA holder's contribution from the maintained policy aggregates and the eligibility index"""
+    in_aggregates = dss_aggregates.delete_holder(holder_id)
+    holder_attribute_index.delete(holder_id)
+    if eligibility_index.delete(holder_id):
+        eligibility_index.request_save()
+    elif not in_aggregates:
+        raise HTTPException(status_code=404, detail=f"FRA holder {holder_id} not found in aggregates")
+    return {"deleted": holder_id, "total_fra_holders": dss_aggregates.total_fra_holders}
+
+@router.get("/aggregates/report", response_model=PolicyRecommendationsResponse)
+async def get_aggregate_policy_report():
+    """
+    Policy recommendations served from the maintained aggregates
+    
+    Same shape as POST /policy/recommendations, without re-running the engine
+    """
+    try:
+        return PolicyRecommendationsResponse(**dss_aggregates.report())
+    except Exception as e:
+        logger.error(f"Error building aggregate policy report: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error building aggregate policy report: {str(e)}")
+
+@router.get("/aggregates/top/interventions", response_model=List[InterventionRecommendationResponse])
+async def top_aggregate_interventions(
+    k: int = Query(100, gt=0, le=10000),
+    state: Optional[str] = Query(None, description="Filter by state"),
+    district: Optional[str] = Query(None, description="Filter by district"),
+    intervention_type: Optional[str] = Query(None, description="Filter by intervention type")
+):
+    """Top-K interventions from the maintained aggregates, without re-evaluating villages"""
+    interventions = dss_aggregates.top_interventions(k, state, district, intervention_type)
+    return DSSJSONResponse(interventions)
+
+@router.get("/aggregates/top/villages", response_model=List[PriorityVillageResponse])
+async def top_aggregate_villages(
+    k: int = Query(100, gt=0, le=10000),
+    state: Optional[str] = Query(None, description="Filter by state"),
+    district: Optional[str] = Query(None, description="Filter by district"),
+    intervention_type: Optional[str] = Query(None, description="Filter by intervention type")
+):
+    """Top-K villages from the maintained aggregates, ranked by highest intervention impact score"""
+    ranked = dss_aggregates.top_villages(k, state, district, intervention_type)
+    return [convert_priority_village_response(village, interventions) for village, interventions in ranked]
+
 @router.get("/schemes/info")
 async def get_scheme_information():
     """
@@ -416,52 +1489,29 @@ async def get_scheme_information():
 @router.get("/analytics/summary")
 async def get_analytics_summary(
     state: Optional[str] = Query(None, description="Filter by state"),
-    district: Optional[str] = Query(None, description="Filter by district")
+    district: Optional[str] = Query(None, description="Filter by district"),
+    since: Optional[datetime] = Query(None, description="Only count time windows from this time"),
+    until: Optional[datetime] = Query(None, description="Only count time windows up to this time")
 ):
     """
     Get summary analytics for DSS usage and recommendations
     
-    Optionally filter by state or district
+    Counts every holder assessed, village evaluated and policy report generated by the
+    DSS routes, with per-scheme eligibility rates and intervention priority counts.
+    Optionally filter by state or district and by time range (whole
+    DSS_ANALYTICS_BUCKET_SECONDS windows). Policy reports are not attributed to a region.
     """
     try:
-        # Mock analytics data - in production, this would come from database
-        analytics = {
-            "requests_processed": {
-                "individual_eligibility": 1250,
-                "village_interventions": 850,
-                "policy_recommendations": 45,
-                "total": 2145
-            },
-            "scheme_eligibility_rates": {
-                "PM_KISAN": 78.5,
-                "MGNREGA": 92.3,
-                "JAL_JEEVAN_MISSION": 100.0,
-                "DAJGUA": 65.8,
-                "PM_AWAS_GRAMIN": 45.2,
-                "AYUSHMAN_BHARAT": 67.9
-            },
-            "intervention_priorities": {
-                "CRITICAL": 125,
-                "HIGH": 340,
-                "MEDIUM": 285,
-                "LOW": 100
-            },
-            "top_interventions": [
-                {"type": "water_infrastructure", "villages": 245},
-                {"type": "electricity_infrastructure", "villages": 189},
-                {"type": "road_connectivity", "villages": 156},
-                {"type": "health_infrastructure", "villages": 134},
-                {"type": "education_infrastructure", "villages": 126}
-            ],
-            "filters": {
-                "state": state,
-                "district": district
-            },
-            "generated_at": datetime.now().isoformat()
+        analytics = await run_in_threadpool(dss_analytics.summary, state, district, since, until)
+        analytics["filters"] = {
+            "state": state,
+            "district": district,
+            "since": since.isoformat() if since else None,
+            "until": until.isoformat() if until else None
         }
-        
+        analytics["generated_at"] = datetime.now().isoformat()
         return analytics
         
     except Exception as e:
         logger.error(f"Error generating analytics summary: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error generating analytics: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error generating analytics: {str(e)}")
@@ -0,0 +1,239 @@
+"""
+Incremental DSS policy aggregates
+
+Keeps the current contribution of every village and FRA holder to each policy
+report section (coverage gaps, regional priorities, resource allocation, phased
+timeline). An upsert or delete of one VillageProfile/FRAHolder retracts its old
+contribution and applies the new one in O(1), so dashboards can serve the policy
+report from maintained state instead of re-running the engine over every record.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import Counter
+from dataclasses import dataclass
+import logging
+import threading
+
+from .dss_service import (
+    DSSEngine,
+    FRAHolder,
+    VillageProfile,
+    SchemeEligibility,
+    InterventionRecommendation,
+    EligibilityStatus,
+    COVERAGE_GAP_THRESHOLDS,
+    FUNDED_PRIORITIES,
+    PHASE_BY_PRIORITY,
+    PolicyReportAccumulator,
+    matches_region,
+    priority_listing_entry,
+    select_top_interventions,
+    select_top_villages,
+    timeline_listing_entry,
+    dss_engine
+)
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class VillageContribution:
+    """A village's evaluated state as currently counted in the aggregates"""
+    village: VillageProfile
+    interventions: List[InterventionRecommendation]
+    high_priority: bool
+
+@dataclass
+class HolderContribution:
+    """An FRA holder's evaluated state as currently counted in the aggregates"""
+    holder: FRAHolder
+    individual_benefits: float
+
+def _count(counter: Counter, key: str, delta: int) -> None:
+    """Adjust a counter, dropping keys that reach zero so most_common stays meaningful"""
+    counter[key] += delta
+    if counter[key] <= 0:
+        del counter[key]
+
+class IncrementalPolicyAggregates(PolicyReportAccumulator):
+    """Policy report state maintained under village and holder upserts/deletes"""
+
+    def __init__(self, engine: DSSEngine = dss_engine):
+        super().__init__(engine.intervention_rules)
+        self.engine = engine
+        self._villages: Dict[str, VillageContribution] = {}
+        self._holders: Dict[str, HolderContribution] = {}
+        self._state_villages: Counter = Counter()
+        # Listings keyed by village so one village's entries can be retracted in O(1)
+        self._priority_by_state: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self._timeline_by_phase: Dict[str, Dict[str, List[str]]] = {phase: {} for phase in PHASE_BY_PRIORITY.values()}
+        self._lock = threading.RLock()
+
+    # Villages
+
+    def upsert_village(self, village: VillageProfile) -> None:
+        """Evaluate a village and replace its previous contribution"""
+        interventions = self.engine.prioritize_village_interventions(village)
+        self.add_village(village, interventions, self.engine._is_high_priority_village(village))
+
+    def upsert_villages(self, villages: Iterable[VillageProfile]) -> int:
+        """Evaluate and upsert many villages; returns how many were upserted"""
+        count = 0
+        for village in villages:
+            self.upsert_village(village)
+            count += 1
+        return count
+
+    def add_village(self, village: VillageProfile, interventions: List[InterventionRecommendation], high_priority: bool) -> None:
+        """Apply an already evaluated village, replacing any previous contribution for its village_code"""
+        with self._lock:
+            previous = self._villages.pop(village.village_code, None)
+            if previous is not None:
+                self._apply_village(previous, -1)
+            contribution = VillageContribution(village, interventions, high_priority)
+            self._villages[village.village_code] = contribution
+            self._apply_village(contribution, 1)
+
+    def delete_village(self, village_code: str) -> bool:
+        """Retract a village's contribution; returns False if it was not present"""
+        with self._lock:
+            previous = self._villages.pop(village_code, None)
+            if previous is None:
+                return False
+            self._apply_village(previous, -1)
+            return True
+
+    def get_village(self, village_code: str) -> Optional[VillageContribution]:
+        return self._villages.get(village_code)
+
+    def _apply_village(self, contribution: VillageContribution, sign: int) -> None:
+        village = contribution.village
+        code = village.village_code
+
+        self.total_villages += sign
+        if contribution.high_priority:
+            self.high_priority_villages += sign
+
+        for gap, (index_name, threshold) in COVERAGE_GAP_THRESHOLDS.items():
+            if getattr(village, index_name) < threshold:
+                self.gap_villages[gap] += sign
+                if gap == "water":
+                    _count(self.water_gap_states, village.state, sign)
+
+        _count(self._state_villages, village.state, sign)
+        state_listing = self._priority_by_state.setdefault(village.state, {})
+
+        if sign > 0:
+            state_listing[code] = []
+        else:
+            state_listing.pop(code, None)
+            for phase_listing in self._timeline_by_phase.values():
+                phase_listing.pop(code, None)
+
+        for intervention in contribution.interventions:
+            phase = PHASE_BY_PRIORITY[intervention.priority]
+            _count(self.timeline_counts, phase, sign)
+
+            if intervention.priority in FUNDED_PRIORITIES:
+                _count(self.priority_intervention_counts, village.state, sign)
+                self.resource_allocation[intervention.intervention_type] = (
+                    self.resource_allocation.get(intervention.intervention_type, 0.0) + sign * intervention.estimated_cost
+                )
+                if sign > 0:
+                    state_listing[code].append(priority_listing_entry(village, intervention))
+
+            if sign > 0:
+                self._timeline_by_phase[phase].setdefault(code, []).append(timeline_listing_entry(village, intervention))
+
+        if not state_listing and village.state not in self._state_villages:
+            del self._priority_by_state[village.state]
+
+    # Holders
+
+    def upsert_holder(self, holder: FRAHolder) -> None:
+        """Evaluate a holder and replace its previous contribution"""
+        self.add_holder(holder, self.engine.assess_individual_eligibility(holder))
+
+    def add_holder(self, holder: FRAHolder, eligibilities: List[SchemeEligibility]) -> None:
+        """Apply an already assessed holder, replacing any previous contribution for its holder_id"""
+        benefits = sum(
+            e.eligible_amount for e in eligibilities
+            if e.status == EligibilityStatus.ELIGIBLE and e.eligible_amount
+        )
+        with self._lock:
+            previous = self._holders.pop(holder.holder_id, None)
+            if previous is not None:
+                self._apply_holder(previous, -1)
+            contribution = HolderContribution(holder, float(benefits))
+            self._holders[holder.holder_id] = contribution
+            self._apply_holder(contribution, 1)
+
+    def delete_holder(self, holder_id: str) -> bool:
+        """Retract a holder's contribution; returns False if it was not present"""
+        with self._lock:
+            previous = self._holders.pop(holder_id, None)
+            if previous is None:
+                return False
+            self._apply_holder(previous, -1)
+            return True
+
+    def _apply_holder(self, contribution: HolderContribution, sign: int) -> None:
+        holder = contribution.holder
+        self.total_fra_holders += sign
+        if not holder.has_bank_account:
+            self.holders_without_accounts += sign
+        if not holder.aadhaar_linked:
+            self.holders_without_aadhaar += sign
+        self.resource_allocation["individual_benefits"] += sign * contribution.individual_benefits
+
+    # Ranking
+
+    def _stored_region(self, state: Optional[str], district: Optional[str]) -> Iterator[Tuple[VillageProfile, List[InterventionRecommendation]]]:
+        for contribution in list(self._villages.values()):
+            if matches_region(contribution.village, state, district):
+                yield contribution.village, contribution.interventions
+
+    def top_interventions(
+        self,
+        k: int,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        intervention_type: Optional[str] = None
+    ) -> List[InterventionRecommendation]:
+        """Top-k stored interventions by impact_score, from already evaluated villages"""
+        return select_top_interventions(self._stored_region(state, district), k, intervention_type)
+
+    def top_villages(
+        self,
+        k: int,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        intervention_type: Optional[str] = None
+    ) -> List[Tuple[VillageProfile, List[InterventionRecommendation]]]:
+        """Top-k stored villages by their highest intervention impact_score"""
+        return select_top_villages(self._stored_region(state, district), k, intervention_type)
+
+    def snapshot(self) -> Tuple[List[VillageProfile], List[FRAHolder]]:
+        """Consistent copy of the stored villages and holders"""
+        with self._lock:
+            return (
+                [contribution.village for contribution in self._villages.values()],
+                [contribution.holder for contribution in self._holders.values()]
+            )
+
+    # Report
+
+    def report(self) -> Dict[str, Any]:
+        """Policy report in the same shape as DSSEngine.generate_policy_recommendations"""
+        with self._lock:
+            self.priority_interventions = {
+                state: [entry for entries in by_village.values() for entry in entries]
+                for state, by_village in self._priority_by_state.items()
+            }
+            self.implementation_timeline = {
+                phase: [entry for entries in by_village.values() for entry in entries]
+                for phase, by_village in self._timeline_by_phase.items()
+            }
+            return self.engine._build_policy_report(self)
+
+# Shared aggregate store served by the DSS routes
+dss_aggregates = IncrementalPolicyAggregates(dss_engine)
@@ -0,0 +1,303 @@
+"""
+DSS usage analytics collector
+
+Every evaluation served by the DSS routes is recorded here: holders assessed and
+how many were eligible per scheme, villages evaluated with their intervention
+priorities and types, and policy reports generated. Counters are bucketed by
+(time window, state, district). An update only increments in-memory pending
+counters, O(1) per record; pending counters are flushed in batches by a
+background timer thread, never by the recording request, into an embedded
+SQLite database (one row per bucket, region, metric and key, upserted by adding
+the delta), which the summary endpoint aggregates with filters on state,
+district and time range. close() writes what is still pending on shutdown.
+
+Configuration (environment):
+    DSS_ANALYTICS_DB              SQLite database path (default dss_analytics.db, ":memory:" for none)
+    DSS_ANALYTICS_BUCKET_SECONDS  time window of each bucket (default 3600)
+    DSS_ANALYTICS_FLUSH_SECONDS   maximum age of unflushed counters (default 5)
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import Counter
+from datetime import datetime, timezone
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from .dss_service import (
+    FRAHolder,
+    VillageProfile,
+    SchemeEligibility,
+    InterventionRecommendation,
+    EligibilityStatus,
+    InterventionPriority,
+    SchemeType
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ANALYTICS_DB = os.getenv("DSS_ANALYTICS_DB", "dss_analytics.db")
+DEFAULT_BUCKET_SECONDS = int(os.getenv("DSS_ANALYTICS_BUCKET_SECONDS", "3600"))
+DEFAULT_FLUSH_SECONDS = float(os.getenv("DSS_ANALYTICS_FLUSH_SECONDS", "5"))
+
+# Metrics (the key column holds the request kind, scheme, priority or intervention type)
+REQUESTS = "requests"
+SCHEME_ASSESSED = "scheme_assessed"
+SCHEME_ELIGIBLE = "scheme_eligible"
+PRIORITY = "priority"
+INTERVENTION_TYPE = "intervention_type"
+
+INDIVIDUAL_ELIGIBILITY = "individual_eligibility"
+VILLAGE_INTERVENTIONS = "village_interventions"
+POLICY_RECOMMENDATIONS = "policy_recommendations"
+REQUEST_KINDS: Tuple[str, ...] = (INDIVIDUAL_ELIGIBILITY, VILLAGE_INTERVENTIONS, POLICY_RECOMMENDATIONS)
+
+# Region of evaluations that span several states (e.g. policy reports)
+NATIONAL = ""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analytics_counters (
+    bucket INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    district TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (bucket, state, district, metric, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS analytics_counters_region ON analytics_counters (state, district, bucket);
+"""
+
+_UPSERT = """
+INSERT INTO analytics_counters (bucket, state, district, metric, key, count) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (bucket, state, district, metric, key) DO UPDATE SET count = count + excluded.count
+"""
+
+CounterKey = Tuple[int, str, str, str, str]
+
+class AnalyticsCollector:
+    """Bucketed usage counters with O(1) updates and batched SQLite persistence"""
+
+    def __init__(
+        self,
+        database: str = DEFAULT_ANALYTICS_DB,
+        bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS
+    ):
+        if bucket_seconds < 1:
+            raise ValueError("bucket_seconds must be at least 1")
+        self.database = database
+        self.bucket_seconds = bucket_seconds
+        self.flush_seconds = flush_seconds
+        self._pending: Counter = Counter()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _bucket(self, timestamp: Optional[float] = None) -> int:
+        now = time.time() if timestamp is None else timestamp
+        return int(now // self.bucket_seconds) * self.bucket_seconds
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.database, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+    # Recording
+
+    def _add(self, deltas: Iterable[Tuple[CounterKey, int]]) -> None:
+        with self._lock:
+            pending = self._pending
+            for key, delta in deltas:
+                pending[key] += delta
+            if self._flush_timer is None and pending:
+                # Pending counters are written flush_seconds after the first of them arrived
+                self._flush_timer = threading.Timer(self.flush_seconds, self._scheduled_flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _scheduled_flush(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing DSS analytics: {str(e)}")
+
+    def record_eligibility(self, holder: FRAHolder, eligibilities: List[SchemeEligibility]) -> None:
+        """Count one assessed holder and its eligible schemes"""
+        bucket = self._bucket()
+        region = (bucket, holder.state, holder.district)
+        deltas = [(region + (REQUESTS, INDIVIDUAL_ELIGIBILITY), 1)]
+        for e in eligibilities:
+            deltas.append((region + (SCHEME_ASSESSED, e.scheme.value), 1))
+            if e.status == EligibilityStatus.ELIGIBLE:
+                deltas.append((region + (SCHEME_ELIGIBLE, e.scheme.value), 1))
+        self._add(deltas)
+
+    def record_interventions(self, village: VillageProfile, interventions: List[InterventionRecommendation]) -> None:
+        """Count one evaluated village, its intervention priorities and types"""
+        bucket = self._bucket()
+        region = (bucket, village.state, village.district)
+        deltas = [(region + (REQUESTS, VILLAGE_INTERVENTIONS), 1)]
+        for i in interventions:
+            deltas.append((region + (PRIORITY, i.priority.value), 1))
+            deltas.append((region + (INTERVENTION_TYPE, i.intervention_type), 1))
+        self._add(deltas)
+
+    def record_policy_report(self, state: str = NATIONAL, district: str = NATIONAL) -> None:
+        """Count one generated policy report"""
+        self._add([((self._bucket(), state, district, REQUESTS, POLICY_RECOMMENDATIONS), 1)])
+
+    def record_eligibility_columns(self, holders, eligibility) -> None:
+        """Count a columnar assessment (HolderColumns + ColumnarEligibility) grouped by region"""
+        from .dss_columnar import ELIGIBLE
+
+        bucket = self._bucket()
+        regions, codes = np.unique(np.stack([holders.state, holders.district]), axis=1, return_inverse=True)
+        codes = codes.ravel()
+        holder_counts = np.bincount(codes, minlength=regions.shape[1])
+        eligible_counts = [np.bincount(codes, weights=row == ELIGIBLE, minlength=regions.shape[1]) for row in eligibility.status]
+
+        deltas = []
+        for column in range(regions.shape[1]):
+            region = (bucket, str(regions[0, column]), str(regions[1, column]))
+            deltas.append((region + (REQUESTS, INDIVIDUAL_ELIGIBILITY), int(holder_counts[column])))
+            for scheme, eligible in zip(eligibility.schemes, eligible_counts):
+                deltas.append((region + (SCHEME_ASSESSED, scheme.value), int(holder_counts[column])))
+                if eligible[column]:
+                    deltas.append((region + (SCHEME_ELIGIBLE, scheme.value), int(eligible[column])))
+        self._add(deltas)
+
+    def record_intervention_columns(self, villages, interventions) -> None:
+        """Count a columnar intervention run (VillageColumns + ColumnarInterventions) grouped by region"""
+        from .dss_columnar import PRIORITY_CODES
+
+        bucket = self._bucket()
+        regions, codes = np.unique(np.stack([villages.state, villages.district]), axis=1, return_inverse=True)
+        codes = codes.ravel()
+        region_count = regions.shape[1]
+        village_counts = np.bincount(codes, minlength=region_count)
+
+        deltas = []
+        for column in range(region_count):
+            region = (bucket, str(regions[0, column]), str(regions[1, column]))
+            deltas.append((region + (REQUESTS, VILLAGE_INTERVENTIONS), int(village_counts[column])))
+        for row, intervention_type in enumerate(interventions.intervention_types):
+            triggered = interventions.triggered[row]
+            type_counts = np.bincount(codes[triggered], minlength=region_count)
+            priority_counts = np.bincount(
+                codes[triggered] * len(PRIORITY_CODES) + interventions.priority[row][triggered],
+                minlength=region_count * len(PRIORITY_CODES)
+            ).reshape(region_count, len(PRIORITY_CODES))
+            for column in np.flatnonzero(type_counts):
+                region = (bucket, str(regions[0, column]), str(regions[1, column]))
+                deltas.append((region + (INTERVENTION_TYPE, intervention_type), int(type_counts[column])))
+                for code in np.flatnonzero(priority_counts[column]):
+                    deltas.append((region + (PRIORITY, PRIORITY_CODES[code].value), int(priority_counts[column, code])))
+        self._add(deltas)
+
+    # Persistence
+
+    def flush(self) -> int:
+        """Write pending counters to SQLite; returns the number of rows upserted"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return 0
+        with self._db_lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(_UPSERT, [key + (count,) for key, count in pending.items()])
+        return len(pending)
+
+    def close(self) -> None:
+        """Cancel any scheduled flush and write pending counters now, e.g. on shutdown"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        self.flush()
+
+    def reset(self) -> None:
+        """Drop every counter, pending and persisted"""
+        with self._lock:
+            self._pending.clear()
+        with self._db_lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM analytics_counters")
+
+    # Summary
+
+    def summary(
+        self,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Counters summed over the matching regions and time windows"""
+        self.flush()
+        conditions, parameters = [], []
+        if state is not None:
+            conditions.append("state = ?")
+            parameters.append(state)
+        if district is not None:
+            conditions.append("district = ?")
+            parameters.append(district)
+        if since is not None:
+            conditions.append("bucket >= ?")
+            parameters.append(self._bucket(since.timestamp()))
+        if until is not None:
+            conditions.append("bucket <= ?")
+            parameters.append(self._bucket(until.timestamp()))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._db_lock:
+            rows = self._connect().execute(
+                f"SELECT metric, key, SUM(count) FROM analytics_counters {where} GROUP BY metric, key", parameters
+            ).fetchall()
+            window = self._connect().execute(
+                f"SELECT MIN(bucket), MAX(bucket) FROM analytics_counters {where}", parameters
+            ).fetchone()
+
+        totals: Dict[str, Dict[str, int]] = {}
+        for metric, key, count in rows:
+            totals.setdefault(metric, {})[key] = int(count)
+
+        requests = {kind: totals.get(REQUESTS, {}).get(kind, 0) for kind in REQUEST_KINDS}
+        requests["total"] = sum(requests.values())
+        assessed, eligible = totals.get(SCHEME_ASSESSED, {}), totals.get(SCHEME_ELIGIBLE, {})
+        intervention_types = totals.get(INTERVENTION_TYPE, {})
+
+        return {
+            "requests_processed": requests,
+            "scheme_eligibility_rates": {
+                scheme.value: round(eligible.get(scheme.value, 0) / assessed[scheme.value] * 100, 1)
+                for scheme in SchemeType if assessed.get(scheme.value)
+            },
+            "intervention_priorities": {priority.value: totals.get(PRIORITY, {}).get(priority.value, 0) for priority in InterventionPriority},
+            "top_interventions": [
+                {"type": intervention_type, "villages": count}
+                for intervention_type, count in sorted(intervention_types.items(), key=lambda item: item[1], reverse=True)
+            ],
+            "time_window": {
+                "from": _iso(window[0]),
+                "to": _iso(window[1] + self.bucket_seconds) if window[1] is not None else None,
+                "bucket_seconds": self.bucket_seconds
+            }
+        }
+
+def _iso(timestamp: Optional[int]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat() if timestamp is not None else None
+
+# Shared collector fed by the DSS routes
+dss_analytics = AnalyticsCollector()
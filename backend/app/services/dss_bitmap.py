@@ -0,0 +1,192 @@
+"""
+Compressed row bitmaps for DSS indexes
+
+A Roaring-style bitmap over uint32 row ids. Rows are split into chunks of 65536
+by their high 16 bits; each chunk is stored as a sorted uint16 array while it
+holds at most ARRAY_LIMIT rows and as a 1024-word uint64 bitset once it is
+denser, so sparse sets (a district's holders) and dense sets (NOT_ELIGIBLE for a
+scheme) both stay small. AND/OR/AND-NOT combine chunk by chunk with NumPy, and
+bitmaps serialize to a flat uint16 buffer for persistence.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+WORDS = CHUNK_SIZE // 64
+# Chunks with more rows than this are stored as bitsets
+ARRAY_LIMIT = 4096
+
+_EMPTY_IDS = np.array([], dtype=np.uint32)
+
+def _is_bitset(container: np.ndarray) -> bool:
+    return container.dtype == np.uint64
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(words: np.ndarray) -> int:
+        return int(np.bitwise_count(words).sum())
+else:  # NumPy < 2.0
+    def _popcount(words: np.ndarray) -> int:
+        return int(np.unpackbits(words.view(np.uint8)).sum())
+
+def _cardinality(container: np.ndarray) -> int:
+    return _popcount(container) if _is_bitset(container) else int(container.shape[0])
+
+def _to_bitset(container: np.ndarray) -> np.ndarray:
+    if _is_bitset(container):
+        return container
+    bits = np.zeros(CHUNK_SIZE, dtype=bool)
+    bits[container] = True
+    return np.packbits(bits, bitorder="little").view("<u8").astype(np.uint64)
+
+def _to_values(container: np.ndarray) -> np.ndarray:
+    if not _is_bitset(container):
+        return container
+    return np.flatnonzero(np.unpackbits(container.astype("<u8").view(np.uint8), bitorder="little")).astype(np.uint16)
+
+def _contains(bitset: np.ndarray, values: np.ndarray) -> np.ndarray:
+    return ((bitset[values >> 6] >> (values & 63).astype(np.uint64)) & np.uint64(1)).astype(bool)
+
+def _normalize(container: np.ndarray) -> Optional[np.ndarray]:
+    """Pick the smaller representation; None for an empty chunk"""
+    cardinality = _cardinality(container)
+    if cardinality == 0:
+        return None
+    if _is_bitset(container):
+        return _to_values(container) if cardinality <= ARRAY_LIMIT else container
+    return _to_bitset(container) if cardinality > ARRAY_LIMIT else container
+
+def _and(a: np.ndarray, b: np.ndarray) -> Optional[np.ndarray]:
+    if _is_bitset(a) and _is_bitset(b):
+        return _normalize(a & b)
+    if _is_bitset(a):
+        a, b = b, a
+    if _is_bitset(b):
+        return _normalize(a[_contains(b, a)])
+    return _normalize(np.intersect1d(a, b, assume_unique=True))
+
+def _or(a: np.ndarray, b: np.ndarray) -> Optional[np.ndarray]:
+    if _is_bitset(a) or _is_bitset(b):
+        return _normalize(_to_bitset(a) | _to_bitset(b))
+    return _normalize(np.union1d(a, b).astype(np.uint16))
+
+def _and_not(a: np.ndarray, b: np.ndarray) -> Optional[np.ndarray]:
+    if _is_bitset(a):
+        return _normalize(a & ~_to_bitset(b))
+    if _is_bitset(b):
+        return _normalize(a[~_contains(b, a)])
+    return _normalize(np.setdiff1d(a, b, assume_unique=True).astype(np.uint16))
+
+class RowBitmap:
+    """Compressed set of uint32 row ids with bitwise set algebra"""
+
+    __slots__ = ("_chunks",)
+
+    def __init__(self, chunks: Optional[Dict[int, np.ndarray]] = None):
+        self._chunks: Dict[int, np.ndarray] = chunks or {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[int]) -> "RowBitmap":
+        """Bitmap of the given row ids (any order, duplicates allowed)"""
+        rows = np.unique(np.asarray(rows if isinstance(rows, np.ndarray) else list(rows), dtype=np.uint32))
+        chunks: Dict[int, np.ndarray] = {}
+        if rows.shape[0]:
+            keys = rows >> CHUNK_BITS
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1, [rows.shape[0]]))
+            for start, end in zip(starts[:-1], starts[1:]):
+                chunks[int(keys[start])] = _normalize((rows[start:end] & 0xFFFF).astype(np.uint16))
+        return cls(chunks)
+
+    def __len__(self) -> int:
+        return sum(_cardinality(container) for container in self._chunks.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._chunks)
+
+    def __contains__(self, row: int) -> bool:
+        container = self._chunks.get(row >> CHUNK_BITS)
+        if container is None:
+            return False
+        low = np.uint16(row & 0xFFFF)
+        if _is_bitset(container):
+            return bool(_contains(container, np.array([low]))[0])
+        position = int(np.searchsorted(container, low))
+        return position < container.shape[0] and container[position] == low
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RowBitmap) and np.array_equal(self.to_array(), other.to_array())
+
+    def __and__(self, other: "RowBitmap") -> "RowBitmap":
+        chunks = {}
+        for key in self._chunks.keys() & other._chunks.keys():
+            container = _and(self._chunks[key], other._chunks[key])
+            if container is not None:
+                chunks[key] = container
+        return RowBitmap(chunks)
+
+    def __or__(self, other: "RowBitmap") -> "RowBitmap":
+        chunks = dict(self._chunks)
+        for key, container in other._chunks.items():
+            existing = chunks.get(key)
+            chunks[key] = container if existing is None else _or(existing, container)
+        return RowBitmap(chunks)
+
+    def __sub__(self, other: "RowBitmap") -> "RowBitmap":
+        chunks = dict(self._chunks)
+        for key in self._chunks.keys() & other._chunks.keys():
+            container = _and_not(chunks[key], other._chunks[key])
+            if container is None:
+                del chunks[key]
+            else:
+                chunks[key] = container
+        return RowBitmap(chunks)
+
+    @staticmethod
+    def union(bitmaps: Iterable["RowBitmap"]) -> "RowBitmap":
+        result = RowBitmap()
+        for bitmap in bitmaps:
+            result = result | bitmap
+        return result
+
+    def to_array(self) -> np.ndarray:
+        """Sorted uint32 row ids"""
+        if not self._chunks:
+            return _EMPTY_IDS
+        return np.concatenate([
+            (np.uint32(key) << CHUNK_BITS) | _to_values(self._chunks[key]).astype(np.uint32)
+            for key in sorted(self._chunks)
+        ])
+
+    def nbytes(self) -> int:
+        return sum(container.nbytes for container in self._chunks.values())
+
+    # Persistence
+
+    def serialize(self) -> np.ndarray:
+        """
+        Flat uint16 buffer: chunk count (2 words), then per chunk its key (2 words),
+        kind (0 array, 1 bitset), length (2 words) and payload words
+        """
+        parts = [np.array([len(self._chunks) & 0xFFFF, len(self._chunks) >> 16], dtype=np.uint16)]
+        for key in sorted(self._chunks):
+            container = self._chunks[key]
+            payload = container.astype("<u8").view("<u2") if _is_bitset(container) else container
+            parts.append(np.array([key & 0xFFFF, key >> 16, int(_is_bitset(container)), payload.shape[0] & 0xFFFF, payload.shape[0] >> 16], dtype=np.uint16))
+            parts.append(payload.astype(np.uint16))
+        return np.concatenate(parts)
+
+    @classmethod
+    def deserialize(cls, buffer: np.ndarray) -> Tuple["RowBitmap", int]:
+        """Bitmap from the start of a serialized buffer, and the number of words read"""
+        count = int(buffer[0]) | int(buffer[1]) << 16
+        position = 2
+        chunks: Dict[int, np.ndarray] = {}
+        for _ in range(count):
+            key = int(buffer[position]) | int(buffer[position + 1]) << 16
+            bitset = bool(buffer[position + 2])
+            length = int(buffer[position + 3]) | int(buffer[position + 4]) << 16
+            payload = buffer[position + 5:position + 5 + length]
+            chunks[key] = payload.astype("<u2").view("<u8").astype(np.uint64) if bitset else payload.astype(np.uint16)
+            position += 5 + length
+        return cls(chunks), position
@@ -0,0 +1,348 @@
+"""
+Budget-constrained intervention selection for the DSS engine
+
+The policy report's resource_allocation only sums the cost of every CRITICAL and
+HIGH intervention, and its implementation timeline files interventions into four
+fixed buckets by priority. The optimizer instead funds, for each budget group
+(implementing ministry or state), the triggered interventions that maximize
+
+    value = impact_score x success_probability x estimated_beneficiaries
+
+within the group's budget: a 0/1 knapsack per group. Candidates come from one
+columnar evaluation of the village table and are ordered by value per rupee
+with a single lexsort. Each group is filled greedily in that order (skipping
+candidates that no longer fit) and the best single affordable candidate replaces
+the fill when it is worth more, which bounds the result within a factor 2 of the
+optimum; the LP relaxation (the fractional fill) bounds the optimum from above
+and the remaining gap is reported per group.
+
+With years > 1 budgets are annual: each year funds the best remaining
+candidates with that year's budget plus the previous years' unspent money,
+which phases the plan over several years instead of priority buckets.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+import logging
+import numpy as np
+
+from .dss_columnar import PRIORITY_CODES, ColumnarInterventions, VillageColumns
+
+logger = logging.getLogger(__name__)
+
+GROUP_BY_MINISTRY = "ministry"
+GROUP_BY_STATE = "state"
+GROUP_BY_CHOICES: Tuple[str, ...] = (GROUP_BY_MINISTRY, GROUP_BY_STATE)
+
+DEFAULT_MINISTRY = "Ministry of Rural Development"
+
+@dataclass
+class BudgetCandidates:
+    """Triggered interventions as flat arrays, one entry per (village, intervention type)"""
+    village: np.ndarray  # int64 row into the village table
+    intervention_type: np.ndarray  # int64 row into intervention_types
+    intervention_types: List[str]
+    group: np.ndarray  # str budget group label
+    cost: np.ndarray  # float64
+    value: np.ndarray  # float64
+    impact_score: np.ndarray
+    success_probability: np.ndarray
+    estimated_beneficiaries: np.ndarray
+    priority: np.ndarray  # int8 codes into PRIORITY_CODES
+
+    def __len__(self) -> int:
+        return int(self.cost.shape[0])
+
+def budget_candidates(
+    villages: VillageColumns,
+    interventions: ColumnarInterventions,
+    intervention_rules: Dict[str, Dict],
+    group_by: str = GROUP_BY_MINISTRY,
+    intervention_types: Optional[Sequence[str]] = None
+) -> BudgetCandidates:
+    """Flatten the triggered interventions of a village table into optimizer candidates"""
+    if group_by not in GROUP_BY_CHOICES:
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_BY_CHOICES)}")
+    triggered = interventions.triggered
+    if intervention_types is not None:
+        unknown = [t for t in intervention_types if t not in interventions.intervention_types]
+        if unknown:
+            raise ValueError(f"Unknown intervention types: {', '.join(unknown)}")
+        allowed = np.isin(interventions.intervention_types, list(intervention_types))
+        triggered = triggered & allowed[:, None]
+
+    rows, columns = np.nonzero(triggered)
+    success_probability = interventions.success_probability[columns]
+    beneficiaries = interventions.estimated_beneficiaries[columns]
+    impact_score = interventions.impact_score[rows, columns]
+
+    if group_by == GROUP_BY_MINISTRY:
+        ministries = np.array([
+            intervention_rules.get(t, {}).get("implementing_ministry", DEFAULT_MINISTRY) for t in interventions.intervention_types
+        ])
+        group = ministries[rows] if len(ministries) else np.array([], dtype=str)
+    else:
+        group = villages.state[columns]
+
+    return BudgetCandidates(
+        village=columns.astype(np.int64),
+        intervention_type=rows.astype(np.int64),
+        intervention_types=list(interventions.intervention_types),
+        group=group,
+        cost=interventions.estimated_cost[rows],
+        value=impact_score * success_probability * beneficiaries,
+        impact_score=impact_score,
+        success_probability=success_probability,
+        estimated_beneficiaries=beneficiaries,
+        priority=interventions.priority[rows, columns]
+    )
+
+def _ratio_order(cost: np.ndarray, value: np.ndarray) -> np.ndarray:
+    """Candidate positions by descending value per unit cost (free candidates first)"""
+    ratio = np.divide(value, cost, out=np.full(cost.shape, np.inf), where=cost > 0)
+    return np.lexsort((-value, -ratio))
+
+def fractional_bound(cost: np.ndarray, value: np.ndarray, budget: float) -> float:
+    """
+    LP relaxation of the 0/1 knapsack: the greedy prefix plus a fraction of the next candidate
+
+    cost and value must already be in descending value-per-cost order.
+    """
+    spent = np.cumsum(cost)
+    fits = int(np.searchsorted(spent, budget, side="right"))
+    bound = float(value[:fits].sum())
+    if fits < len(cost) and cost[fits] > 0:
+        bound += float(value[fits]) * (budget - (float(spent[fits - 1]) if fits else 0.0)) / float(cost[fits])
+    return bound
+
+def greedy_fill(cost: np.ndarray, value: np.ndarray, budget: float) -> np.ndarray:
+    """
+    Positions funded by the greedy fill with the best-single-candidate check
+
+    cost and value must already be in descending value-per-cost order. The prefix
+    that fits is taken with one cumsum; the tail is scanned only while the money
+    left covers its cheapest candidate.
+    """
+    if not len(cost) or budget < 0:
+        return np.array([], dtype=np.int64)
+    spent = np.cumsum(cost)
+    fits = int(np.searchsorted(spent, budget, side="right"))
+    chosen = list(range(fits))
+    left = budget - (float(spent[fits - 1]) if fits else 0.0)
+
+    if fits < len(cost):
+        cheapest_after = np.minimum.accumulate(cost[::-1])[::-1]
+        for position in range(fits, len(cost)):
+            if left < cheapest_after[position]:
+                break
+            if cost[position] <= left:
+                chosen.append(position)
+                left -= float(cost[position])
+
+    chosen_positions = np.array(chosen, dtype=np.int64)
+    affordable = np.flatnonzero(cost <= budget)
+    if len(affordable):
+        best_single = affordable[np.argmax(value[affordable])]
+        if value[best_single] > value[chosen_positions].sum():
+            return np.array([best_single], dtype=np.int64)
+    return chosen_positions
+
+@dataclass
+class BudgetGroupPlan:
+    """Funded candidates of one budget group"""
+    group: str
+    annual_budget: float
+    candidates: int
+    funded: np.ndarray  # candidate indices, in funding order
+    funded_year: np.ndarray  # int64 1-based year of each funded candidate
+    year_available: List[float]
+    year_spent: List[float]
+    year_value: List[float]
+    upper_bound: float
+
+    @property
+    def spent(self) -> float:
+        return float(sum(self.year_spent))
+
+    @property
+    def value(self) -> float:
+        return float(sum(self.year_value))
+
+def plan_group(group: str, positions: np.ndarray, candidates: BudgetCandidates, annual_budget: float, years: int) -> BudgetGroupPlan:
+    """Phase one group's candidates (in value-per-cost order) over years of annual_budget"""
+    cost = candidates.cost[positions]
+    value = candidates.value[positions]
+    remaining = np.arange(len(positions))
+    funded: List[np.ndarray] = []
+    funded_year: List[np.ndarray] = []
+    year_available, year_spent, year_value = [], [], []
+
+    carry = 0.0
+    for year in range(1, years + 1):
+        available = annual_budget + carry
+        chosen = remaining[greedy_fill(cost[remaining], value[remaining], available)]
+        spent = float(cost[chosen].sum())
+        funded.append(chosen)
+        funded_year.append(np.full(len(chosen), year, dtype=np.int64))
+        year_available.append(available)
+        year_spent.append(spent)
+        year_value.append(float(value[chosen].sum()))
+        carry = available - spent
+        remaining = np.setdiff1d(remaining, chosen, assume_unique=True)
+
+    chosen_all = np.concatenate(funded) if funded else np.array([], dtype=np.int64)
+    return BudgetGroupPlan(
+        group=group,
+        annual_budget=annual_budget,
+        candidates=len(positions),
+        funded=positions[chosen_all],
+        funded_year=np.concatenate(funded_year) if funded_year else np.array([], dtype=np.int64),
+        year_available=year_available,
+        year_spent=year_spent,
+        year_value=year_value,
+        # Carry-over makes the phased plan a knapsack over the whole horizon's budget
+        upper_bound=fractional_bound(cost, value, annual_budget * years)
+    )
+
+@dataclass
+class BudgetPlan:
+    """Optimized allocation per budget group, with the funded candidates"""
+    group_by: str
+    years: int
+    candidates: BudgetCandidates
+    groups: Dict[str, BudgetGroupPlan]
+    unbudgeted: Dict[str, int]  # candidates per group without a budget
+    village_code: np.ndarray
+    state: np.ndarray
+    district: np.ndarray
+
+    def funded(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Funded candidate indices and their years, ordered by year then value per cost"""
+        plans = list(self.groups.values())
+        if not plans:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        indices = np.concatenate([plan.funded for plan in plans])
+        years = np.concatenate([plan.funded_year for plan in plans])
+        cost, value = self.candidates.cost[indices], self.candidates.value[indices]
+        ratio = np.divide(value, cost, out=np.full(cost.shape, np.inf), where=cost > 0)
+        order = np.lexsort((-ratio, years))
+        return indices[order], years[order]
+
+    def to_dict(self, max_listed: Optional[int] = 1000) -> Dict[str, Any]:
+        """Per-group totals and yearly phasing, plus up to max_listed funded interventions"""
+        candidates = self.candidates
+        groups: Dict[str, Any] = {}
+        for name, plan in self.groups.items():
+            gap = float((plan.upper_bound - plan.value) / plan.upper_bound) if plan.upper_bound > 0 else 0.0
+            groups[name] = {
+                "annual_budget": plan.annual_budget,
+                "candidates": plan.candidates,
+                "funded": int(len(plan.funded)),
+                "spent": plan.spent,
+                "value": plan.value,
+                "upper_bound": plan.upper_bound,
+                "optimality_gap": gap,
+                "phases": [
+                    {
+                        "year": year,
+                        "available": plan.year_available[year - 1],
+                        "spent": plan.year_spent[year - 1],
+                        "value": plan.year_value[year - 1],
+                        "funded": int((plan.funded_year == year).sum())
+                    }
+                    for year in range(1, self.years + 1)
+                ]
+            }
+
+        funded, funded_year = self.funded()
+        listed = funded if max_listed is None else funded[:max_listed]
+        villages = candidates.village[listed]
+        return {
+            "summary": {
+                "group_by": self.group_by,
+                "years": self.years,
+                "candidates": len(candidates),
+                "funded": int(len(funded)),
+                "total_budget": sum(plan.annual_budget * self.years for plan in self.groups.values()),
+                "total_spent": sum(plan.spent for plan in self.groups.values()),
+                "total_value": sum(plan.value for plan in self.groups.values()),
+                "upper_bound": sum(plan.upper_bound for plan in self.groups.values()),
+                "unbudgeted_candidates": self.unbudgeted
+            },
+            "groups": groups,
+            "funded_interventions": [
+                {
+                    "village_code": str(self.village_code[village]),
+                    "state": str(self.state[village]),
+                    "district": str(self.district[village]),
+                    "intervention_type": candidates.intervention_types[candidates.intervention_type[index]],
+                    "group": str(candidates.group[index]),
+                    "year": int(year),
+                    "priority": PRIORITY_CODES[candidates.priority[index]].value,
+                    "estimated_cost": float(candidates.cost[index]),
+                    "value": float(candidates.value[index]),
+                    "impact_score": float(candidates.impact_score[index]),
+                    "success_probability": float(candidates.success_probability[index]),
+                    "estimated_beneficiaries": int(candidates.estimated_beneficiaries[index])
+                }
+                for index, village, year in zip(listed, villages, funded_year[:len(listed)])
+            ]
+        }
+
+def optimize_budget(
+    villages: VillageColumns,
+    interventions: ColumnarInterventions,
+    intervention_rules: Dict[str, Dict],
+    budgets: Dict[str, float],
+    group_by: str = GROUP_BY_MINISTRY,
+    years: int = 1,
+    intervention_types: Optional[Sequence[str]] = None
+) -> BudgetPlan:
+    """
+    Fund the most valuable interventions within each group's (annual) budget
+
+    budgets maps a ministry or state name (per group_by) to its budget; candidates
+    of groups without a budget are counted under unbudgeted and never funded.
+    """
+    if years < 1:
+        raise ValueError("years must be at least 1")
+    negative = [name for name, budget in budgets.items() if budget < 0]
+    if negative:
+        raise ValueError(f"Budgets must not be negative: {', '.join(negative)}")
+
+    candidates = budget_candidates(villages, interventions, intervention_rules, group_by, intervention_types)
+    # Worthless candidates are never funded
+    useful = np.flatnonzero(candidates.value > 0)
+    labels, codes = np.unique(candidates.group[useful], return_inverse=True)
+    codes = codes.ravel()
+
+    # One sort: by group, then by value per cost within the group
+    ratio_rank = np.empty(len(useful), dtype=np.int64)
+    ratio_rank[_ratio_order(candidates.cost[useful], candidates.value[useful])] = np.arange(len(useful))
+    order = useful[np.lexsort((ratio_rank, codes))]
+    boundaries = np.searchsorted(np.sort(codes), np.arange(len(labels) + 1))
+
+    groups: Dict[str, BudgetGroupPlan] = {}
+    unbudgeted: Dict[str, int] = {}
+    for code, label in enumerate(labels):
+        name = str(label)
+        positions = order[boundaries[code]:boundaries[code + 1]]
+        if name not in budgets:
+            unbudgeted[name] = int(len(positions))
+            continue
+        groups[name] = plan_group(name, positions, candidates, float(budgets[name]), years)
+    for name, budget in budgets.items():
+        if name not in groups:
+            groups[name] = plan_group(name, np.array([], dtype=np.int64), candidates, float(budget), years)
+
+    logger.debug(f"Budget optimization over {len(candidates)} candidates in {len(labels)} {group_by} groups, {years} years")
+    return BudgetPlan(
+        group_by=group_by,
+        years=years,
+        candidates=candidates,
+        groups=groups,
+        unbudgeted=unbudgeted,
+        village_code=villages.village_code,
+        state=villages.state,
+        district=villages.district
+    )
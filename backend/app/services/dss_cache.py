@@ -0,0 +1,208 @@
+"""
+Eligibility result cache for the DSS engine
+
+Field offices re-submit the same FRA holders repeatedly. This LRU cache sits in
+front of DSSEngine.assess_individual_eligibility, keyed by a stable hash of the
+holder's fields plus the version stamp of the engine's scheme_rules. Any change to
+the rules changes the version and drops all cached results. Results are stored
+under the version read before they were assessed, so results of an assessment
+that raced a rules change are dropped instead of cached under the new version.
+Results for a subset of schemes (schemes_filter) are cached under their own key;
+full results serve subset lookups too. Memory is bounded by maxsize and entries can optionally expire after a TTL.
+
+Configuration (environment):
+    DSS_ELIGIBILITY_CACHE_SIZE  maximum cached holders (default 100000, 0 disables)
+    DSS_ELIGIBILITY_CACHE_TTL   seconds before an entry expires (default: no expiry)
+"""
+
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from dataclasses import fields
+import hashlib
+import logging
+import os
+import threading
+import time
+
+from .dss_service import DSSEngine, FRAHolder, SchemeEligibility, SchemeType, dss_engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = int(os.getenv("DSS_ELIGIBILITY_CACHE_SIZE", "100000"))
+DEFAULT_CACHE_TTL = float(os.getenv("DSS_ELIGIBILITY_CACHE_TTL", "0")) or None
+
+HOLDER_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(FRAHolder))
+
+def holder_fingerprint(holder: FRAHolder) -> str:
+    """Stable content hash of every FRAHolder field"""
+    encoded = repr(tuple(getattr(holder, name) for name in HOLDER_FIELDS)).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+def schemes_key(schemes: Optional[Collection[SchemeType]]) -> str:
+    """Cache key component of a scheme subset; empty for every scheme"""
+    if schemes is None:
+        return ""
+    selected = [scheme.value for scheme in SchemeType if scheme in schemes]
+    if len(selected) == len(SchemeType):
+        return ""
+    return ",".join(selected) or "-"
+
+CacheKey = Tuple[str, str, str]
+
+class EligibilityCache:
+    """Bounded LRU cache of eligibility results with optional TTL and rule-version invalidation"""
+
+    def __init__(self, engine: DSSEngine = dss_engine, maxsize: int = DEFAULT_CACHE_SIZE, ttl_seconds: Optional[float] = DEFAULT_CACHE_TTL):
+        self.engine = engine
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[float, List[SchemeEligibility]]]" = OrderedDict()
+        self._rules_version = engine.scheme_rules_version()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _current_version(self) -> str:
+        """Check the engine's rule version, dropping every entry if the rules changed"""
+        version = self.engine.scheme_rules_version()
+        if version != self._rules_version:
+            with self._lock:
+                if self._entries:
+                    logger.info(f"Scheme rules changed; invalidating {len(self._entries)} cached eligibility results")
+                self._entries.clear()
+                self._rules_version = version
+                self.invalidations += 1
+        return version
+
+    def _get(self, key: CacheKey, now: float, count: bool = True) -> Optional[List[SchemeEligibility]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += count
+            return None
+        expires_at, eligibilities = entry
+        if expires_at and expires_at < now:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += count
+            return None
+        self._entries.move_to_end(key)
+        self.hits += count
+        return list(eligibilities)
+
+    def _lookup(self, version: str, fingerprint: str, schemes: Optional[Collection[SchemeType]], now: float) -> Optional[List[SchemeEligibility]]:
+        """Cached results for a holder, taking a scheme subset from cached full results when present"""
+        subset = schemes_key(schemes)
+        if subset:
+            full = self._get((version, fingerprint, ""), now, count=False)
+            if full is not None:
+                self.hits += 1
+                return [e for e in full if e.scheme in schemes]
+        return self._get((version, fingerprint, subset), now)
+
+    def _put(self, key: CacheKey, eligibilities: List[SchemeEligibility], now: float) -> None:
+        """Cache results under their rule version, dropping them if the rules have changed since (lock held)"""
+        if self.maxsize <= 0 or key[0] != self._rules_version:
+            return
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else 0.0
+        self._entries[key] = (expires_at, list(eligibilities))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def assess(self, holder: FRAHolder, schemes: Optional[Collection[SchemeType]] = None) -> List[SchemeEligibility]:
+        """Cached DSSEngine.assess_individual_eligibility"""
+        version = self._current_version()
+        fingerprint = holder_fingerprint(holder)
+        with self._lock:
+            cached = self._lookup(version, fingerprint, schemes, time.monotonic())
+        if cached is not None:
+            return cached
+
+        eligibilities = self.engine.assess_individual_eligibility(holder, schemes)
+        self._current_version()
+        with self._lock:
+            self._put((version, fingerprint, schemes_key(schemes)), eligibilities, time.monotonic())
+        return eligibilities
+
+    def lookup_many(
+        self,
+        holders: Sequence[FRAHolder],
+        schemes: Optional[Collection[SchemeType]] = None
+    ) -> Tuple[List[Optional[List[SchemeEligibility]]], List[int], str]:
+        """
+        Look up a batch of holders
+
+        Returns the per-holder results (None for misses), the indices of the misses and
+        the rule version looked up, so callers can assess only the misses (e.g. on the
+        sharded executor) and store them under that version with store_many.
+        """
+        version = self._current_version()
+        now = time.monotonic()
+        results: List[Optional[List[SchemeEligibility]]] = []
+        missing: List[int] = []
+        with self._lock:
+            for index, holder in enumerate(holders):
+                cached = self._lookup(version, holder_fingerprint(holder), schemes, now)
+                results.append(cached)
+                if cached is None:
+                    missing.append(index)
+        return results, missing, version
+
+    def store_many(
+        self,
+        holders: Sequence[FRAHolder],
+        eligibilities: Sequence[List[SchemeEligibility]],
+        version: str,
+        schemes: Optional[Collection[SchemeType]] = None
+    ) -> None:
+        """
+        Store freshly assessed results (for the given scheme subset) for a batch of holders
+
+        version is the one lookup_many returned before the assessment; if the rules
+        changed meanwhile the results are dropped rather than cached under the new version.
+        """
+        self._current_version()
+        subset = schemes_key(schemes)
+        now = time.monotonic()
+        with self._lock:
+            for holder, holder_eligibilities in zip(holders, eligibilities):
+                self._put((version, holder_fingerprint(holder), subset), holder_eligibilities, now)
+
+    def assess_many(self, holders: Sequence[FRAHolder], schemes: Optional[Collection[SchemeType]] = None) -> List[List[SchemeEligibility]]:
+        """Cached assessment of a batch of holders, evaluating only the misses"""
+        results, missing, version = self.lookup_many(holders, schemes)
+        if missing:
+            missing_holders = [holders[index] for index in missing]
+            computed = [self.engine.assess_individual_eligibility(holder, schemes) for holder in missing_holders]
+            self.store_many(missing_holders, computed, version, schemes)
+            for index, holder_eligibilities in zip(missing, computed):
+                results[index] = holder_eligibilities
+        return results
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "rules_version": self._rules_version
+            }
+
+# Shared cache used by the eligibility endpoints
+eligibility_cache = EligibilityCache(dss_engine)
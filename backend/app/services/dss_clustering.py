@@ -0,0 +1,296 @@
+"""
+Spatial clustering of priority villages for bundled procurement
+
+Neighbouring villages often need the same CRITICAL interventions, and a
+ministry can tender them as one contract. The villages with at least one
+selected intervention (by priority and type) are clustered DBSCAN-style on
+their latitude/longitude with haversine distance: a village with at least
+min_villages villages (itself included) within eps_km is a core village, core
+villages within eps_km of each other share a cluster, and other villages join
+the cluster of a core village within reach or stay unbundled.
+
+Neighbours are found on a grid instead of comparing all pairs: cells are eps_km
+tall and, at the highest latitude present, wide enough that two villages within
+eps_km always fall in the same or adjacent cells. Only pairs from adjacent
+cells are measured, in bounded chunks, and clusters are the connected components
+of the core-to-core pairs, found with vectorized label propagation. Longitudes
+do not wrap at the antimeridian.
+
+Each cluster reports its villages, centroid and radius, and combined
+intervention cost and beneficiaries, in total and per intervention type.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+import logging
+import numpy as np
+
+from .dss_columnar import PRIORITY_INDEX, ColumnarInterventions, VillageColumns
+from .dss_service import InterventionPriority
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+DEFAULT_EPS_KM = 5.0
+DEFAULT_MIN_VILLAGES = 3
+DEFAULT_PRIORITIES: Tuple[InterventionPriority, ...] = (InterventionPriority.CRITICAL,)
+
+# Candidate pairs measured per chunk, bounding memory in dense regions
+PAIR_CHUNK = 2_000_000
+
+# Cell offsets covering each pair of adjacent cells once
+_NEIGHBOUR_OFFSETS: Tuple[Tuple[int, int], ...] = ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1))
+
+def haversine_km(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km between points given in degrees"""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    half_chord = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(half_chord, 0.0, 1.0)))
+
+def neighbour_pairs(latitude: np.ndarray, longitude: np.ndarray, eps_km: float) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Chunks of index pairs (i, j), i != j, of points within eps_km of each other; each pair once"""
+    if latitude.shape[0] < 2:
+        return
+    phi, lam = np.radians(latitude), np.radians(longitude)
+    cos_phi = np.cos(phi)
+    eps = eps_km / EARTH_RADIUS_KM
+    threshold = np.sin(eps / 2) ** 2
+
+    # hav(d) >= cos(phi1) cos(phi2) hav(dlam), so within eps |dlam| <= 2 asin(sin(eps/2) / cos(phi_max))
+    spread = np.sin(eps / 2) / max(float(np.cos(np.abs(phi).max())), 1e-12)
+    cell_height = eps
+    cell_width = 2 * np.arcsin(spread) if spread < 1 else 2 * np.pi
+    rows = np.floor(phi / cell_height).astype(np.int64)
+    columns = np.floor(lam / cell_width).astype(np.int64)
+    rows -= rows.min()
+    columns -= columns.min() - 1
+    width = int(columns.max()) + 2
+    keys = rows * width + columns
+
+    order = np.argsort(keys, kind="stable")
+    cells, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    sorted_phi, sorted_lam, sorted_cos = phi[order], lam[order], cos_phi[order]
+
+    for row_offset, column_offset in _NEIGHBOUR_OFFSETS:
+        targets = cells + row_offset * width + column_offset
+        found = np.minimum(np.searchsorted(cells, targets), cells.shape[0] - 1)
+        matched = cells[found] == targets
+        first_cells, second_cells = np.flatnonzero(matched), found[matched]
+        sizes = counts[first_cells] * counts[second_cells]
+        if not sizes.shape[0]:
+            continue
+
+        # Split the cell pairs so each chunk measures about PAIR_CHUNK pairs
+        bounds = np.searchsorted(np.cumsum(sizes), np.arange(PAIR_CHUNK, int(sizes.sum()), PAIR_CHUNK), side="right")
+        for chunk in np.split(np.arange(sizes.shape[0]), np.unique(bounds)):
+            if not chunk.shape[0]:
+                continue
+            chunk_sizes = sizes[chunk]
+            pair_cell = np.repeat(chunk, chunk_sizes)
+            local = np.arange(int(chunk_sizes.sum())) - np.repeat(np.cumsum(chunk_sizes) - chunk_sizes, chunk_sizes)
+            second_counts = counts[second_cells[pair_cell]]
+            first = starts[first_cells[pair_cell]] + local // second_counts
+            second = starts[second_cells[pair_cell]] + local % second_counts
+            if row_offset == 0 and column_offset == 0:
+                keep = first < second
+                first, second = first[keep], second[keep]
+            half_chord = (
+                np.sin((sorted_phi[second] - sorted_phi[first]) / 2) ** 2
+                + sorted_cos[first] * sorted_cos[second] * np.sin((sorted_lam[second] - sorted_lam[first]) / 2) ** 2
+            )
+            within = half_chord <= threshold
+            yield order[first[within]], order[second[within]]
+
+def connected_components(count: int, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Component label (smallest member index) of each of count nodes joined by edges (first, second)"""
+    labels = np.arange(count)
+    while first.shape[0]:
+        first_labels, second_labels = labels[first], labels[second]
+        if np.array_equal(first_labels, second_labels):
+            break
+        # Hook each root onto the smallest root it is joined to, then flatten the trees
+        lowest = np.minimum(first_labels, second_labels)
+        np.minimum.at(labels, first_labels, lowest)
+        np.minimum.at(labels, second_labels, lowest)
+        while True:
+            flattened = labels[labels]
+            if np.array_equal(flattened, labels):
+                break
+            labels = flattened
+    return labels
+
+def dbscan_labels(latitude: np.ndarray, longitude: np.ndarray, eps_km: float, min_villages: int) -> np.ndarray:
+    """DBSCAN cluster label of each point (smallest core index in its cluster), -1 for noise"""
+    count = latitude.shape[0]
+    pairs = list(neighbour_pairs(latitude, longitude, eps_km))
+    first = np.concatenate([pair[0] for pair in pairs]) if pairs else np.array([], dtype=np.int64)
+    second = np.concatenate([pair[1] for pair in pairs]) if pairs else np.array([], dtype=np.int64)
+
+    neighbours = np.bincount(first, minlength=count) + np.bincount(second, minlength=count)
+    core = neighbours + 1 >= min_villages
+    joined = core[first] & core[second]
+    labels = connected_components(count, first[joined], second[joined])
+    labels[~core] = -1
+
+    # Border villages join the cluster of a core neighbour (the lowest label, for determinism)
+    border = np.full(count, count, dtype=np.int64)
+    for core_side, other_side in ((first, second), (second, first)):
+        reach = core[core_side] & ~core[other_side]
+        np.minimum.at(border, other_side[reach], labels[core_side[reach]])
+    assigned = border < count
+    labels[assigned] = border[assigned]
+    return labels
+
+@dataclass
+class InterventionClusters:
+    """Clusters of priority villages with per-cluster intervention totals"""
+    eps_km: float
+    min_villages: int
+    priorities: List[InterventionPriority]
+    intervention_types: List[str]
+    selected: np.ndarray  # bool (types, villages): interventions included in the clustering
+    village: np.ndarray  # int64 rows into the village table of the clustered candidates
+    cluster: np.ndarray  # int64 cluster per candidate village, -1 for unbundled
+    without_coordinates: int
+    villages: VillageColumns
+    interventions: ColumnarInterventions
+    implementing_ministries: Dict[str, str]
+
+    @property
+    def cluster_count(self) -> int:
+        return int(self.cluster.max()) + 1 if self.cluster.shape[0] else 0
+
+    def _totals(self, mask: np.ndarray, groups: np.ndarray, group_count: int) -> Dict[str, Any]:
+        """Interventions, cost and beneficiaries per group, in total and per intervention type"""
+        villages = self.village[mask]
+        groups = groups[mask]
+        selected = self.selected[:, villages]
+        beneficiaries = self.interventions.estimated_beneficiaries[villages].astype(np.float64)
+        per_type = {}
+        for row, intervention_type in enumerate(self.interventions.intervention_types):
+            chosen = selected[row]
+            per_type[intervention_type] = (
+                np.bincount(groups, weights=chosen, minlength=group_count),
+                np.bincount(groups, weights=chosen * self.interventions.estimated_cost[row], minlength=group_count),
+                np.bincount(groups, weights=chosen * beneficiaries, minlength=group_count)
+            )
+        return {
+            "villages": np.bincount(groups, minlength=group_count),
+            "interventions": np.bincount(groups, weights=selected.sum(axis=0), minlength=group_count),
+            "cost": sum(cost for _, cost, _ in per_type.values()) if per_type else np.zeros(group_count),
+            "beneficiaries": np.bincount(groups, weights=beneficiaries, minlength=group_count),
+            "per_type": per_type
+        }
+
+    def to_dict(self, max_listed: Optional[int] = 1000, max_listed_villages: Optional[int] = None) -> Dict[str, Any]:
+        """Summary and up to max_listed clusters, largest combined cost first"""
+        count = self.cluster_count
+        clustered = self.cluster >= 0
+        totals = self._totals(clustered, self.cluster, count)
+        unbundled = self._totals(~clustered, np.zeros(self.cluster.shape[0], dtype=np.int64), 1)
+
+        latitude = self.villages.latitude[self.village]
+        longitude = self.villages.longitude[self.village]
+        members = np.argsort(self.cluster, kind="stable")[int((~clustered).sum()):]
+        boundaries = np.searchsorted(self.cluster[members], np.arange(count + 1))
+
+        order = np.lexsort((np.arange(count), -totals["cost"]))
+        listed = order if max_listed is None else order[:max_listed]
+        clusters = []
+        for cluster in listed.tolist():
+            positions = members[boundaries[cluster]:boundaries[cluster + 1]]
+            rows = self.village[positions]
+            # Centroid of the members' unit vectors, projected back to the sphere
+            phi, lam = np.radians(latitude[positions]), np.radians(longitude[positions])
+            x, y, z = (np.cos(phi) * np.cos(lam)).mean(), (np.cos(phi) * np.sin(lam)).mean(), np.sin(phi).mean()
+            centre_lat, centre_lon = float(np.degrees(np.arctan2(z, np.hypot(x, y)))), float(np.degrees(np.arctan2(y, x)))
+            radius = haversine_km(centre_lat, centre_lon, latitude[positions], longitude[positions]).max()
+            village_codes = self.villages.village_code[rows].tolist()
+            clusters.append({
+                "cluster_id": len(clusters),
+                "villages": int(totals["villages"][cluster]),
+                "interventions": int(totals["interventions"][cluster]),
+                "total_cost": float(totals["cost"][cluster]),
+                "total_beneficiaries": int(totals["beneficiaries"][cluster]),
+                "centroid": {"latitude": centre_lat, "longitude": centre_lon},
+                "radius_km": float(radius),
+                "states": sorted(set(self.villages.state[rows].tolist())),
+                "districts": sorted(set(self.villages.district[rows].tolist())),
+                "by_intervention_type": {
+                    intervention_type: {
+                        "implementing_ministry": self.implementing_ministries.get(intervention_type),
+                        "interventions": int(counts[cluster]),
+                        "cost": float(costs[cluster]),
+                        "beneficiaries": int(people[cluster])
+                    }
+                    for intervention_type, (counts, costs, people) in totals["per_type"].items()
+                    if counts[cluster]
+                },
+                "village_codes": village_codes if max_listed_villages is None else village_codes[:max_listed_villages]
+            })
+
+        return {
+            "summary": {
+                "eps_km": self.eps_km,
+                "min_villages": self.min_villages,
+                "priorities": [priority.value for priority in self.priorities],
+                "intervention_types": self.intervention_types,
+                "candidate_villages": int(self.village.shape[0]),
+                "without_coordinates": self.without_coordinates,
+                "clusters": count,
+                "clustered_villages": int(clustered.sum()),
+                "clustered_interventions": int(totals["interventions"].sum()),
+                "clustered_cost": float(totals["cost"].sum()),
+                "clustered_beneficiaries": int(totals["beneficiaries"].sum()),
+                "unbundled_villages": int(unbundled["villages"][0]),
+                "unbundled_interventions": int(unbundled["interventions"][0]),
+                "unbundled_cost": float(unbundled["cost"][0])
+            },
+            "clusters": clusters
+        }
+
+def cluster_priority_villages(
+    villages: VillageColumns,
+    interventions: ColumnarInterventions,
+    intervention_rules: Dict[str, Dict],
+    priorities: Optional[Sequence[InterventionPriority]] = None,
+    intervention_types: Optional[Sequence[str]] = None,
+    eps_km: float = DEFAULT_EPS_KM,
+    min_villages: int = DEFAULT_MIN_VILLAGES
+) -> InterventionClusters:
+    """Cluster the villages with triggered interventions of the given priorities and types by location"""
+    if eps_km <= 0:
+        raise ValueError("eps_km must be positive")
+    if min_villages < 1:
+        raise ValueError("min_villages must be at least 1")
+    priorities = list(priorities) if priorities else list(DEFAULT_PRIORITIES)
+
+    selected = interventions.triggered & np.isin(interventions.priority, [PRIORITY_INDEX[priority] for priority in priorities])
+    if intervention_types is not None:
+        unknown = [t for t in intervention_types if t not in interventions.intervention_types]
+        if unknown:
+            raise ValueError(f"Unknown intervention types: {', '.join(unknown)}")
+        selected &= np.isin(interventions.intervention_types, list(intervention_types))[:, None]
+
+    candidates = selected.any(axis=0)
+    located = ~np.isnan(villages.latitude) & ~np.isnan(villages.longitude)
+    village = np.flatnonzero(candidates & located)
+    cluster = dbscan_labels(villages.latitude[village], villages.longitude[village], eps_km, min_villages)
+    # Number clusters 0..n-1 in order of their lowest member
+    _, cluster[cluster >= 0] = np.unique(cluster[cluster >= 0], return_inverse=True)
+
+    logger.info(f"Clustered {village.shape[0]} priority villages into {int(cluster.max()) + 1 if village.shape[0] else 0} clusters")
+    return InterventionClusters(
+        eps_km=eps_km,
+        min_villages=min_villages,
+        priorities=priorities,
+        intervention_types=list(intervention_types) if intervention_types is not None else list(interventions.intervention_types),
+        selected=selected,
+        village=village,
+        cluster=cluster,
+        without_coordinates=int((candidates & ~located).sum()),
+        villages=villages,
+        interventions=interventions,
+        implementing_ministries={t: rules.get("implementing_ministry") for t, rules in intervention_rules.items()}
+    )
@@ -0,0 +1,573 @@
+"""
+Columnar (vectorized) evaluation for the DSS engine
+
+The row-oriented engine in dss_service evaluates one FRAHolder at a time and
+allocates a SchemeEligibility per scheme per holder. For state-level runs over
+millions of patta holders this module evaluates the same scheme rules as NumPy
+boolean masks over a columnar holder table and returns columnar
+status/confidence/amount arrays instead of per-holder objects. Village
+intervention triggers are evaluated the same way over a columnar village table.
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from array import array
+from dataclasses import dataclass
+import logging
+import numpy as np
+
+from .dss_service import FRAHolder, VillageProfile, SchemeType, SchemeEligibility, EligibilityStatus, InterventionPriority
+
+logger = logging.getLogger(__name__)
+
+# Status codes stored in the int8 status arrays index into this list
+STATUS_CODES: List[EligibilityStatus] = list(EligibilityStatus)
+STATUS_INDEX: Dict[EligibilityStatus, int] = {status: code for code, status in enumerate(STATUS_CODES)}
+
+ELIGIBLE = STATUS_INDEX[EligibilityStatus.ELIGIBLE]
+NOT_ELIGIBLE = STATUS_INDEX[EligibilityStatus.NOT_ELIGIBLE]
+REQUIRES_VERIFICATION = STATUS_INDEX[EligibilityStatus.REQUIRES_VERIFICATION]
+PENDING_DOCUMENTS = STATUS_INDEX[EligibilityStatus.PENDING_DOCUMENTS]
+
+# Fields of FRAHolder the columnar rules read, with their column dtypes
+HOLDER_COLUMN_DTYPES: Dict[str, object] = {
+    "family_size": np.int16,
+    "land_area_hectares": np.float64,
+    "annual_income": np.float64,  # NaN where income is unknown
+    "has_bank_account": np.bool_,
+    "aadhaar_linked": np.bool_,
+    "age": np.int16,
+    "has_toilet": np.bool_,
+}
+
+# String-valued fields kept as NumPy unicode arrays
+HOLDER_TEXT_COLUMNS: Tuple[str, ...] = ("holder_id", "social_category", "occupation", "village_code", "district", "state")
+
+@dataclass
+class HolderColumns:
+    """Columnar table of FRA holders (one NumPy array per field)"""
+    holder_id: np.ndarray
+    family_size: np.ndarray
+    land_area_hectares: np.ndarray
+    annual_income: np.ndarray
+    social_category: np.ndarray
+    has_bank_account: np.ndarray
+    aadhaar_linked: np.ndarray
+    age: np.ndarray
+    occupation: np.ndarray  # lower-cased
+    has_toilet: np.ndarray
+    village_code: np.ndarray
+    district: np.ndarray
+    state: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.holder_id.shape[0])
+
+    @classmethod
+    def from_holders(cls, holders: Sequence[FRAHolder]) -> "HolderColumns":
+        """Build a columnar table from FRAHolder records"""
+        count = len(holders)
+        columns: Dict[str, np.ndarray] = {}
+
+        for field, dtype in HOLDER_COLUMN_DTYPES.items():
+            if field == "annual_income":
+                values: Iterable = (np.nan if h.annual_income is None else h.annual_income for h in holders)
+            else:
+                values = (getattr(h, field) for h in holders)
+            columns[field] = np.fromiter(values, dtype=dtype, count=count)
+
+        for field in HOLDER_TEXT_COLUMNS:
+            columns[field] = np.array([getattr(h, field) for h in holders], dtype=str)
+
+        columns["occupation"] = np.char.lower(columns["occupation"])
+        return cls(**columns)
+
+    @classmethod
+    def from_arrays(cls, **arrays) -> "HolderColumns":
+        """
+        Build a columnar table from a mapping of field name to array-like
+
+        Accepts the output of pandas (``df.to_dict("series")``), Arrow tables
+        converted to NumPy, or the fields of a NumPy structured array.
+        """
+        missing = [f for f in (*HOLDER_COLUMN_DTYPES, *HOLDER_TEXT_COLUMNS) if f not in arrays]
+        if missing:
+            raise ValueError(f"Missing holder columns: {', '.join(missing)}")
+
+        columns: Dict[str, np.ndarray] = {}
+        for field, dtype in HOLDER_COLUMN_DTYPES.items():
+            columns[field] = np.asarray(arrays[field], dtype=dtype)
+        for field in HOLDER_TEXT_COLUMNS:
+            columns[field] = np.asarray(arrays[field]).astype(str)
+
+        columns["occupation"] = np.char.lower(columns["occupation"])
+
+        lengths = {field: column.shape[0] for field, column in columns.items()}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"Holder columns have mismatched lengths: {lengths}")
+        return cls(**columns)
+
+    @classmethod
+    def from_structured(cls, records: np.ndarray) -> "HolderColumns":
+        """Build a columnar table from a NumPy structured array with FRAHolder field names"""
+        return cls.from_arrays(**{name: records[name] for name in records.dtype.names})
+
+@dataclass
+class ColumnarEligibility:
+    """Eligibility results for a holder table, one row per scheme and one column per holder"""
+    holder_id: np.ndarray
+    schemes: List[SchemeType]
+    status: np.ndarray  # int8 codes into STATUS_CODES, shape (schemes, holders)
+    confidence: np.ndarray  # float64, shape (schemes, holders)
+    eligible_amount: np.ndarray  # float64, NaN where no amount applies
+    timeline_months: np.ndarray  # int16, shape (schemes, holders)
+
+    def __len__(self) -> int:
+        return int(self.holder_id.shape[0])
+
+    def scheme_row(self, scheme: SchemeType) -> int:
+        """Row index of a scheme in the result arrays"""
+        return self.schemes.index(scheme)
+
+    def status_labels(self, scheme: SchemeType) -> np.ndarray:
+        """Status values for one scheme as strings"""
+        labels = np.array([status.value for status in STATUS_CODES])
+        return labels[self.status[self.scheme_row(scheme)]]
+
+    def status_counts(self) -> Dict[str, Dict[str, int]]:
+        """Number of holders per scheme and status"""
+        counts: Dict[str, Dict[str, int]] = {}
+        for row, scheme in enumerate(self.schemes):
+            per_status = np.bincount(self.status[row], minlength=len(STATUS_CODES))
+            counts[scheme.value] = {status.value: int(per_status[code]) for code, status in enumerate(STATUS_CODES)}
+        return counts
+
+    def total_eligible_amount(self) -> Dict[str, float]:
+        """Sum of eligible amounts per scheme over ELIGIBLE holders"""
+        payable = np.where(self.status == ELIGIBLE, np.nan_to_num(self.eligible_amount), 0.0)
+        return {scheme.value: float(total) for scheme, total in zip(self.schemes, payable.sum(axis=1))}
+
+SCHEME_CODES: List[SchemeType] = list(SchemeType)
+SCHEME_INDEX: Dict[SchemeType, int] = {scheme: code for code, scheme in enumerate(SCHEME_CODES)}
+
+class CodeTable:
+    """Enumerates distinct reason or document tuples as small integer codes"""
+
+    def __init__(self):
+        self.values: List[Tuple[str, ...]] = []
+        self._codes: Dict[Tuple[str, ...], int] = {}
+
+    def code(self, value: Sequence[str]) -> int:
+        key = tuple(value)
+        code = self._codes.get(key)
+        if code is None:
+            code = len(self.values)
+            self._codes[key] = code
+            self.values.append(key)
+        return code
+
+    def __getitem__(self, code: int) -> Tuple[str, ...]:
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+class EligibilityResultSet:
+    """
+    Compact, append-only store of per-holder eligibility results
+
+    Every SchemeEligibility becomes one row of typed arrays (scheme, status,
+    confidence, amount, timeline, reason-set code, document-set code), with
+    reason and document tuples enumerated once in shared code tables. Holders
+    are addressed through row offsets, and SchemeEligibility objects are only
+    materialized on access. Results pickle as a handful of buffers, which keeps
+    bulk result sets small in memory and cheap to move between processes.
+    """
+
+    def __init__(self):
+        self.holder_ids: List[str] = []
+        self.offsets = array("I", [0])  # rows of holder i are offsets[i]:offsets[i + 1]
+        self.scheme = array("B")
+        self.status = array("b")
+        self.confidence = array("d")
+        self.eligible_amount = array("d")  # NaN where no amount applies
+        self.timeline_months = array("h")  # -1 where no timeline applies
+        self.reasons = array("I")
+        self.required_documents = array("I")
+        self.reason_sets = CodeTable()
+        self.document_sets = CodeTable()
+
+    @classmethod
+    def from_results(cls, holder_ids: Iterable[str], results: Iterable[List[SchemeEligibility]]) -> "EligibilityResultSet":
+        """Pack per-holder eligibility lists, e.g. the output of a bulk assessment"""
+        result_set = cls()
+        for holder_id, eligibilities in zip(holder_ids, results):
+            result_set.append(holder_id, eligibilities)
+        return result_set
+
+    def append(self, holder_id: str, eligibilities: List[SchemeEligibility]) -> None:
+        """Add one holder's eligibility results"""
+        self.holder_ids.append(holder_id)
+        for e in eligibilities:
+            self.scheme.append(SCHEME_INDEX[e.scheme])
+            self.status.append(STATUS_INDEX[e.status])
+            self.confidence.append(e.confidence_score)
+            self.eligible_amount.append(np.nan if e.eligible_amount is None else e.eligible_amount)
+            self.timeline_months.append(-1 if e.timeline_months is None else e.timeline_months)
+            self.reasons.append(self.reason_sets.code(e.reasons))
+            self.required_documents.append(self.document_sets.code(e.required_documents))
+        self.offsets.append(len(self.scheme))
+
+    def __len__(self) -> int:
+        return len(self.holder_ids)
+
+    def _row(self, row: int) -> SchemeEligibility:
+        amount = self.eligible_amount[row]
+        timeline = self.timeline_months[row]
+        return SchemeEligibility(
+            scheme=SCHEME_CODES[self.scheme[row]],
+            status=STATUS_CODES[self.status[row]],
+            confidence_score=self.confidence[row],
+            eligible_amount=None if amount != amount else amount,
+            reasons=self.reason_sets[self.reasons[row]],
+            required_documents=self.document_sets[self.required_documents[row]],
+            timeline_months=None if timeline < 0 else timeline
+        )
+
+    def __getitem__(self, index: int) -> List[SchemeEligibility]:
+        """Materialize one holder's results"""
+        if index < 0:
+            index += len(self)
+        return [self._row(row) for row in range(self.offsets[index], self.offsets[index + 1])]
+
+    def __iter__(self) -> Iterator[List[SchemeEligibility]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def status_counts(self) -> Dict[str, Dict[str, int]]:
+        """Number of holders per scheme and status, counted on the arrays"""
+        scheme = np.frombuffer(self.scheme, dtype=np.uint8)
+        status = np.frombuffer(self.status, dtype=np.int8)
+        counts = np.zeros((len(SCHEME_CODES), len(STATUS_CODES)), dtype=np.int64)
+        np.add.at(counts, (scheme, status), 1)
+        return {
+            SCHEME_CODES[code].value: {s.value: int(counts[code, status_code]) for status_code, s in enumerate(STATUS_CODES)}
+            for code in np.unique(scheme)
+        }
+
+    def nbytes(self) -> int:
+        """Approximate size of the row arrays (excluding holder ids and code tables)"""
+        buffers = (self.offsets, self.scheme, self.status, self.confidence, self.eligible_amount,
+                   self.timeline_months, self.reasons, self.required_documents)
+        return sum(len(buffer) * buffer.itemsize for buffer in buffers)
+
+# Each columnar rule returns (status, confidence, eligible_amount, timeline_months) arrays.
+# Numeric rule parameters may also be (variants, 1) arrays, in which case the results
+# broadcast to (variants, holders); see dss_scenarios.
+ColumnarRule = Callable[[HolderColumns, Dict], Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]
+
+class RuleVariants(tuple):
+    """Per-variant values of a non-numeric rule parameter (e.g. one excluded_occupations list per variant)"""
+
+def _isin(column: np.ndarray, values) -> np.ndarray:
+    """np.isin that yields one row per variant for RuleVariants values"""
+    if isinstance(values, RuleVariants):
+        return np.stack([np.isin(column, variant) for variant in values])
+    return np.isin(column, values)
+
+def _has_income(columns: HolderColumns) -> np.ndarray:
+    """Mirror of the row engine's truthiness check on annual_income (None and 0 are falsy)"""
+    income = columns.annual_income
+    return ~np.isnan(income) & (income != 0)
+
+def _pm_kisan_columns(columns: HolderColumns, rules: Dict):
+    """Vectorized PM-KISAN rules, applied in the same order as _check_pm_kisan_eligibility"""
+    missing_bank = ~columns.has_bank_account
+    missing_aadhaar = ~columns.aadhaar_linked
+
+    status = np.where(missing_bank | missing_aadhaar, PENDING_DOCUMENTS, ELIGIBLE)
+    confidence = np.where(missing_bank, 0.8, 1.0) * np.where(missing_aadhaar, 0.8, 1.0)
+
+    excluded = _isin(columns.occupation, rules.get("excluded_occupations", []))
+    status = np.where(excluded, NOT_ELIGIBLE, status)
+    confidence = np.where(excluded, 0.0, confidence)
+
+    over_income = _has_income(columns) & (columns.annual_income > rules.get("max_annual_income", 200000))
+    status = np.where(over_income, REQUIRES_VERIFICATION, status)
+    confidence = np.where(over_income, confidence * 0.6, confidence)
+
+    insufficient_land = columns.land_area_hectares < rules.get("min_land_area", 0.01)
+    status = np.where(insufficient_land, NOT_ELIGIBLE, status)
+    confidence = np.where(insufficient_land, 0.0, confidence)
+    amount = np.where(insufficient_land, np.nan, rules.get("annual_benefit", 6000))
+
+    timeline = np.where(status == ELIGIBLE, 3, 6)
+    return status, confidence, amount, timeline
+
+def _mgnrega_columns(columns: HolderColumns, rules: Dict):
+    """Vectorized MGNREGA rules"""
+    adult = columns.age >= rules.get("min_age", 18)
+    return (
+        np.where(adult, ELIGIBLE, NOT_ELIGIBLE),
+        np.where(adult, 1.0, 0.0),
+        np.where(adult, 100.0 * 200, np.nan),  # 100 days * avg daily wage
+        np.where(adult, 1, 0),
+    )
+
+def _dajgua_columns(columns: HolderColumns, rules: Dict):  # noqa: ARG001
+    """Vectorized DAJGUA rules"""
+    scheduled_tribe = columns.social_category == "ST"
+    return (
+        np.where(scheduled_tribe, ELIGIBLE, NOT_ELIGIBLE),
+        np.where(scheduled_tribe, 1.0, 0.0),
+        np.full(len(columns), np.nan),  # Village-level scheme
+        np.where(scheduled_tribe, 6, 0),
+    )
+
+def _jjm_columns(columns: HolderColumns, rules: Dict):  # noqa: ARG001
+    """Vectorized Jal Jeevan Mission rules"""
+    count = len(columns)
+    return (
+        np.full(count, ELIGIBLE),
+        np.ones(count),
+        np.full(count, np.nan),  # Village-level scheme
+        np.full(count, 12),
+    )
+
+def _housing_columns(columns: HolderColumns, rules: Dict):
+    """Vectorized PM Awas Gramin rules"""
+    no_toilet = ~columns.has_toilet  # Proxy for housing condition
+    return (
+        np.where(no_toilet, ELIGIBLE, REQUIRES_VERIFICATION),
+        np.where(no_toilet, 0.8, 0.7),
+        np.where(no_toilet, rules.get("assistance_amount", 130000), np.nan),
+        np.where(no_toilet, 6, 3),
+    )
+
+def _health_columns(columns: HolderColumns, rules: Dict):
+    """Vectorized Ayushman Bharat rules"""
+    low_income = _has_income(columns) & (columns.annual_income < rules.get("max_annual_income", 250000))
+    return (
+        np.where(low_income, ELIGIBLE, REQUIRES_VERIFICATION),
+        np.where(low_income, 0.9, 0.6),
+        np.where(low_income, rules.get("coverage_amount", 500000), np.nan),
+        np.where(low_income, 2, 4),
+    )
+
+def _unimplemented_columns(columns: HolderColumns, rules: Dict):  # noqa: ARG001
+    """Schemes without rules require verification, as in the row engine"""
+    count = len(columns)
+    return (
+        np.full(count, REQUIRES_VERIFICATION),
+        np.full(count, 0.5),
+        np.full(count, np.nan),
+        np.full(count, 6),
+    )
+
+COLUMNAR_RULES: Dict[SchemeType, ColumnarRule] = {
+    SchemeType.PM_KISAN: _pm_kisan_columns,
+    SchemeType.MGNREGA: _mgnrega_columns,
+    SchemeType.DAJGUA: _dajgua_columns,
+    SchemeType.JAL_JEEVAN_MISSION: _jjm_columns,
+    SchemeType.PM_AWAS_GRAMIN: _housing_columns,
+    SchemeType.AYUSHMAN_BHARAT: _health_columns,
+}
+
+def columnar_rule(scheme: SchemeType) -> ColumnarRule:
+    """Columnar rule for a scheme; schemes without rules require verification"""
+    return COLUMNAR_RULES.get(scheme, _unimplemented_columns)
+
+def evaluate_eligibility_columns(
+    columns: HolderColumns,
+    scheme_rules: Dict[SchemeType, Dict],
+    schemes: Optional[Sequence[SchemeType]] = None
+) -> ColumnarEligibility:
+    """Evaluate scheme rules for every holder in one pass of array operations"""
+    schemes = list(schemes) if schemes is not None else list(SchemeType)
+    count = len(columns)
+
+    status = np.empty((len(schemes), count), dtype=np.int8)
+    confidence = np.empty((len(schemes), count), dtype=np.float64)
+    amount = np.empty((len(schemes), count), dtype=np.float64)
+    timeline = np.empty((len(schemes), count), dtype=np.int16)
+
+    for row, scheme in enumerate(schemes):
+        rule = columnar_rule(scheme)
+        status[row], confidence[row], amount[row], timeline[row] = rule(columns, scheme_rules.get(scheme, {}))
+
+    logger.debug(f"Columnar eligibility evaluated for {count} holders across {len(schemes)} schemes")
+    return ColumnarEligibility(
+        holder_id=columns.holder_id,
+        schemes=schemes,
+        status=status,
+        confidence=confidence,
+        eligible_amount=amount,
+        timeline_months=timeline
+    )
+
+# Priority codes stored in the int8 priority arrays index into this list
+PRIORITY_CODES: List[InterventionPriority] = list(InterventionPriority)
+PRIORITY_INDEX: Dict[InterventionPriority, int] = {priority: code for code, priority in enumerate(PRIORITY_CODES)}
+
+VILLAGE_COLUMN_DTYPES: Dict[str, object] = {
+    "total_households": np.int64,
+    "st_households": np.int64,
+    "sc_households": np.int64,
+    "total_population": np.int64,
+    "st_population": np.int64,
+    "water_index": np.float64,
+    "electricity_index": np.float64,
+    "road_connectivity_index": np.float64,
+    "health_facility_index": np.float64,
+    "education_index": np.float64,
+    "livelihood_index": np.float64,
+    "forest_cover_percent": np.float64,
+    "agricultural_land_percent": np.float64,
+    "latitude": np.float64,  # NaN where unknown
+    "longitude": np.float64,  # NaN where unknown
+}
+
+VILLAGE_TEXT_COLUMNS: Tuple[str, ...] = ("village_code", "village_name", "block", "district", "state")
+
+@dataclass
+class VillageColumns:
+    """Columnar table of village profiles (one NumPy array per field)"""
+    village_code: np.ndarray
+    village_name: np.ndarray
+    block: np.ndarray
+    district: np.ndarray
+    state: np.ndarray
+    total_households: np.ndarray
+    st_households: np.ndarray
+    sc_households: np.ndarray
+    total_population: np.ndarray
+    st_population: np.ndarray
+    water_index: np.ndarray
+    electricity_index: np.ndarray
+    road_connectivity_index: np.ndarray
+    health_facility_index: np.ndarray
+    education_index: np.ndarray
+    livelihood_index: np.ndarray
+    forest_cover_percent: np.ndarray
+    agricultural_land_percent: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.village_code.shape[0])
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        """Column lookup by field name, as used by compiled trigger predicates"""
+        return getattr(self, field)
+
+    @classmethod
+    def from_villages(cls, villages: Sequence[VillageProfile]) -> "VillageColumns":
+        """Build a columnar table from VillageProfile records"""
+        count = len(villages)
+        columns: Dict[str, np.ndarray] = {}
+
+        for field, dtype in VILLAGE_COLUMN_DTYPES.items():
+            if field in ("latitude", "longitude"):
+                values: Iterable = (np.nan if getattr(v, field) is None else getattr(v, field) for v in villages)
+            else:
+                values = (getattr(v, field) for v in villages)
+            columns[field] = np.fromiter(values, dtype=dtype, count=count)
+
+        for field in VILLAGE_TEXT_COLUMNS:
+            columns[field] = np.array([getattr(v, field) for v in villages], dtype=str)
+
+        return cls(**columns)
+
+    @classmethod
+    def from_arrays(cls, **arrays) -> "VillageColumns":
+        """Build a columnar table from a mapping of field name to array-like"""
+        missing = [f for f in (*VILLAGE_COLUMN_DTYPES, *VILLAGE_TEXT_COLUMNS) if f not in arrays]
+        if missing:
+            raise ValueError(f"Missing village columns: {', '.join(missing)}")
+
+        columns: Dict[str, np.ndarray] = {}
+        for field, dtype in VILLAGE_COLUMN_DTYPES.items():
+            columns[field] = np.asarray(arrays[field], dtype=dtype)
+        for field in VILLAGE_TEXT_COLUMNS:
+            columns[field] = np.asarray(arrays[field]).astype(str)
+
+        lengths = {field: column.shape[0] for field, column in columns.items()}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"Village columns have mismatched lengths: {lengths}")
+        return cls(**columns)
+
+@dataclass
+class ColumnarInterventions:
+    """Intervention results for a village table, one row per intervention type and one column per village"""
+    village_code: np.ndarray
+    intervention_types: List[str]
+    triggered: np.ndarray  # bool, shape (types, villages)
+    impact_score: np.ndarray  # float64, shape (types, villages); 0 where not triggered
+    priority: np.ndarray  # int8 codes into PRIORITY_CODES, shape (types, villages)
+    success_probability: np.ndarray  # float64, shape (villages,)
+    estimated_beneficiaries: np.ndarray  # int64, shape (villages,)
+    estimated_cost: np.ndarray  # float64, shape (types,)
+
+    def __len__(self) -> int:
+        return int(self.village_code.shape[0])
+
+    def type_row(self, intervention_type: str) -> int:
+        """Row index of an intervention type in the result arrays"""
+        return self.intervention_types.index(intervention_type)
+
+    def priority_counts(self) -> Dict[str, Dict[str, int]]:
+        """Number of triggered interventions per type and priority"""
+        counts: Dict[str, Dict[str, int]] = {}
+        for row, intervention_type in enumerate(self.intervention_types):
+            per_priority = np.bincount(self.priority[row][self.triggered[row]], minlength=len(PRIORITY_CODES))
+            counts[intervention_type] = {priority.value: int(per_priority[code]) for code, priority in enumerate(PRIORITY_CODES)}
+        return counts
+
+def priority_codes(priority_score: np.ndarray) -> np.ndarray:
+    """Vectorized DSSEngine._get_priority_level"""
+    return np.select(
+        [priority_score >= 0.8, priority_score >= 0.6, priority_score >= 0.4],
+        [PRIORITY_INDEX[InterventionPriority.CRITICAL], PRIORITY_INDEX[InterventionPriority.HIGH], PRIORITY_INDEX[InterventionPriority.MEDIUM]],
+        PRIORITY_INDEX[InterventionPriority.LOW]
+    ).astype(np.int8)
+
+def st_population_factor(columns: VillageColumns) -> np.ndarray:
+    """Share of ST population per village (0 where population is unknown)"""
+    total = columns.total_population
+    return np.divide(columns.st_population, total, out=np.zeros(len(columns)), where=total > 0)
+
+def success_probability_columns(columns: VillageColumns) -> np.ndarray:
+    """Vectorized DSSEngine._calculate_success_probability"""
+    return (columns.road_connectivity_index / 100 + np.where(columns.electricity_index > 50, 1.0, 0.5) + 0.8) / 3
+
+def evaluate_intervention_columns(
+    columns: VillageColumns,
+    intervention_rules: Dict[str, Dict],
+    intervention_triggers: Dict[str, object]
+) -> ColumnarInterventions:
+    """Evaluate every compiled intervention trigger over a village table"""
+    intervention_types = list(intervention_rules)
+    count = len(columns)
+
+    triggered = np.zeros((len(intervention_types), count), dtype=bool)
+    impact_score = np.zeros((len(intervention_types), count), dtype=np.float64)
+    st_factor = st_population_factor(columns)
+
+    for row, intervention_type in enumerate(intervention_types):
+        trigger = intervention_triggers.get(intervention_type)
+        if trigger is None:
+            continue
+        triggered[row] = trigger.evaluate_columns(columns)
+        impact_sum, impact_count = trigger.impact_columns(columns)
+        average_impact = np.divide(impact_sum, impact_count, out=np.full(count, 0.5), where=impact_count > 0)
+        impact_score[row] = np.where(triggered[row], average_impact * 0.6 + st_factor * 0.4, 0.0)
+
+    return ColumnarInterventions(
+        village_code=columns.village_code,
+        intervention_types=intervention_types,
+        triggered=triggered,
+        impact_score=impact_score,
+        priority=priority_codes(impact_score),
+        success_probability=success_probability_columns(columns),
+        estimated_beneficiaries=np.minimum(columns.st_households, columns.total_households),
+        estimated_cost=np.array([float(rules.get("average_cost_per_village", 500000)) for rules in intervention_rules.values()])
+    )
@@ -0,0 +1,486 @@
+"""
+Persisted eligibility bitmap index over stored FRA holders
+
+Cohort questions ("ST holders in Koraput eligible for PM-KISAN but not for
+PM Awas Gramin") used to mean re-assessing every holder. The index assigns each
+stored holder a row and keeps a compressed RowBitmap per (scheme, status) plus
+one per state and per (state, district); a cohort is then AND/OR/AND-NOT of a
+few bitmaps, and counts per scheme and status are bitmap cardinalities.
+
+Upserts and deletes are applied incrementally: for each bitmap only the rows
+whose membership changed are removed or added, in one vectorized pass per
+batch. The per-row status matrix and region codes are kept alongside the
+bitmaps for that purpose, and both are saved to an uncompressed .npz file (the
+bitmaps are compressed already) together with the indexed holder records, so
+the aggregate store can be restored from the same file after a restart.
+Updates only schedule a save; writes are coalesced to one per save interval.
+The index records the scheme-rules version it was built with and reports itself
+stale when the rules change; rebuild() re-assesses holders columnarly.
+
+Configuration (environment):
+    DSS_ELIGIBILITY_INDEX               index file (default dss_data/eligibility_index.npz, empty to keep in memory only)
+    DSS_ELIGIBILITY_INDEX_SAVE_SECONDS  delay before changes are written to the index file (default 5)
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, get_args, get_type_hints
+from pathlib import Path
+from dataclasses import fields
+from operator import attrgetter
+import gc
+import logging
+import os
+import threading
+
+import numpy as np
+
+from .dss_bitmap import RowBitmap
+from .dss_columnar import SCHEME_CODES, SCHEME_INDEX, STATUS_CODES, STATUS_INDEX, HolderColumns
+from .dss_service import DSSEngine, FRAHolder, SchemeEligibility, SchemeType, EligibilityStatus, dss_engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.getenv("DSS_ELIGIBILITY_INDEX", os.path.join(os.getenv("DSS_DATA_DIR", "dss_data"), "eligibility_index.npz"))
+DEFAULT_SAVE_SECONDS = float(os.getenv("DSS_ELIGIBILITY_INDEX_SAVE_SECONDS", "5"))
+
+# Status code of a scheme that was not assessed, or of a free row
+NO_STATUS = -1
+NO_REGION = -1
+
+CohortTerm = Tuple[SchemeType, EligibilityStatus]
+
+# FRAHolder fields stored as columns in the index file, and those that may be None
+_RECORD_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(FRAHolder))
+_NULLABLE_FIELDS: Tuple[str, ...] = ("annual_income", "mobile_number")
+_TEXT_FIELDS: Tuple[str, ...] = tuple(name for name, hint in get_type_hints(FRAHolder).items() if str in (hint, *get_args(hint)))
+# Separates the values of a text column, stored as one UTF-8 buffer
+_TEXT_SEPARATOR = "\x00"
+
+def _record_columns(records: Sequence[FRAHolder]) -> Dict[str, np.ndarray]:
+    """FRAHolder records as one array per field, text fields as a joined UTF-8 buffer, with masks of None values"""
+    columns = {}
+    for name in _RECORD_FIELDS:
+        values = list(map(attrgetter(name), records))
+        if name in _NULLABLE_FIELDS:
+            none = np.array([value is None for value in values], dtype=bool)
+            columns[f"holder_none:{name}"] = none
+            if none.any():
+                fill = "" if name in _TEXT_FIELDS else np.nan
+                values = [fill if value is None else value for value in values]
+        if name in _TEXT_FIELDS:
+            text = _TEXT_SEPARATOR.join(values)
+            if text.count(_TEXT_SEPARATOR) != max(len(values) - 1, 0):
+                raise ValueError(f"FRA holder {name} values must not contain NUL characters")
+            columns[f"holder:{name}"] = np.frombuffer(text.encode(), dtype=np.uint8)
+        else:
+            columns[f"holder:{name}"] = np.array(values)
+    return columns
+
+def _records_from_columns(data, count: int) -> List[FRAHolder]:
+    """FRAHolder records from the columns written by _record_columns"""
+    if not count:
+        return []
+    columns = []
+    for name in _RECORD_FIELDS:
+        values = data[f"holder:{name}"]
+        values = values.tobytes().decode().split(_TEXT_SEPARATOR) if name in _TEXT_FIELDS else values.tolist()
+        if name in _NULLABLE_FIELDS:
+            for row in np.flatnonzero(data[f"holder_none:{name}"]).tolist():
+                values[row] = None
+        columns.append(values)
+    # A million new objects would otherwise trigger repeated full collections
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        return list(map(FRAHolder, *columns))
+    finally:
+        if collecting:
+            gc.enable()
+
+class EligibilityIndex:
+    """Bitmaps of stored holders per (scheme, status), state and district, maintained under upserts and deletes"""
+
+    def __init__(self, engine: DSSEngine = dss_engine, path: Optional[str] = DEFAULT_INDEX_PATH, save_seconds: float = DEFAULT_SAVE_SECONDS):
+        self.engine = engine
+        self.path = Path(path) if path else None
+        self.save_seconds = save_seconds
+        self.rules_version = engine.scheme_rules_version()
+        self._lock = threading.RLock()
+        # Serializes whole saves (snapshot and file write), which share one temporary path
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        self._reset()
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def _reset(self) -> None:
+        self._holder_ids: List[Optional[str]] = []
+        self._records: List[Optional[FRAHolder]] = []
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._status = np.full((0, len(SCHEME_CODES)), NO_STATUS, dtype=np.int8)
+        self._state = np.full(0, NO_REGION, dtype=np.int32)
+        self._district = np.full(0, NO_REGION, dtype=np.int32)
+        self._state_labels: List[str] = []
+        self._state_codes: Dict[str, int] = {}
+        self._district_labels: List[Tuple[str, str]] = []
+        self._district_codes: Dict[Tuple[str, str], int] = {}
+        self._live = RowBitmap()
+        self._status_bitmaps: Dict[Tuple[int, int], RowBitmap] = {}
+        self._state_bitmaps: Dict[int, RowBitmap] = {}
+        self._district_bitmaps: Dict[int, RowBitmap] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, holder_id: str) -> bool:
+        return holder_id in self._rows
+
+    @property
+    def stale(self) -> bool:
+        """Whether the scheme rules changed since the indexed statuses were assessed"""
+        return self.rules_version != self.engine.scheme_rules_version()
+
+    # Row allocation
+
+    def _allocate(self, holder_ids: Sequence[str]) -> np.ndarray:
+        """Rows for the holders, reusing existing rows and free slots before growing"""
+        rows = np.empty(len(holder_ids), dtype=np.int64)
+        new_count = 0
+        for position, holder_id in enumerate(holder_ids):
+            row = self._rows.get(holder_id)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                    self._holder_ids[row] = holder_id
+                else:
+                    row = len(self._holder_ids)
+                    self._holder_ids.append(holder_id)
+                    self._records.append(None)
+                    new_count += 1
+                self._rows[holder_id] = row
+            rows[position] = row
+
+        if len(self._holder_ids) > self._status.shape[0]:
+            grow = max(len(self._holder_ids), 2 * self._status.shape[0]) - self._status.shape[0]
+            self._status = np.concatenate([self._status, np.full((grow, len(SCHEME_CODES)), NO_STATUS, dtype=np.int8)])
+            self._state = np.concatenate([self._state, np.full(grow, NO_REGION, dtype=np.int32)])
+            self._district = np.concatenate([self._district, np.full(grow, NO_REGION, dtype=np.int32)])
+        return rows
+
+    def _region_codes(self, states: Sequence[str], districts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        state_codes = np.empty(len(states), dtype=np.int32)
+        district_codes = np.empty(len(states), dtype=np.int32)
+        for position, (state, district) in enumerate(zip(states, districts)):
+            code = self._state_codes.get(state)
+            if code is None:
+                code = self._state_codes[state] = len(self._state_labels)
+                self._state_labels.append(state)
+            state_codes[position] = code
+            key = (state, district)
+            code = self._district_codes.get(key)
+            if code is None:
+                code = self._district_codes[key] = len(self._district_labels)
+                self._district_labels.append(key)
+            district_codes[position] = code
+        return state_codes, district_codes
+
+    # Incremental maintenance
+
+    @staticmethod
+    def _update_groups(bitmaps: Dict[Any, RowBitmap], rows: np.ndarray, old: np.ndarray, new: np.ndarray, empty: int, key=lambda code: code) -> None:
+        """Move rows whose code changed from their old group's bitmap to their new group's"""
+        changed = old != new
+        rows, old, new = rows[changed], old[changed], new[changed]
+        for code in np.unique(old[old != empty]):
+            group = key(int(code))
+            remaining = bitmaps[group] - RowBitmap.from_rows(rows[old == code])
+            if remaining:
+                bitmaps[group] = remaining
+            else:
+                del bitmaps[group]
+        for code in np.unique(new[new != empty]):
+            group = key(int(code))
+            added = RowBitmap.from_rows(rows[new == code])
+            bitmaps[group] = bitmaps[group] | added if group in bitmaps else added
+
+    def _apply(self, rows: np.ndarray, status: np.ndarray, states: np.ndarray, districts: np.ndarray) -> None:
+        """Set rows' statuses and regions, updating only the bitmaps whose membership changes"""
+        # With duplicate holders in one batch the last occurrence wins
+        _, last = np.unique(rows[::-1], return_index=True)
+        keep = len(rows) - 1 - last
+        rows, status, states, districts = rows[keep], status[keep], states[keep], districts[keep]
+
+        for column in range(len(SCHEME_CODES)):
+            self._update_groups(
+                self._status_bitmaps, rows, self._status[rows, column], status[:, column], NO_STATUS,
+                key=lambda code, column=column: (column, code)
+            )
+        self._update_groups(self._state_bitmaps, rows, self._state[rows], states, NO_REGION)
+        self._update_groups(self._district_bitmaps, rows, self._district[rows], districts, NO_REGION)
+
+        live = states != NO_REGION
+        self._live = (self._live - RowBitmap.from_rows(rows[~live])) | RowBitmap.from_rows(rows[live])
+        self._status[rows] = status
+        self._state[rows] = states
+        self._district[rows] = districts
+
+    @staticmethod
+    def status_row(eligibilities: Sequence[SchemeEligibility]) -> np.ndarray:
+        """Status codes per scheme of one holder's eligibility results"""
+        row = np.full(len(SCHEME_CODES), NO_STATUS, dtype=np.int8)
+        for eligibility in eligibilities:
+            row[SCHEME_INDEX[eligibility.scheme]] = STATUS_INDEX[eligibility.status]
+        return row
+
+    def upsert_many(self, holders: Sequence[FRAHolder], eligibilities: Sequence[Sequence[SchemeEligibility]]) -> None:
+        """Index (or re-index) holders with their already assessed eligibilities"""
+        if not holders:
+            return
+        status = np.stack([self.status_row(results) for results in eligibilities])
+        with self._lock:
+            rows = self._allocate([holder.holder_id for holder in holders])
+            states, districts = self._region_codes([h.state for h in holders], [h.district for h in holders])
+            self._apply(rows, status, states, districts)
+            for row, holder in zip(rows.tolist(), holders):
+                self._records[row] = holder
+            self._dirty = True
+
+    def upsert(self, holder: FRAHolder, eligibilities: Sequence[SchemeEligibility]) -> None:
+        self.upsert_many([holder], [eligibilities])
+
+    def delete_many(self, holder_ids: Sequence[str]) -> int:
+        """Drop holders from every bitmap; returns how many were indexed"""
+        with self._lock:
+            rows = np.array([self._rows[h] for h in holder_ids if h in self._rows], dtype=np.int64)
+            rows = np.unique(rows)
+            if not rows.shape[0]:
+                return 0
+            self._apply(
+                rows,
+                np.full((rows.shape[0], len(SCHEME_CODES)), NO_STATUS, dtype=np.int8),
+                np.full(rows.shape[0], NO_REGION, dtype=np.int32),
+                np.full(rows.shape[0], NO_REGION, dtype=np.int32)
+            )
+            for row in rows.tolist():
+                del self._rows[self._holder_ids[row]]
+                self._holder_ids[row] = None
+                self._records[row] = None
+                self._free.append(row)
+            self._dirty = True
+            return int(rows.shape[0])
+
+    def delete(self, holder_id: str) -> bool:
+        return self.delete_many([holder_id]) == 1
+
+    def rebuild(self, holders: Sequence[FRAHolder]) -> None:
+        """Replace the index with holders assessed in one columnar pass under the current rules"""
+        eligibility = self.engine.assess_eligibility_columnar(HolderColumns.from_holders(holders)) if holders else None
+        with self._lock:
+            self._reset()
+            self.rules_version = self.engine.scheme_rules_version()
+            self._dirty = True
+            if eligibility is None:
+                return
+            status = np.full((len(holders), len(SCHEME_CODES)), NO_STATUS, dtype=np.int8)
+            for row, scheme in enumerate(eligibility.schemes):
+                status[:, SCHEME_INDEX[scheme]] = eligibility.status[row]
+            rows = self._allocate([holder.holder_id for holder in holders])
+            states, districts = self._region_codes([h.state for h in holders], [h.district for h in holders])
+            self._apply(rows, status, states, districts)
+            for row, holder in zip(rows.tolist(), holders):
+                self._records[row] = holder
+        logger.info(f"Rebuilt eligibility index over {len(self)} FRA holders")
+
+    def stored_holders(self) -> List[FRAHolder]:
+        """The indexed holder records, e.g. to restore the aggregate store after a restart"""
+        with self._lock:
+            return [record for record in self._records if record is not None]
+
+    # Queries
+
+    def _term_bitmap(self, term: CohortTerm) -> RowBitmap:
+        scheme, status = term
+        return self._status_bitmaps.get((SCHEME_INDEX[scheme], STATUS_INDEX[status]), RowBitmap())
+
+    def _region_bitmap(self, state: Optional[str], district: Optional[str]) -> RowBitmap:
+        if district is not None:
+            if state is None:
+                raise ValueError("A district filter requires its state")
+            code = self._district_codes.get((state, district))
+            return self._district_bitmaps.get(code, RowBitmap()) if code is not None else RowBitmap()
+        if state is not None:
+            code = self._state_codes.get(state)
+            return self._state_bitmaps.get(code, RowBitmap()) if code is not None else RowBitmap()
+        return self._live
+
+    def cohort(
+        self,
+        all_of: Sequence[CohortTerm] = (),
+        any_of: Sequence[CohortTerm] = (),
+        none_of: Sequence[CohortTerm] = (),
+        state: Optional[str] = None,
+        district: Optional[str] = None
+    ) -> RowBitmap:
+        """Rows in the region matching every all_of term, at least one any_of term and no none_of term"""
+        with self._lock:
+            result = self._region_bitmap(state, district)
+            for term in all_of:
+                result = result & self._term_bitmap(term)
+            if any_of:
+                result = result & RowBitmap.union(self._term_bitmap(term) for term in any_of)
+            for term in none_of:
+                result = result - self._term_bitmap(term)
+            return result
+
+    def holder_ids(self, rows: RowBitmap, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        """Holder ids of a cohort's rows in row order"""
+        selected = rows.to_array()[offset:None if limit is None else offset + limit]
+        return [self._holder_ids[row] for row in selected.tolist()]
+
+    def status_counts(self, rows: Optional[RowBitmap] = None) -> Dict[str, Dict[str, int]]:
+        """Holders per scheme and status, optionally within a cohort"""
+        with self._lock:
+            counts: Dict[str, Dict[str, int]] = {}
+            for column, scheme in enumerate(SCHEME_CODES):
+                per_status = {}
+                for code, status in enumerate(STATUS_CODES):
+                    bitmap = self._status_bitmaps.get((column, code))
+                    if bitmap is not None:
+                        per_status[status.value] = len(bitmap if rows is None else bitmap & rows)
+                if per_status:
+                    counts[scheme.value] = per_status
+            return counts
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            bitmaps = [self._live, *self._status_bitmaps.values(), *self._state_bitmaps.values(), *self._district_bitmaps.values()]
+            return {
+                "holders": len(self),
+                "rows": len(self._holder_ids),
+                "states": len(self._state_bitmaps),
+                "districts": len(self._district_bitmaps),
+                "bitmaps": len(bitmaps),
+                "bitmap_bytes": sum(bitmap.nbytes() for bitmap in bitmaps),
+                "rules_version": self.rules_version,
+                "stale": self.stale,
+                "path": str(self.path) if self.path is not None else None
+            }
+
+    # Persistence
+
+    def request_save(self) -> None:
+        """Schedule a save in save_seconds; changes arriving meanwhile are written by the same save"""
+        if self.path is None:
+            return
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_seconds, self._scheduled_save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _scheduled_save(self) -> None:
+        with self._lock:
+            self._save_timer = None
+        try:
+            self.save()
+        except Exception as e:
+            logger.error(f"Error saving eligibility index: {str(e)}")
+
+    def close(self) -> None:
+        """Cancel any scheduled save and write pending changes now, e.g. on shutdown"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            dirty = self._dirty
+        if dirty:
+            self.save()
+
+    def save(self) -> None:
+        """Write rows, region labels, serialized bitmaps and holder records to the index file atomically"""
+        if self.path is None:
+            return
+        with self._save_lock:
+            with self._lock:
+                names: List[str] = ["live"]
+                buffers = [self._live.serialize()]
+                for (column, code), bitmap in self._status_bitmaps.items():
+                    names.append(f"status:{column}:{code}")
+                    buffers.append(bitmap.serialize())
+                for code, bitmap in self._state_bitmaps.items():
+                    names.append(f"state:{code}")
+                    buffers.append(bitmap.serialize())
+                for code, bitmap in self._district_bitmaps.items():
+                    names.append(f"district:{code}")
+                    buffers.append(bitmap.serialize())
+                rows = len(self._holder_ids)
+                records = list(self._records)
+                arrays = {
+                    "holder_ids": np.array([(holder_id or "").encode() for holder_id in self._holder_ids], dtype=bytes),
+                    "status": self._status[:rows].copy(),
+                    "state": self._state[:rows].copy(),
+                    "district": self._district[:rows].copy(),
+                    "state_labels": np.array(self._state_labels, dtype=str),
+                    "district_labels": np.array(self._district_labels, dtype=str).reshape(-1, 2),
+                    "schemes": np.array([scheme.value for scheme in SCHEME_CODES], dtype=str),
+                    "statuses": np.array([status.value for status in STATUS_CODES], dtype=str),
+                    "rules_version": np.array(self.rules_version),
+                    "bitmap_names": np.array(names, dtype=str),
+                    "bitmaps": np.concatenate(buffers)
+                }
+                self._dirty = False
+
+            # Holder records of the occupied rows, as columns
+            occupied = [row for row, record in enumerate(records) if record is not None]
+            arrays["holder_rows"] = np.array(occupied, dtype=np.int64)
+            arrays.update(_record_columns([records[row] for row in occupied]))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_name(self.path.name + ".tmp")
+            with open(temporary, "wb") as handle:
+                np.savez(handle, **arrays)
+            os.replace(temporary, self.path)
+
+    def load(self) -> None:
+        """Read the index file written by save()"""
+        with np.load(self.path) as data:
+            if data["schemes"].tolist() != [scheme.value for scheme in SCHEME_CODES] or data["statuses"].tolist() != [status.value for status in STATUS_CODES]:
+                raise ValueError(f"Eligibility index {self.path} was written for different schemes or statuses")
+            if "holder_rows" not in data.files:
+                raise ValueError(f"Eligibility index {self.path} has no holder records; delete it and rebuild from the aggregate store")
+            with self._lock:
+                self._reset()
+                self.rules_version = str(data["rules_version"])
+                self._holder_ids = [holder_id.decode() or None for holder_id in data["holder_ids"].tolist()]
+                self._records = [None] * len(self._holder_ids)
+                occupied = data["holder_rows"]
+                for row, record in zip(occupied.tolist(), _records_from_columns(data, occupied.shape[0])):
+                    self._records[row] = record
+                self._rows = {holder_id: row for row, holder_id in enumerate(self._holder_ids) if holder_id is not None}
+                self._free = [row for row, holder_id in enumerate(self._holder_ids) if holder_id is None]
+                self._status = data["status"].astype(np.int8)
+                self._state = data["state"].astype(np.int32)
+                self._district = data["district"].astype(np.int32)
+                self._state_labels = data["state_labels"].tolist()
+                self._state_codes = {label: code for code, label in enumerate(self._state_labels)}
+                self._district_labels = [tuple(pair) for pair in data["district_labels"].tolist()]
+                self._district_codes = {label: code for code, label in enumerate(self._district_labels)}
+
+                buffer, position = data["bitmaps"], 0
+                for name in data["bitmap_names"].tolist():
+                    bitmap, used = RowBitmap.deserialize(buffer[position:])
+                    position += used
+                    kind, *codes = name.split(":")
+                    if kind == "live":
+                        self._live = bitmap
+                    elif kind == "status":
+                        self._status_bitmaps[(int(codes[0]), int(codes[1]))] = bitmap
+                    elif kind == "state":
+                        self._state_bitmaps[int(codes[0])] = bitmap
+                    else:
+                        self._district_bitmaps[int(codes[0])] = bitmap
+        logger.info(f"Loaded eligibility index with {len(self)} FRA holders from {self.path}")
+
+# Shared eligibility index over the holders stored through the DSS routes
+eligibility_index = EligibilityIndex(dss_engine)
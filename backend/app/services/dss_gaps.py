@@ -0,0 +1,218 @@
+"""
+Hierarchical coverage gap cube for the DSS engine
+
+The policy report's coverage_gaps section is national only. This module rolls
+every gap metric (the infrastructure gaps of COVERAGE_GAP_THRESHOLDS and the
+banking/Aadhaar eligibility gaps of FRA holders) up the state -> district ->
+block hierarchy. Admin names are integer-coded once, every metric is counted
+per block in one grouped pass (np.bincount over block codes), and districts and
+states are reduced from the sorted block rows, so dashboards can drill into any
+level without re-running the engine.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+import logging
+import numpy as np
+
+from .dss_service import COVERAGE_GAP_THRESHOLDS
+from .dss_columnar import HolderColumns, VillageColumns
+
+logger = logging.getLogger(__name__)
+
+INFRASTRUCTURE_GAPS: List[str] = list(COVERAGE_GAP_THRESHOLDS)
+ELIGIBILITY_GAPS: List[str] = ["banking", "aadhaar"]
+
+# State, district and block of FRA holders whose village is not in the village table
+UNASSIGNED = "Unassigned"
+
+def _factorize(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted distinct labels and the integer code of every value"""
+    labels, codes = np.unique(values, return_inverse=True)
+    return labels, codes.astype(np.int64).ravel()
+
+def _grouped_sums(groups: np.ndarray, group_count: int, weights: np.ndarray) -> np.ndarray:
+    """Per-group column sums of a (rows, metrics) weight matrix in a single bincount"""
+    metric_count = weights.shape[1]
+    flat_groups = (groups[:, None] * metric_count + np.arange(metric_count)).ravel()
+    return np.bincount(flat_groups, weights=weights.ravel(), minlength=group_count * metric_count).reshape(group_count, metric_count)
+
+def _holder_regions(villages: VillageColumns, holders: HolderColumns) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    State, district and block of each holder, all three taken from its village (joined on village_code)
+
+    Holders whose village is not in the table go to the UNASSIGNED state, district and block.
+    """
+    if not len(villages):
+        unassigned = np.full(len(holders), UNASSIGNED)
+        return unassigned, unassigned, unassigned
+    order = np.argsort(villages.village_code, kind="stable")
+    codes = villages.village_code[order]
+    positions = np.minimum(np.searchsorted(codes, holders.village_code), len(codes) - 1)
+    matched = codes[positions] == holders.village_code
+    rows = order[positions]
+    return tuple(np.where(matched, level[rows], UNASSIGNED) for level in (villages.state, villages.district, villages.block))
+
+@dataclass
+class GapCube:
+    """Gap metrics per block, ordered by (state, district, block), with roll-ups on demand"""
+    states: np.ndarray  # per block row
+    districts: np.ndarray
+    blocks: np.ndarray
+    villages: np.ndarray  # int64 village count per block
+    gap_villages: np.ndarray  # int64, shape (blocks, infrastructure gaps)
+    index_sums: np.ndarray  # float64 sum of each gap's index, shape (blocks, infrastructure gaps)
+    fra_holders: np.ndarray  # int64 holder count per block
+    holder_gaps: np.ndarray  # int64, shape (blocks, eligibility gaps)
+
+    def __len__(self) -> int:
+        return int(self.blocks.shape[0])
+
+    def _node(self, rows) -> Dict[str, Any]:
+        """Gap metrics summed over a selection of block rows"""
+        villages = int(self.villages[rows].sum())
+        holders = int(self.fra_holders[rows].sum())
+        gap_villages = self.gap_villages[rows].sum(axis=0)
+        index_sums = self.index_sums[rows].sum(axis=0)
+        holder_gaps = self.holder_gaps[rows].sum(axis=0)
+
+        infrastructure_gaps = {}
+        for column, gap in enumerate(INFRASTRUCTURE_GAPS):
+            infrastructure_gaps[gap] = {
+                "villages_affected": int(gap_villages[column]),
+                "percentage": gap_villages[column] / villages * 100 if villages else 0,
+                "average_index": index_sums[column] / villages if villages else None
+            }
+        return {
+            "total_villages": villages,
+            "total_fra_holders": holders,
+            "infrastructure_gaps": infrastructure_gaps,
+            "eligibility_gaps": {
+                "banking": {
+                    "holders_without_accounts": int(holder_gaps[0]),
+                    "percentage": holder_gaps[0] / holders * 100 if holders else 0
+                },
+                "aadhaar": {
+                    "holders_without_aadhaar": int(holder_gaps[1]),
+                    "percentage": holder_gaps[1] / holders * 100 if holders else 0
+                }
+            }
+        }
+
+    def _rows(self, state: Optional[str], district: Optional[str], block: Optional[str]) -> np.ndarray:
+        rows = np.ones(len(self), dtype=bool)
+        if state is not None:
+            rows &= self.states == state
+        if district is not None:
+            rows &= self.districts == district
+        if block is not None:
+            rows &= self.blocks == block
+        return rows
+
+    def node(self, state: Optional[str] = None, district: Optional[str] = None, block: Optional[str] = None) -> Dict[str, Any]:
+        """Gap metrics for one level of the hierarchy (national when no filter is given)"""
+        return self._node(self._rows(state, district, block))
+
+    def select(self, state: Optional[str] = None, district: Optional[str] = None, block: Optional[str] = None) -> "GapCube":
+        """Sub-cube restricted to one region"""
+        rows = self._rows(state, district, block)
+        return GapCube(**{name: getattr(self, name)[rows] for name in self.__dataclass_fields__})
+
+    def subtree(self, state: Optional[str] = None, district: Optional[str] = None, block: Optional[str] = None, depth: int = 3) -> Optional[Dict[str, Any]]:
+        """
+        Nested cube rooted at a region, expanded depth levels below it
+
+        Regions are addressed top-down (a district needs its state, a block its
+        district). Returns None when the region has no villages or holders.
+        """
+        if (block is not None and district is None) or (district is not None and state is None):
+            raise ValueError("Drill-down requires the parent levels: state for a district, state and district for a block")
+        path = [(level, name) for level, name in (("states", state), ("districts", district), ("blocks", block)) if name is not None]
+
+        if not path:
+            return self.to_dict(depth)
+        sub_cube = self.select(state, district, block)
+        if not len(sub_cube):
+            return None
+        tree = sub_cube.to_dict(len(path) + depth)
+        for level, name in path:
+            tree = tree[level][name]
+        return tree
+
+    def to_dict(self, depth: int = 3) -> Dict[str, Any]:
+        """
+        Nested national -> state -> district -> block cube
+
+        depth limits how many admin levels are expanded (0 = national only).
+        Block rows are sorted, so each state's and district's rows are contiguous.
+        """
+        cube = self._node(slice(None))
+        if depth < 1:
+            return cube
+
+        cube["states"] = {}
+        if not len(self):
+            return cube
+
+        state_change = np.r_[True, self.states[1:] != self.states[:-1]]
+        district_change = state_change | np.r_[True, self.districts[1:] != self.districts[:-1]]
+        bounds = np.r_[np.flatnonzero(state_change), len(self)]
+
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            state_node = self._node(slice(start, end))
+            cube["states"][str(self.states[start])] = state_node
+            if depth < 2:
+                continue
+
+            district_starts = start + np.flatnonzero(district_change[start:end])
+            district_bounds = np.r_[district_starts, end]
+            state_node["districts"] = {}
+            for d_start, d_end in zip(district_bounds[:-1], district_bounds[1:]):
+                district_node = self._node(slice(d_start, d_end))
+                state_node["districts"][str(self.districts[d_start])] = district_node
+                if depth >= 3:
+                    district_node["blocks"] = {str(self.blocks[row]): self._node(slice(row, row + 1)) for row in range(d_start, d_end)}
+        return cube
+
+def build_gap_cube(villages: VillageColumns, holders: Optional[HolderColumns] = None) -> GapCube:
+    """Count every gap metric per (state, district, block) in one grouped pass"""
+    village_count = len(villages)
+    if holders is None:
+        holder_state = holder_district = holder_block = np.array([], dtype=str)
+    else:
+        holder_state, holder_district, holder_block = _holder_regions(villages, holders)
+
+    # Integer-code each admin level over villages and holders together
+    state_labels, state_codes = _factorize(np.concatenate([villages.state, holder_state]))
+    district_labels, district_codes = _factorize(np.concatenate([villages.district, holder_district]))
+    block_labels, block_codes = _factorize(np.concatenate([villages.block, holder_block]))
+
+    district_count = max(len(district_labels), 1)
+    block_count = max(len(block_labels), 1)
+    keys = (state_codes * district_count + district_codes) * block_count + block_codes
+    leaf_keys, leaf_codes = np.unique(keys, return_inverse=True)
+    leaf_codes = leaf_codes.ravel()
+    leaf_count = len(leaf_keys)
+    village_leaves, holder_leaves = leaf_codes[:village_count], leaf_codes[village_count:]
+
+    index_values = np.column_stack([villages[index_name] for index_name, _ in COVERAGE_GAP_THRESHOLDS.values()])
+    thresholds = np.array([threshold for _, threshold in COVERAGE_GAP_THRESHOLDS.values()], dtype=np.float64)
+    gaps = index_values < thresholds
+
+    if holders is None:
+        holder_gap_flags = np.zeros((0, len(ELIGIBILITY_GAPS)))
+    else:
+        holder_gap_flags = np.column_stack([~holders.has_bank_account, ~holders.aadhaar_linked])
+
+    cube = GapCube(
+        states=state_labels[leaf_keys // (district_count * block_count)],
+        districts=district_labels[(leaf_keys // block_count) % district_count],
+        blocks=block_labels[leaf_keys % block_count],
+        villages=np.bincount(village_leaves, minlength=leaf_count),
+        gap_villages=_grouped_sums(village_leaves, leaf_count, gaps.astype(np.float64)).astype(np.int64),
+        index_sums=_grouped_sums(village_leaves, leaf_count, index_values.astype(np.float64)),
+        fra_holders=np.bincount(holder_leaves, minlength=leaf_count),
+        holder_gaps=_grouped_sums(holder_leaves, leaf_count, holder_gap_flags.astype(np.float64)).astype(np.int64)
+    )
+    logger.debug(f"Gap cube built over {village_count} villages and {len(holder_state)} holders in {leaf_count} blocks")
+    return cube
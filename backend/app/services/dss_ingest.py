@@ -0,0 +1,304 @@
+"""
+Columnar file ingestion for the DSS engine
+
+District offices submit holder and village spreadsheets of 50k+ rows. Building
+a pydantic request model and a domain record per row costs more than evaluating
+the rules, so uploaded CSV, Parquet and Arrow IPC files are read straight into
+NumPy columns, validated with vectorized range checks that mirror the request
+models' field constraints, and handed to the engine as HolderColumns /
+VillageColumns tables.
+
+CSV is read with pandas when installed (falling back to the csv module);
+Parquet and Arrow IPC require pyarrow.
+"""
+
+from typing import Any, BinaryIO, Dict, Optional, Set, Tuple
+from pathlib import Path
+import csv
+import io
+import logging
+import numpy as np
+
+from .dss_columnar import (
+    HOLDER_COLUMN_DTYPES,
+    HOLDER_TEXT_COLUMNS,
+    VILLAGE_COLUMN_DTYPES,
+    VILLAGE_TEXT_COLUMNS,
+    HolderColumns,
+    VillageColumns
+)
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover - optional dependency
+    pd = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+CSV_TABLE = "csv"
+PARQUET_TABLE = "parquet"
+ARROW_TABLE = "arrow"
+
+_TABLE_FORMAT_BY_SUFFIX = {
+    ".csv": CSV_TABLE,
+    ".parquet": PARQUET_TABLE,
+    ".pq": PARQUET_TABLE,
+    ".arrow": ARROW_TABLE,
+    ".feather": ARROW_TABLE,
+    ".ipc": ARROW_TABLE
+}
+
+# Accepted spellings of boolean cells (case-insensitive); blank cells are not booleans
+TRUE_VALUES: Set[str] = {"true", "1", "yes", "y", "t"}
+FALSE_VALUES: Set[str] = {"false", "0", "no", "n", "f"}
+
+# Columns that may be absent or empty; filled with NaN
+HOLDER_OPTIONAL_COLUMNS: Tuple[str, ...] = ("annual_income",)
+VILLAGE_OPTIONAL_COLUMNS: Tuple[str, ...] = ("latitude", "longitude")
+
+# Inclusive (low, high) bounds, matching FRAHolderRequest / VillageProfileRequest
+HOLDER_RANGES: Dict[str, Tuple[float, float]] = {
+    "family_size": (1, 20),
+    "land_area_hectares": (0.0, 100.0),
+    "annual_income": (0.0, 10000000.0),
+    "age": (0, 120),
+}
+HOLDER_CHOICES: Dict[str, Tuple[str, ...]] = {
+    "social_category": ("ST", "SC", "OBC", "General"),
+    "gender": ("Male", "Female", "Other"),
+}
+
+VILLAGE_RANGES: Dict[str, Tuple[float, float]] = {
+    "total_households": (1, np.inf),
+    "st_households": (0, np.inf),
+    "sc_households": (0, np.inf),
+    "total_population": (1, np.inf),
+    "st_population": (0, np.inf),
+    "water_index": (0.0, 100.0),
+    "electricity_index": (0.0, 100.0),
+    "road_connectivity_index": (0.0, 100.0),
+    "health_facility_index": (0.0, 100.0),
+    "education_index": (0.0, 100.0),
+    "livelihood_index": (0.0, 100.0),
+    "forest_cover_percent": (0.0, 100.0),
+    "agricultural_land_percent": (0.0, 100.0),
+    "latitude": (-90.0, 90.0),
+    "longitude": (-180.0, 180.0),
+}
+VILLAGE_CHOICES: Dict[str, Tuple[str, ...]] = {}
+
+# Row numbers listed per violated column
+MAX_REPORTED_ROWS = 10
+
+class TableValidationError(ValueError):
+    """Uploaded table failed validation; violations maps column -> problem and offending rows"""
+
+    def __init__(self, record_kind: str, violations: Dict[str, Dict[str, Any]]):
+        self.violations = violations
+        summary = "; ".join(f"{column}: {problem['message']} ({problem['rows']} rows)" for column, problem in violations.items())
+        super().__init__(f"Invalid {record_kind} table: {summary}")
+
+def detect_table_format(name: Optional[str], content_type: Optional[str] = None) -> str:
+    """Pick CSV, Parquet or Arrow IPC from a file name or content type"""
+    if content_type:
+        if "csv" in content_type:
+            return CSV_TABLE
+        if "parquet" in content_type:
+            return PARQUET_TABLE
+        if "arrow" in content_type:
+            return ARROW_TABLE
+    suffix = Path(name or "").suffix.lower()
+    if suffix in _TABLE_FORMAT_BY_SUFFIX:
+        return _TABLE_FORMAT_BY_SUFFIX[suffix]
+    raise ValueError(f"Cannot determine table format for '{name}'; use .csv, .parquet or .arrow")
+
+# Reading
+
+def _read_csv(source: BinaryIO) -> Dict[str, np.ndarray]:
+    """CSV columns as string arrays (empty cells as empty strings)"""
+    if pd is not None:
+        frame = pd.read_csv(source, dtype=str, keep_default_na=False, skipinitialspace=True)
+        return {str(name): frame[name].to_numpy(dtype=str) for name in frame.columns}
+
+    reader = csv.reader(io.TextIOWrapper(source, encoding="utf-8", newline=""))
+    header = next(reader, None)
+    if header is None:
+        return {}
+    header = [name.strip() for name in header]
+    rows = list(reader)
+    if any(len(row) != len(header) for row in rows):
+        raise ValueError("CSV rows must have as many cells as the header")
+    if not rows:
+        return {name: np.array([], dtype=str) for name in header}
+    return {name: np.char.strip(np.array(values, dtype=str)) for name, values in zip(header, zip(*rows))}
+
+def _require_pyarrow(table_format: str) -> None:
+    if pa is None:
+        raise ValueError(f"{table_format.capitalize()} uploads require pyarrow, which is not installed")
+
+def _arrow_columns(table) -> Dict[str, np.ndarray]:
+    """NumPy columns of an Arrow table; null numbers become NaN and null strings empty strings"""
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            column = column.fill_null("")
+        columns[name] = column.to_numpy()
+    return columns
+
+def read_table(source: BinaryIO, table_format: str) -> Dict[str, np.ndarray]:
+    """Read an uploaded CSV, Parquet or Arrow IPC (file or stream) table into NumPy columns"""
+    if table_format == CSV_TABLE:
+        return _read_csv(source)
+    if table_format == PARQUET_TABLE:
+        _require_pyarrow(table_format)
+        return _arrow_columns(pa_parquet.read_table(source))
+    if table_format == ARROW_TABLE:
+        _require_pyarrow(table_format)
+        data = source.read()
+        try:
+            table = pa_ipc.open_file(pa.BufferReader(data)).read_all()
+        except pa.ArrowInvalid:
+            table = pa_ipc.open_stream(pa.BufferReader(data)).read_all()
+        return _arrow_columns(table)
+    raise ValueError(f"Unsupported table format '{table_format}'")
+
+# Conversion and validation
+
+def _rows(mask: np.ndarray) -> Dict[str, Any]:
+    rows = np.flatnonzero(mask)
+    # Row numbers are 1-based data rows (excluding any header)
+    return {"rows": int(rows.shape[0]), "first_rows": (rows[:MAX_REPORTED_ROWS] + 1).tolist()}
+
+def _to_number(values: np.ndarray, dtype, optional: bool) -> Tuple[np.ndarray, Optional[Dict[str, Any]]]:
+    """Convert a column to dtype; returns the float64 values (NaN where missing) and any violation"""
+    if values.dtype.kind in "US":
+        text = np.char.strip(values.astype(str))
+        empty = text == ""
+        try:
+            numbers = np.where(empty, "nan", text).astype(np.float64)
+        except ValueError:
+            invalid = np.array([not _is_float(value) for value in text]) & ~empty
+            return np.array([]), {"message": "not a number", **_rows(invalid)}
+    elif values.dtype.kind == "b":
+        numbers = values.astype(np.float64)
+    else:
+        numbers = np.asarray(values, dtype=np.float64)
+
+    missing = np.isnan(numbers)
+    if missing.any() and not optional:
+        return numbers, {"message": "missing value", **_rows(missing)}
+    if np.issubdtype(dtype, np.integer):
+        fractional = ~missing & (numbers != np.round(numbers))
+        if fractional.any():
+            return numbers, {"message": "not a whole number", **_rows(fractional)}
+    return numbers, None
+
+def _is_float(value: str) -> bool:
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+def _to_bool(values: np.ndarray) -> Tuple[np.ndarray, Optional[Dict[str, Any]]]:
+    if values.dtype.kind == "b":
+        return values, None
+    if values.dtype.kind in "iuf":
+        invalid = ~np.isin(values, (0, 1))
+        if invalid.any():
+            return values, {"message": "not a boolean", **_rows(invalid)}
+        return values.astype(bool), None
+    text = np.char.lower(np.char.strip(values.astype(str)))
+    truthy = np.isin(text, list(TRUE_VALUES))
+    invalid = ~truthy & ~np.isin(text, list(FALSE_VALUES))
+    if invalid.any():
+        return truthy, {"message": "not a boolean", **_rows(invalid)}
+    return truthy, None
+
+def _columns(
+    record_kind: str,
+    raw: Dict[str, np.ndarray],
+    dtypes: Dict[str, object],
+    text_columns: Tuple[str, ...],
+    optional_columns: Tuple[str, ...],
+    ranges: Dict[str, Tuple[float, float]],
+    choices: Dict[str, Tuple[str, ...]]
+) -> Dict[str, np.ndarray]:
+    """Typed, validated columns ready for HolderColumns/VillageColumns.from_arrays"""
+    required = [name for name in (*dtypes, *text_columns) if name not in optional_columns]
+    missing = [name for name in required if name not in raw]
+    if missing:
+        raise ValueError(f"Missing {record_kind} columns: {', '.join(missing)}")
+    count = len(raw[required[0]])
+
+    columns: Dict[str, np.ndarray] = {}
+    violations: Dict[str, Dict[str, Any]] = {}
+
+    for name, dtype in dtypes.items():
+        values = raw.get(name)
+        if values is None:
+            columns[name] = np.full(count, np.nan)
+            continue
+        if dtype is np.bool_:
+            converted, problem = _to_bool(values)
+        else:
+            converted, problem = _to_number(values, dtype, name in optional_columns)
+        if problem is not None:
+            violations[name] = problem
+            continue
+
+        if name in ranges:
+            low, high = ranges[name]
+            outside = ~np.isnan(converted) & ((converted < low) | (converted > high))
+            if outside.any():
+                violations[name] = {"message": f"outside [{low}, {high}]", **_rows(outside)}
+                continue
+        columns[name] = converted
+
+    for name in text_columns:
+        values = np.char.strip(raw[name].astype(str))
+        if name in choices:
+            invalid = ~np.isin(values, choices[name])
+            if invalid.any():
+                violations[name] = {"message": f"not one of {', '.join(choices[name])}", **_rows(invalid)}
+                continue
+        elif name.endswith("_id") or name.endswith("_code"):
+            empty = values == ""
+            if empty.any():
+                violations[name] = {"message": "missing value", **_rows(empty)}
+                continue
+        columns[name] = values
+
+    if violations:
+        raise TableValidationError(record_kind, violations)
+    return columns
+
+def holder_columns_from_table(raw: Dict[str, np.ndarray]) -> HolderColumns:
+    """Validate raw holder columns and build a HolderColumns table"""
+    columns = _columns("holder", raw, HOLDER_COLUMN_DTYPES, HOLDER_TEXT_COLUMNS, HOLDER_OPTIONAL_COLUMNS, HOLDER_RANGES, HOLDER_CHOICES)
+    return HolderColumns.from_arrays(**columns)
+
+def village_columns_from_table(raw: Dict[str, np.ndarray]) -> VillageColumns:
+    """Validate raw village columns and build a VillageColumns table"""
+    columns = _columns("village", raw, VILLAGE_COLUMN_DTYPES, VILLAGE_TEXT_COLUMNS, VILLAGE_OPTIONAL_COLUMNS, VILLAGE_RANGES, VILLAGE_CHOICES)
+    return VillageColumns.from_arrays(**columns)
+
+def read_holder_columns(source: BinaryIO, table_format: str) -> HolderColumns:
+    """Read and validate an uploaded FRA holder table"""
+    holders = holder_columns_from_table(read_table(source, table_format))
+    logger.debug(f"Ingested {len(holders)} FRA holders from {table_format}")
+    return holders
+
+def read_village_columns(source: BinaryIO, table_format: str) -> VillageColumns:
+    """Read and validate an uploaded village table"""
+    villages = village_columns_from_table(read_table(source, table_format))
+    logger.debug(f"Ingested {len(villages)} villages from {table_format}")
+    return villages
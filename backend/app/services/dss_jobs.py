@@ -0,0 +1,397 @@
+"""
+Background DSS policy jobs
+
+National policy runs take minutes, longer than a request should stay open. A
+job is submitted with its input (uploaded NDJSON/CSV files spooled into the job
+directory, a dataset already stored under DSS_DATA_DIR, or a snapshot of the
+incremental aggregate store, spooled to NDJSON), run by
+DSSEngine.generate_policy_recommendations_streaming in a pool of spawned worker
+processes, so CPU-bound runs do not compete with request handling for the GIL,
+and polled for status and progress. Workers read the inputs from the job
+directory and report status and progress by rewriting the job's job.json, which
+the server re-reads while the job is queued or running. The finished report is
+written once to the job directory; every fetch is served from that file, and
+finished jobs survive a restart. A policy report is counted in the usage
+analytics when its job completes, not when it is submitted.
+
+Configuration (environment):
+    DSS_JOB_DIR       directory holding job metadata, inputs and results (default dss_jobs)
+    DSS_DATA_DIR      directory of stored datasets that jobs may reference (default dss_data)
+    DSS_JOB_WORKERS   concurrent policy runs, one worker process each (default 2)
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+import io
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+import uuid
+
+from .dss_analytics import AnalyticsCollector, dss_analytics
+from .dss_json import dumps
+from .dss_service import DSSEngine, FRAHolder, SchemeType, VillageProfile, dss_engine
+from .dss_streaming import detect_format, iter_holders, iter_villages
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_DIR = os.getenv("DSS_JOB_DIR", "dss_jobs")
+DEFAULT_DATA_DIR = os.getenv("DSS_DATA_DIR", "dss_data")
+DEFAULT_JOB_WORKERS = int(os.getenv("DSS_JOB_WORKERS", "2"))
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+SOURCE_UPLOAD = "upload"
+SOURCE_STORED = "stored"
+SOURCE_AGGREGATES = "aggregates"
+
+# Records between progress updates, and minimum seconds between progress writes to job.json
+PROGRESS_INTERVAL = 1000
+PROGRESS_SAVE_SECONDS = 1.0
+
+METADATA_FILE = "job.json"
+RESULT_FILE = "result.json"
+# Inputs of aggregate snapshot jobs, spooled so the worker process can read them
+SNAPSHOT_VILLAGES_FILE = "villages.ndjson"
+SNAPSHOT_HOLDERS_FILE = "holders.ndjson"
+
+T = TypeVar("T")
+
+@dataclass
+class PolicyJob:
+    """Status of one background policy run, as persisted in its job.json"""
+    job_id: str
+    source: str
+    status: str = JOB_QUEUED
+    progress: float = 0.0  # percent
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    error: Optional[str] = None
+    inputs: Dict[str, str] = field(default_factory=dict)  # villages/holders -> file name or dataset
+    max_listed_per_section: Optional[int] = 1000
+    scheme_rules_version: Optional[str] = None
+    records_processed: int = 0
+    summary: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+def _write_metadata(path: Path, job: PolicyJob) -> None:
+    """Atomically rewrite a job's metadata file"""
+    path.mkdir(parents=True, exist_ok=True)
+    temporary = path / (METADATA_FILE + ".tmp")
+    with open(temporary, "w", encoding="utf-8") as handle:
+        json.dump(job.to_dict(), handle)
+    os.replace(temporary, path / METADATA_FILE)
+
+def _read_metadata(path: Path) -> PolicyJob:
+    with open(path / METADATA_FILE, "r", encoding="utf-8") as handle:
+        return PolicyJob(**json.load(handle))
+
+class _Progress:
+    """Percent of input consumed in bytes, persisted to job.json at most every PROGRESS_SAVE_SECONDS"""
+
+    def __init__(self, job: PolicyJob, total_units: int, save: Callable[[PolicyJob], None]):
+        self.job = job
+        self.total_units = max(total_units, 1)
+        self.done_units = 0
+        self.save = save
+        self._saved_at = time.monotonic()
+
+    def track(self, records: Iterable[T], measure: Optional[Callable[[], int]] = None) -> Iterator[T]:
+        """
+        Pass records through, updating the job's progress every PROGRESS_INTERVAL records
+
+        measure returns the units of this input consumed so far (e.g. the file
+        offset); without it every record counts as one unit. Inputs are tracked
+        one after the other, as the engine consumes them.
+        """
+        base, processed, count = self.done_units, self.job.records_processed, 0
+        for count, record in enumerate(records, start=1):
+            if count % PROGRESS_INTERVAL == 0:
+                self._update(base + (measure() if measure else count), processed + count)
+            yield record
+        self.done_units = base + (measure() if measure else count)
+        self._update(self.done_units, processed + count)
+
+    def _update(self, done_units: int, records_processed: int) -> None:
+        # 100% is only reported once the report has been persisted
+        self.job.progress = round(min(done_units / self.total_units * 100, 99.0), 1)
+        self.job.records_processed = records_processed
+        now = time.monotonic()
+        if now - self._saved_at >= PROGRESS_SAVE_SECONDS:
+            self.save(self.job)
+            self._saved_at = now
+
+def _run_job(
+    job_path: str,
+    job: PolicyJob,
+    villages_path: str,
+    holders_path: str,
+    scheme_rules: Dict[SchemeType, Dict],
+    intervention_rules: Dict[str, Dict]
+) -> PolicyJob:
+    """
+    Run one policy job inside a worker process and return its final state
+
+    The engine gets the submitting server's rules. Status, progress and the
+    outcome are written to the job's job.json as the run goes; the report to
+    result.json.
+    """
+    path = Path(job_path)
+    save = partial(_write_metadata, path)
+    engine = DSSEngine()
+    engine.scheme_rules = scheme_rules
+    engine.intervention_rules = intervention_rules
+    engine.compile_intervention_rules()
+
+    job.status = JOB_RUNNING
+    job.started_at = datetime.now().isoformat()
+    job.scheme_rules_version = engine.scheme_rules_version()
+    save(job)
+    try:
+        report = _run_files(engine, job, Path(villages_path), Path(holders_path), save)
+        temporary = path / (RESULT_FILE + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, default=str)
+        os.replace(temporary, path / RESULT_FILE)
+        job.summary = report["summary"]
+        job.progress = 100.0
+        job.status = JOB_COMPLETED
+    except Exception as e:
+        job.status = JOB_FAILED
+        job.error = str(e)
+    job.completed_at = datetime.now().isoformat()
+    save(job)
+    return job
+
+def _run_files(engine: DSSEngine, job: PolicyJob, villages_path: Path, holders_path: Path, save: Callable[[PolicyJob], None]) -> Dict[str, Any]:
+    progress = _Progress(job, villages_path.stat().st_size + holders_path.stat().st_size, save)
+    with open(villages_path, "rb") as villages_raw, open(holders_path, "rb") as holders_raw:
+        villages_text = io.TextIOWrapper(villages_raw, encoding="utf-8", newline="")
+        holders_text = io.TextIOWrapper(holders_raw, encoding="utf-8", newline="")
+        villages = progress.track(iter_villages(villages_text, detect_format(villages_path.name)), villages_raw.tell)
+        holders = progress.track(iter_holders(holders_text, detect_format(holders_path.name)), holders_raw.tell)
+        return engine.generate_policy_recommendations_streaming(villages, holders, job.max_listed_per_section)
+
+class PolicyJobManager:
+    """Submit, run and persist background policy report jobs"""
+
+    def __init__(
+        self,
+        engine: DSSEngine = dss_engine,
+        job_dir: str = DEFAULT_JOB_DIR,
+        data_dir: str = DEFAULT_DATA_DIR,
+        max_workers: int = DEFAULT_JOB_WORKERS,
+        analytics: Optional[AnalyticsCollector] = dss_analytics
+    ):
+        self.engine = engine
+        self.analytics = analytics
+        self.job_dir = Path(job_dir)
+        self.data_dir = Path(data_dir)
+        self.max_workers = max_workers
+        self._jobs: Dict[str, PolicyJob] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._loaded = False
+
+    # Persistence
+
+    def _path(self, job_id: str) -> Path:
+        return self.job_dir / job_id
+
+    def _save(self, job: PolicyJob) -> None:
+        _write_metadata(self._path(job.job_id), job)
+
+    def _refresh(self, job: PolicyJob) -> PolicyJob:
+        """Latest state of a queued or running job, as last written by its worker"""
+        if job.status not in (JOB_QUEUED, JOB_RUNNING):
+            return job
+        try:
+            current = _read_metadata(self._path(job.job_id))
+        except (OSError, ValueError, TypeError):
+            return job
+        with self._lock:
+            # A finished state set by the completion callback wins over a stale file
+            if self._jobs.get(job.job_id) is job:
+                self._jobs[job.job_id] = current
+                return current
+            return self._jobs.get(job.job_id, current)
+
+    def _load(self) -> None:
+        """Pick up jobs persisted by earlier processes; runs cut short by a restart are marked failed"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not self.job_dir.is_dir():
+                return
+            for metadata in self.job_dir.glob(f"*/{METADATA_FILE}"):
+                try:
+                    with open(metadata, "r", encoding="utf-8") as handle:
+                        job = PolicyJob(**json.load(handle))
+                except (OSError, ValueError, TypeError) as e:
+                    logger.warning(f"Skipping unreadable job metadata {metadata}: {e}")
+                    continue
+                if job.status in (JOB_QUEUED, JOB_RUNNING):
+                    job.status = JOB_FAILED
+                    job.error = "Interrupted by a server restart"
+                    self._save(job)
+                self._jobs[job.job_id] = job
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Worker processes, started on first use; spawned so they do not fork the server's threads"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    # Submission
+
+    def _new_job(self, source: str, max_listed_per_section: Optional[int]) -> PolicyJob:
+        self._load()
+        job = PolicyJob(job_id=uuid.uuid4().hex, source=source, max_listed_per_section=max_listed_per_section)
+        self._path(job.job_id).mkdir(parents=True, exist_ok=True)
+        return job
+
+    def _enqueue(self, job: PolicyJob, villages_path: Path, holders_path: Path) -> PolicyJob:
+        self._save(job)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        future = self._pool().submit(
+            _run_job, str(self._path(job.job_id)), job, str(villages_path), str(holders_path),
+            self.engine.scheme_rules, self.engine.intervention_rules
+        )
+        future.add_done_callback(lambda future: self._finished(job.job_id, future))
+        logger.info(f"Queued DSS policy job {job.job_id} ({job.source})")
+        return job
+
+    def submit_upload(
+        self,
+        villages: io.IOBase,
+        villages_name: str,
+        holders: io.IOBase,
+        holders_name: str,
+        max_listed_per_section: Optional[int] = 1000
+    ) -> PolicyJob:
+        """
+        Spool uploaded village and holder files into the job directory and queue the run
+
+        Input formats are detected from the file names, so unsupported uploads are
+        rejected (ValueError) before a job is created.
+        """
+        villages_file = "villages" + Path(villages_name).suffix.lower()
+        holders_file = "holders" + Path(holders_name).suffix.lower()
+        detect_format(villages_file)
+        detect_format(holders_file)
+
+        job = self._new_job(SOURCE_UPLOAD, max_listed_per_section)
+        path = self._path(job.job_id)
+        for stream, name in ((villages, villages_file), (holders, holders_file)):
+            with open(path / name, "wb") as handle:
+                shutil.copyfileobj(stream, handle)
+        job.inputs = {"villages": villages_file, "holders": holders_file}
+        return self._enqueue(job, path / villages_file, path / holders_file)
+
+    def submit_stored(self, villages_dataset: str, holders_dataset: str, max_listed_per_section: Optional[int] = 1000) -> PolicyJob:
+        """Queue a run over NDJSON/CSV datasets stored under the data directory"""
+        villages_path = self.resolve_dataset(villages_dataset)
+        holders_path = self.resolve_dataset(holders_dataset)
+        job = self._new_job(SOURCE_STORED, max_listed_per_section)
+        job.inputs = {"villages": villages_dataset, "holders": holders_dataset}
+        return self._enqueue(job, villages_path, holders_path)
+
+    def submit_snapshot(self, villages: List[VillageProfile], holders: List[FRAHolder], max_listed_per_section: Optional[int] = 1000) -> PolicyJob:
+        """Spool already materialized records (e.g. the aggregate store's contents) to NDJSON and queue the run"""
+        job = self._new_job(SOURCE_AGGREGATES, max_listed_per_section)
+        path = self._path(job.job_id)
+        for records, name in ((villages, SNAPSHOT_VILLAGES_FILE), (holders, SNAPSHOT_HOLDERS_FILE)):
+            with open(path / name, "wb") as handle:
+                handle.writelines(dumps(record) + b"\n" for record in records)
+        job.inputs = {"villages": f"{len(villages)} records", "holders": f"{len(holders)} records"}
+        return self._enqueue(job, path / SNAPSHOT_VILLAGES_FILE, path / SNAPSHOT_HOLDERS_FILE)
+
+    def resolve_dataset(self, name: str) -> Path:
+        """Path of a stored dataset; names may not leave the data directory"""
+        root = self.data_dir.resolve()
+        path = (root / name).resolve()
+        if root not in path.parents:
+            raise ValueError(f"Invalid dataset name '{name}'")
+        if not path.is_file():
+            raise ValueError(f"Dataset '{name}' not found")
+        detect_format(path.name)
+        return path
+
+    # Execution
+
+    def _finished(self, job_id: str, future: Future) -> None:
+        """Completion callback: adopt the worker's final state, or fail the job if its worker died"""
+        error = future.exception()
+        if error is None:
+            job = future.result()
+        else:
+            job = self._jobs[job_id]
+            job.status = JOB_FAILED
+            job.error = f"Worker process failed: {error}"
+            job.completed_at = datetime.now().isoformat()
+            self._save(job)
+        with self._lock:
+            self._jobs[job_id] = job
+        if job.status == JOB_COMPLETED:
+            logger.info(f"DSS policy job {job.job_id} completed ({job.records_processed} records)")
+            if self.analytics is not None:
+                self.analytics.record_policy_report()
+        else:
+            logger.error(f"DSS policy job {job.job_id} failed: {job.error}")
+
+    # Queries
+
+    def get(self, job_id: str) -> Optional[PolicyJob]:
+        self._load()
+        job = self._jobs.get(job_id)
+        return self._refresh(job) if job is not None else None
+
+    def list_jobs(self) -> List[PolicyJob]:
+        """All known jobs, newest first"""
+        self._load()
+        jobs = [self._refresh(job) for job in list(self._jobs.values())]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def result_path(self, job_id: str) -> Optional[Path]:
+        """Persisted report of a completed job"""
+        job = self.get(job_id)
+        if job is None or job.status != JOB_COMPLETED:
+            return None
+        path = self._path(job_id) / RESULT_FILE
+        return path if path.is_file() else None
+
+    def delete(self, job_id: str) -> bool:
+        """Remove a finished job and its files; returns False if unknown or still queued/running"""
+        job = self.get(job_id)
+        if job is None or job.status in (JOB_QUEUED, JOB_RUNNING):
+            return False
+        with self._lock:
+            self._jobs.pop(job_id, None)
+        shutil.rmtree(self._path(job_id), ignore_errors=True)
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+# Shared job manager used by the DSS routes
+policy_jobs = PolicyJobManager(dss_engine)
@@ -0,0 +1,137 @@
+"""
+Village join index for the DSS engine
+
+FRA holders carry a village_code, but the engine evaluates holders and villages
+as independent populations. VillageHolderIndex hashes village_code to the
+village's profile and its holders, and computes combined per-village views
+(individual benefit totals next to infrastructure interventions, eligibility
+counts per scheme) in one join pass: every holder of the selected villages is
+assessed once in a columnar batch and the results are grouped by village slot.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+from dataclasses import dataclass
+import logging
+import numpy as np
+
+from .dss_service import DSSEngine, FRAHolder, VillageProfile, InterventionRecommendation
+from .dss_columnar import ELIGIBLE, STATUS_CODES, HolderColumns
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class VillageView:
+    """Combined individual and village-level picture of one village"""
+    village_code: str
+    village: Optional[VillageProfile]  # None for holders whose village profile is unknown
+    holder_count: int
+    individual_benefits: float
+    eligibility_counts: Dict[str, Dict[str, int]]  # scheme -> status -> holders
+    interventions: List[InterventionRecommendation]
+    intervention_cost: float
+
+    @property
+    def total_investment(self) -> float:
+        return self.individual_benefits + self.intervention_cost
+
+class VillageHolderIndex:
+    """Hash index from village_code to the village profile and its FRA holders"""
+
+    def __init__(self):
+        self._slots: Dict[str, int] = {}
+        self.village_codes: List[str] = []
+        self.profiles: List[Optional[VillageProfile]] = []
+        self.holders: List[List[FRAHolder]] = []
+
+    @classmethod
+    def build(cls, villages: Iterable[VillageProfile], fra_holders: Iterable[FRAHolder]) -> "VillageHolderIndex":
+        """Index villages and holders in one pass over each"""
+        index = cls()
+        for village in villages:
+            index.add_village(village)
+        for holder in fra_holders:
+            index.add_holder(holder)
+        return index
+
+    def _slot(self, village_code: str) -> int:
+        slot = self._slots.get(village_code)
+        if slot is None:
+            slot = len(self.village_codes)
+            self._slots[village_code] = slot
+            self.village_codes.append(village_code)
+            self.profiles.append(None)
+            self.holders.append([])
+        return slot
+
+    def add_village(self, village: VillageProfile) -> None:
+        """Insert or replace a village profile"""
+        self.profiles[self._slot(village.village_code)] = village
+
+    def add_holder(self, holder: FRAHolder) -> None:
+        self.holders[self._slot(holder.village_code)].append(holder)
+
+    def __len__(self) -> int:
+        return len(self.village_codes)
+
+    def __contains__(self, village_code: str) -> bool:
+        return village_code in self._slots
+
+    def profile(self, village_code: str) -> Optional[VillageProfile]:
+        slot = self._slots.get(village_code)
+        return None if slot is None else self.profiles[slot]
+
+    def holders_of(self, village_code: str) -> List[FRAHolder]:
+        slot = self._slots.get(village_code)
+        return [] if slot is None else self.holders[slot]
+
+    def unmatched_village_codes(self) -> List[str]:
+        """Village codes referenced by holders but without a village profile"""
+        return [code for code, profile in zip(self.village_codes, self.profiles) if profile is None]
+
+    def views(self, engine: DSSEngine, village_codes: Optional[Sequence[str]] = None) -> List[VillageView]:
+        """
+        Per-village views for the given village codes (all indexed villages by default)
+
+        Holders of the selected villages are assessed together in one columnar pass;
+        eligibility counts and benefit totals are grouped by village with bincount.
+        Unknown village codes are skipped.
+        """
+        if village_codes is None:
+            slots = list(range(len(self)))
+        else:
+            slots = [self._slots[code] for code in village_codes if code in self._slots]
+
+        holders = [holder for slot in slots for holder in self.holders[slot]]
+        # Position of each selected village in the output, repeated per holder
+        holder_villages = np.repeat(np.arange(len(slots)), [len(self.holders[slot]) for slot in slots])
+
+        eligibility = engine.assess_eligibility_columnar(HolderColumns.from_holders(holders))
+        scheme_count, status_count = len(eligibility.schemes), len(STATUS_CODES)
+
+        # counts[village, scheme, status] in a single bincount over combined codes
+        combined = (holder_villages[None, :] * scheme_count + np.arange(scheme_count)[:, None]) * status_count + eligibility.status
+        counts = np.bincount(combined.ravel(), minlength=len(slots) * scheme_count * status_count)
+        counts = counts.reshape(len(slots), scheme_count, status_count)
+
+        payable = np.where(eligibility.status == ELIGIBLE, np.nan_to_num(eligibility.eligible_amount), 0.0).sum(axis=0)
+        benefits = np.bincount(holder_villages, weights=payable, minlength=len(slots))
+
+        views = []
+        for position, slot in enumerate(slots):
+            village = self.profiles[slot]
+            interventions = engine.prioritize_village_interventions(village) if village is not None else []
+            views.append(VillageView(
+                village_code=self.village_codes[slot],
+                village=village,
+                holder_count=len(self.holders[slot]),
+                individual_benefits=float(benefits[position]),
+                eligibility_counts={
+                    scheme.value: {status.value: int(counts[position, row, code]) for code, status in enumerate(STATUS_CODES)}
+                    for row, scheme in enumerate(eligibility.schemes)
+                },
+                interventions=interventions,
+                intervention_cost=float(sum(i.estimated_cost for i in interventions))
+            ))
+
+        logger.debug(f"Built {len(views)} village views over {len(holders)} FRA holders")
+        return views
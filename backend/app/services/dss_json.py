@@ -0,0 +1,114 @@
+"""
+Direct JSON encoding of DSS engine results
+
+The response models in dss_routes mirror the engine dataclasses field for field
+(SchemeEligibilityResponse <-> SchemeEligibility, InterventionRecommendationResponse
+<-> InterventionRecommendation). Converting every result to a pydantic model,
+validating it against the route's response_model and dumping it again costs
+more than evaluating the rules for a bulk request. dumps() encodes the
+dataclasses, their str enums and tuples straight to JSON bytes instead, with
+orjson when it is installed and the standard library otherwise. Routes keep
+their response_model, so the OpenAPI schema is unchanged.
+
+Fields annotated float (or Optional[float]) are always encoded as JSON floats,
+as the response model would encode them: the engine may hold an int there
+(e.g. an annual_benefit of 6000), which would otherwise be written as 6000.
+
+projection() drops fields clients do not need (e.g. reasons and
+required_documents of bulk eligibility results) before encoding.
+"""
+
+from typing import Any, Callable, Collection, Dict, FrozenSet, Optional, Tuple, get_type_hints
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import lru_cache
+import json
+
+import numpy as np
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_FLOAT_HINTS = (float, Optional[float])
+
+@lru_cache(maxsize=None)
+def _float_fields(record_type: type) -> FrozenSet[str]:
+    """Names of the fields of a dataclass annotated float or Optional[float]"""
+    return frozenset(name for name, hint in get_type_hints(record_type).items() if hint in _FLOAT_HINTS)
+
+def _record_encoder(record_type: type, names: Tuple[str, ...]) -> Callable[[Any], Dict[str, Any]]:
+    """Function mapping a record_type dataclass to a dict of names, with float fields as floats"""
+    floats = tuple(name for name in names if name in _float_fields(record_type))
+
+    def encode(record: Any) -> Dict[str, Any]:
+        data = {name: getattr(record, name) for name in names}
+        for name in floats:
+            value = data[name]
+            if value is not None:
+                data[name] = float(value)
+        return data
+    return encode
+
+@lru_cache(maxsize=None)
+def _dataclass_encoder(record_type: type) -> Callable[[Any], Dict[str, Any]]:
+    return _record_encoder(record_type, tuple(f.name for f in fields(record_type)))
+
+def _default(value: Any) -> Any:
+    """Encode values the standard json module does not know"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return _dataclass_encoder(type(value))(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+if orjson is not None:
+    # Dataclasses go through _default so float fields are coerced
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def dumps(content: Any) -> bytes:
+        """Encode engine results (dataclasses, enums, tuples, NumPy scalars) to JSON bytes"""
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+else:
+    _ENCODER = json.JSONEncoder(default=_default, ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(content: Any) -> bytes:
+        """Encode engine results (dataclasses, enums, tuples, NumPy scalars) to JSON bytes"""
+        return _ENCODER.encode(content).encode("utf-8")
+
+ENCODER_NAME = "orjson" if orjson is not None else "json"
+
+def projection(
+    record_type: type,
+    exclude: Optional[Collection[str]],
+    excludable: Optional[Collection[str]] = None
+) -> Optional[Callable[[Any], Dict[str, Any]]]:
+    """
+    Function mapping a record_type dataclass to a dict without the excluded fields
+
+    Returns None when nothing is excluded, so callers encode the records as they are.
+    Unknown field names, and fields outside excludable when it is given (e.g. fields
+    the route's response model requires), raise ValueError.
+    """
+    if not exclude:
+        return None
+    names = [f.name for f in fields(record_type)]
+    unknown = sorted(set(exclude) - set(names))
+    if unknown:
+        raise ValueError(f"Unknown {record_type.__name__} fields: {', '.join(unknown)}")
+    if excludable is not None:
+        required = sorted(set(exclude) - set(excludable))
+        if required:
+            raise ValueError(f"Cannot exclude required {record_type.__name__} fields: {', '.join(required)}")
+    return _record_encoder(record_type, tuple(name for name in names if name not in exclude))
+
+class DSSJSONResponse(Response):
+    """JSON response encoded by dumps(), bypassing response_model serialization"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
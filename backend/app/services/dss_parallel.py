@@ -0,0 +1,156 @@
+"""
+Process-pool sharded execution for bulk DSS eligibility assessment
+
+Large batches of FRA holders are split into shards that are assessed in a pool
+of worker processes sized to the host's cores, and the results are merged back
+in input order. Batches up to the shard-size threshold are assessed in a thread,
+avoiding inter-process overhead for small requests.
+
+Configuration (environment):
+    DSS_BULK_SHARD_SIZE  holders per shard and inline threshold (default 2000)
+    DSS_BULK_WORKERS     worker processes (default: number of CPU cores)
+"""
+
+from typing import Collection, Dict, List, Optional, Set
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+
+from fastapi.concurrency import run_in_threadpool
+
+from .dss_service import DSSEngine, FRAHolder, SchemeEligibility, SchemeType, dss_engine
+from .dss_columnar import EligibilityResultSet
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD_SIZE = int(os.getenv("DSS_BULK_SHARD_SIZE", "2000"))
+DEFAULT_MAX_WORKERS = int(os.getenv("DSS_BULK_WORKERS", "0")) or os.cpu_count() or 1
+
+# Engine used inside worker processes, configured by _init_worker
+_worker_engine: Optional[DSSEngine] = None
+
+def _init_worker(scheme_rules: Dict[SchemeType, Dict]) -> None:
+    """Give each worker an engine with the parent's scheme rules"""
+    global _worker_engine
+    _worker_engine = DSSEngine()
+    _worker_engine.scheme_rules = scheme_rules
+
+def _assess_shard(holders: List[FRAHolder], schemes: Optional[Collection[SchemeType]] = None) -> EligibilityResultSet:
+    """Assess one shard of holders inside a worker process, packed compactly for the trip back"""
+    return EligibilityResultSet.from_results(
+        (holder.holder_id for holder in holders),
+        (_worker_engine.assess_individual_eligibility(holder, schemes) for holder in holders)
+    )
+
+class ShardedEligibilityExecutor:
+    """Assesses bulk eligibility inline for small batches and across a process pool for large ones"""
+
+    def __init__(self, engine: DSSEngine = dss_engine, shard_size: int = DEFAULT_SHARD_SIZE, max_workers: int = DEFAULT_MAX_WORKERS):
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        self.engine = engine
+        self.shard_size = shard_size
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_rules_version: Optional[str] = None
+        # In-flight batches per pool, and replaced pools waiting for theirs to finish
+        self._pool_users: Dict[ProcessPoolExecutor, int] = {}
+        self._retired: Set[ProcessPoolExecutor] = set()
+        self._lock = threading.Lock()
+
+    def _acquire_pool(self) -> ProcessPoolExecutor:
+        """
+        The worker pool for the current rules, counting the caller as a user until _release_pool
+
+        Pools start on first use; spawned workers avoid forking the server's threads.
+        Workers hold a copy of the rules, so a rules change swaps in a new pool and
+        the old one is shut down once its last in-flight batch is released.
+        """
+        rules_version = self.engine.scheme_rules_version()
+        with self._lock:
+            if self._pool is not None and self._pool_rules_version != rules_version:
+                self._retire(self._pool)
+                self._pool = None
+            if self._pool is None:
+                self._pool_rules_version = rules_version
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.engine.scheme_rules,)
+                )
+                logger.info(f"Started DSS eligibility pool with {self.max_workers} workers")
+            self._pool_users[self._pool] = self._pool_users.get(self._pool, 0) + 1
+            return self._pool
+
+    def _release_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            self._pool_users[pool] -= 1
+            if not self._pool_users[pool]:
+                del self._pool_users[pool]
+                if pool in self._retired:
+                    self._retired.discard(pool)
+                    pool.shutdown(wait=False)
+
+    def _retire(self, pool: ProcessPoolExecutor) -> None:
+        """Shut down a replaced pool now if idle, otherwise when its last user releases it (lock held)"""
+        if self._pool_users.get(pool):
+            self._retired.add(pool)
+        else:
+            pool.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool; it restarts on the next sharded batch"""
+        with self._lock:
+            if self._pool is not None:
+                self._retire(self._pool)
+                self._pool = None
+
+    def shards(self, holders: List[FRAHolder]) -> List[List[FRAHolder]]:
+        """Split holders into consecutive shards of at most shard_size"""
+        return [holders[start:start + self.shard_size] for start in range(0, len(holders), self.shard_size)]
+
+    def is_inline(self, holders: List[FRAHolder]) -> bool:
+        return len(holders) <= self.shard_size or self.max_workers <= 1
+
+    def assess(self, holders: List[FRAHolder], schemes: Optional[Collection[SchemeType]] = None) -> List[List[SchemeEligibility]]:
+        """Assess holders (optionally only the given schemes), preserving input order"""
+        if self.is_inline(holders):
+            return [self.engine.assess_individual_eligibility(holder, schemes) for holder in holders]
+
+        results: List[List[SchemeEligibility]] = []
+        shards = self.shards(holders)
+        pool = self._acquire_pool()
+        try:
+            for shard_result in pool.map(_assess_shard, shards, repeat(schemes, len(shards))):
+                results.extend(shard_result)
+        finally:
+            self._release_pool(pool)
+        return results
+
+    async def assess_async(self, holders: List[FRAHolder], schemes: Optional[Collection[SchemeType]] = None) -> List[List[SchemeEligibility]]:
+        """Assess holders without blocking the event loop: inline batches in a thread, sharded ones in the pool"""
+        if self.is_inline(holders):
+            return await run_in_threadpool(self.assess, holders, schemes)
+
+        loop = asyncio.get_running_loop()
+        pool = self._acquire_pool()
+        try:
+            shard_results = await asyncio.gather(
+                *(loop.run_in_executor(pool, _assess_shard, shard, schemes) for shard in self.shards(holders))
+            )
+        finally:
+            self._release_pool(pool)
+
+        results: List[List[SchemeEligibility]] = []
+        for shard_result in shard_results:
+            results.extend(shard_result)
+        logger.info(f"Sharded eligibility assessment: {len(holders)} holders in {len(shard_results)} shards")
+        return results
+
+# Shared executor used by the bulk eligibility endpoint
+bulk_eligibility_executor = ShardedEligibilityExecutor()
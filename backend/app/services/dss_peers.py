@@ -0,0 +1,290 @@
+"""
+Peer village search over DSS infrastructure indices
+
+"Villages most similar to this one" are nearest neighbours in the 8-dimensional
+space of the six infrastructure indices plus forest cover and agricultural land
+percentages, all on the same 0-100 scale, by Euclidean distance.
+
+Stored villages are indexed in bucketed KD-trees: points are split at the
+median of their widest dimension until leaves hold LEAF_SIZE villages, and only
+the leaves' bounding boxes are kept. A query ranks the leaves by the lower bound
+of their distance and scans them in that order until the bound exceeds the k-th
+best distance found, which visits a handful of leaves. One tree covers the
+country and one each state; a district's few hundred villages are scanned
+directly.
+
+The index follows the village profile store. Changed and new villages go to an
+append buffer that queries scan directly, while their previous rows are
+tombstoned; once the buffer or the tombstones grow past REBUILD_SHARE of the
+index, the next query compacts the rows and rebuilds the trees.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import threading
+
+import numpy as np
+
+from .dss_service import VillageProfile
+from .dss_village_store import VillageProfileStore, village_store
+
+logger = logging.getLogger(__name__)
+
+PEER_FEATURES: Tuple[str, ...] = (
+    "water_index",
+    "electricity_index",
+    "road_connectivity_index",
+    "health_facility_index",
+    "education_index",
+    "livelihood_index",
+    "forest_cover_percent",
+    "agricultural_land_percent",
+)
+
+SCOPES: Tuple[str, ...] = ("national", "state", "district")
+
+# Villages per KD-tree leaf
+LEAF_SIZE = 128
+# Coordinate of the points padding partial leaves, far from every real village
+PADDING = 1e9
+# Rebuild once buffered or tombstoned rows exceed this share of the indexed rows (and MIN_REBUILD_ROWS)
+REBUILD_SHARE = 0.05
+MIN_REBUILD_ROWS = 2048
+
+def _features(village: VillageProfile) -> List[float]:
+    return [float(getattr(village, feature)) for feature in PEER_FEATURES]
+
+def _merge(best: Tuple[np.ndarray, np.ndarray], distances: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep the k smallest squared distances of the current best and new candidates"""
+    distances = np.concatenate([best[0], distances])
+    rows = np.concatenate([best[1], rows])
+    if distances.shape[0] > k:
+        keep = np.argpartition(distances, k - 1)[:k]
+        distances, rows = distances[keep], rows[keep]
+    return distances, rows
+
+class KDTree:
+    """Bucketed KD-tree over a fixed set of points, keeping leaf bounding boxes only"""
+
+    def __init__(self, points: np.ndarray, rows: np.ndarray, leaf_size: int = LEAF_SIZE):
+        order = np.arange(points.shape[0])
+        leaves: List[Tuple[int, int]] = []
+        pending = [(0, points.shape[0])] if points.shape[0] else []
+        while pending:
+            start, end = pending.pop()
+            if end - start <= leaf_size:
+                leaves.append((start, end))
+                continue
+            segment = order[start:end]
+            values = points[segment]
+            dimension = int(np.argmax(values.max(axis=0) - values.min(axis=0)))
+            middle = (end - start) // 2
+            order[start:end] = segment[np.argpartition(values[:, dimension], middle)]
+            pending.append((start, start + middle))
+            pending.append((start + middle, end))
+
+        # Leaves are padded to leaf_size with distant points of row -1, so a batch of leaves is one gather
+        self.leaf_points = np.full((len(leaves), leaf_size, points.shape[1]), PADDING)
+        self.leaf_rows = np.full((len(leaves), leaf_size), -1, dtype=np.int64)
+        self.low = np.empty((len(leaves), points.shape[1]))
+        self.high = np.empty((len(leaves), points.shape[1]))
+        for leaf, (start, end) in enumerate(leaves):
+            members = order[start:end]
+            self.leaf_points[leaf, :end - start] = points[members]
+            self.leaf_rows[leaf, :end - start] = rows[members]
+            self.low[leaf] = points[members].min(axis=0)
+            self.high[leaf] = points[members].max(axis=0)
+        # Squared norms for distances as |p|^2 - 2 p.q + |q|^2, one matrix-vector product per batch
+        self.leaf_norms = np.einsum("ijk,ijk->ij", self.leaf_points, self.leaf_points)
+        self.size = int(points.shape[0])
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def leaves(self) -> int:
+        return int(self.leaf_rows.shape[0])
+
+    def query(
+        self,
+        point: np.ndarray,
+        k: int,
+        alive: Optional[np.ndarray],
+        best: Tuple[np.ndarray, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Merge the k nearest rows into best (squared distances, rows)
+
+        Rows where alive is False are skipped; pass None when every row is alive.
+        Distances are approximate to rounding; callers re-measure the final rows.
+        """
+        gaps = np.maximum(self.low - point, 0.0) + np.maximum(point - self.high, 0.0)
+        bounds = np.einsum("ij,ij->i", gaps, gaps)
+        order = np.argsort(bounds)
+        norm = float(point @ point)
+        kth = best[0].max() if best[0].shape[0] >= k else np.inf
+        position, batch = 0, 1
+        while position < order.shape[0] and bounds[order[position]] <= kth:
+            # Scan leaves in bound order, in doubling batches to amortize per-batch overhead
+            leaves = order[position:position + batch]
+            distances = (self.leaf_norms[leaves] - 2.0 * (self.leaf_points[leaves] @ point)).ravel() + norm
+            rows = self.leaf_rows[leaves].ravel()
+            if alive is not None:
+                distances[~alive[rows]] = np.inf
+            best = _merge(best, distances, rows, k)
+            if best[0].shape[0] >= k:
+                kth = best[0].max()
+            position += batch
+            batch *= 2
+        return best
+
+class VillagePeerIndex:
+    """k-nearest-neighbour index over stored villages' infrastructure indices"""
+
+    def __init__(self, store: Optional[VillageProfileStore] = village_store):
+        self._lock = threading.RLock()
+        self._reset(0)
+        if store is not None:
+            store.subscribe(self.on_change)
+
+    def _reset(self, capacity: int) -> None:
+        self._points = np.empty((capacity, len(PEER_FEATURES)), dtype=np.float64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._states = np.empty(capacity, dtype=np.int32)
+        self._districts = np.empty(capacity, dtype=np.int32)
+        self._profiles: List[VillageProfile] = []
+        self._rows: Dict[str, int] = {}
+        self._state_codes: Dict[str, int] = {}
+        self._district_codes: Dict[Tuple[str, str], int] = {}
+        self._tree = KDTree(self._points[:0], np.empty(0, dtype=np.int64))
+        self._state_trees: Dict[int, KDTree] = {}
+        self._built_rows = 0
+        self._dead_rows = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # Maintenance
+
+    def _append(self, village: VillageProfile) -> int:
+        row = len(self._profiles)
+        if row == self._points.shape[0]:
+            grow = max(1024, row)
+            self._points = np.concatenate([self._points, np.empty((grow, len(PEER_FEATURES)))])
+            self._alive = np.concatenate([self._alive, np.zeros(grow, dtype=bool)])
+            self._states = np.concatenate([self._states, np.empty(grow, dtype=np.int32)])
+            self._districts = np.concatenate([self._districts, np.empty(grow, dtype=np.int32)])
+        self._points[row] = _features(village)
+        self._alive[row] = True
+        self._states[row] = self._state_codes.setdefault(village.state, len(self._state_codes))
+        self._districts[row] = self._district_codes.setdefault((village.state, village.district), len(self._district_codes))
+        self._profiles.append(village)
+        self._rows[village.village_code] = row
+        return row
+
+    def _retire(self, village_code: str) -> Optional[int]:
+        row = self._rows.pop(village_code, None)
+        if row is not None:
+            self._alive[row] = False
+            self._dead_rows += 1
+        return row
+
+    def on_change(self, village_code: str, village: Optional[VillageProfile]) -> None:
+        """Apply a village store change: a new or updated profile, or None for a deletion"""
+        with self._lock:
+            row = self._rows.get(village_code)
+            if village is not None and row is not None:
+                previous = self._profiles[row]
+                if (previous.state, previous.district) == (village.state, village.district) and _features(previous) == _features(village):
+                    # Only descriptive fields changed; the row stays where it is
+                    self._profiles[row] = village
+                    return
+            self._retire(village_code)
+            if village is not None:
+                self._append(village)
+
+    def rebuild(self) -> None:
+        """Compact away tombstoned rows and rebuild the national and per-state trees"""
+        with self._lock:
+            keep = np.flatnonzero(self._alive[:len(self._profiles)])
+            points, states, districts = self._points[keep], self._states[keep], self._districts[keep]
+            profiles = [self._profiles[row] for row in keep.tolist()]
+            state_codes, district_codes = self._state_codes, self._district_codes
+
+            self._reset(keep.shape[0])
+            self._points[:] = points
+            self._alive[:] = True
+            self._states[:] = states
+            self._districts[:] = districts
+            self._profiles = profiles
+            self._rows = {profile.village_code: row for row, profile in enumerate(profiles)}
+            self._state_codes, self._district_codes = state_codes, district_codes
+
+            rows = np.arange(keep.shape[0])
+            self._tree = KDTree(points, rows)
+            for state in np.unique(states).tolist():
+                members = rows[states == state]
+                self._state_trees[state] = KDTree(points[members], members)
+            self._built_rows = keep.shape[0]
+        logger.info(f"Rebuilt village peer index over {self._built_rows} villages")
+
+    def _rebuild_if_needed(self) -> None:
+        changed = max(len(self._profiles) - self._built_rows, self._dead_rows)
+        if changed > max(MIN_REBUILD_ROWS, REBUILD_SHARE * self._built_rows):
+            self.rebuild()
+
+    # Queries
+
+    def nearest(self, village_code: str, k: int = 10, scope: str = "national") -> List[Tuple[VillageProfile, float]]:
+        """
+        The k stored villages closest to a stored village, nearest first
+
+        scope 'state' or 'district' restricts peers to the village's own state
+        or district. Raises KeyError for villages not in the index.
+        """
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope '{scope}'; use one of {', '.join(SCOPES)}")
+        if k < 1:
+            return []
+        with self._lock:
+            self._rebuild_if_needed()
+            row = self._rows[village_code]
+            point = self._points[row]
+            # One extra neighbour, as the village itself is among its nearest
+            want = k + 1
+            best = (np.empty(0), np.empty(0, dtype=np.int64))
+
+            if scope == "district":
+                candidates = np.flatnonzero(self._districts[:len(self._profiles)] == self._districts[row])
+            else:
+                tree = self._tree if scope == "national" else self._state_trees.get(int(self._states[row]))
+                if tree is not None:
+                    best = tree.query(point, want, self._alive if self._dead_rows else None, best)
+                candidates = np.arange(self._built_rows, len(self._profiles))
+                if scope == "state":
+                    candidates = candidates[self._states[candidates] == self._states[row]]
+
+            if candidates.shape[0]:
+                offsets = self._points[candidates] - point
+                distances = np.einsum("ij,ij->i", offsets, offsets)
+                distances[~self._alive[candidates]] = np.inf
+                best = _merge(best, distances, candidates, want)
+
+            peers = best[1][(best[1] >= 0) & (best[1] != row) & np.isfinite(best[0])]
+            distances = np.sqrt(((self._points[peers] - point) ** 2).sum(axis=1))
+            order = np.argsort(distances, kind="stable")[:k]
+            return [(self._profiles[peer], distance) for peer, distance in zip(peers[order].tolist(), distances[order].tolist())]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "villages": len(self),
+                "indexed_rows": self._built_rows,
+                "buffered_rows": len(self._profiles) - self._built_rows,
+                "tombstoned_rows": self._dead_rows,
+                "tree_leaves": self._tree.leaves,
+                "state_trees": len(self._state_trees)
+            }
+
+# Shared peer index following the village profile store served by the DSS routes
+village_peer_index = VillagePeerIndex(village_store)
@@ -0,0 +1,310 @@
+"""
+Rule-change impact analysis over stored FRA holders
+
+Scheme thresholds (PM-KISAN max_annual_income and min_land_area, MGNREGA
+min_age, Ayushman Bharat max_annual_income) each compare one holder attribute
+against a number. Moving a threshold from a to b can only change the outcome
+for holders whose attribute lies between a and b, so the holders stored through
+the DSS routes are kept in sorted per-attribute indexes (annual income, land
+area, age). A rule diff becomes one range query per changed threshold, and only
+the holders in those ranges are re-assessed under the current and the proposed
+rules; work is proportional to the number of candidates, not the population.
+
+Diffs of parameters that are not thresholds on an indexed attribute (excluded
+occupations, benefit amounts) are rejected; compare those with the scenario
+sweeps in dss_scenarios instead.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from collections import Counter
+from dataclasses import dataclass, field
+import logging
+import threading
+
+import numpy as np
+
+from .dss_columnar import STATUS_CODES, HolderColumns, evaluate_eligibility_columns
+from .dss_scenarios import apply_overrides
+from .dss_service import DSSEngine, EligibilityStatus, FRAHolder, SchemeType, dss_engine
+
+logger = logging.getLogger(__name__)
+
+INDEXED_ATTRIBUTES: Tuple[str, ...] = ("annual_income", "land_area_hectares", "age")
+
+# Batches larger than this share of the index are applied by re-sorting instead of positional inserts
+RESORT_SHARE = 1 / 128
+
+@dataclass(frozen=True)
+class ThresholdRule:
+    """A numeric scheme rule parameter compared against one holder attribute"""
+    attribute: str
+    operator: str  # The rule's condition is `attribute <operator> threshold`
+    default: float
+
+    @property
+    def side(self) -> str:
+        """searchsorted side bounding the values whose condition differs between two thresholds"""
+        # '>' and '<=' differ on (low, high]; '>=' and '<' on [low, high)
+        return "right" if self.operator in (">", "<=") else "left"
+
+THRESHOLD_RULES: Dict[Tuple[SchemeType, str], ThresholdRule] = {
+    (SchemeType.PM_KISAN, "max_annual_income"): ThresholdRule("annual_income", ">", 200000),
+    (SchemeType.PM_KISAN, "min_land_area"): ThresholdRule("land_area_hectares", "<", 0.01),
+    (SchemeType.MGNREGA, "min_age"): ThresholdRule("age", ">=", 18),
+    (SchemeType.AYUSHMAN_BHARAT, "max_annual_income"): ThresholdRule("annual_income", "<", 250000),
+}
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _attribute_values(holders: Sequence[FRAHolder], attribute: str) -> np.ndarray:
+    """One attribute of each holder as float64, with None as NaN"""
+    return np.array([getattr(holder, attribute) for holder in holders], dtype=np.float64)
+
+class SortedColumn:
+    """One attribute's (value, row) pairs in ascending order; missing values (NaN) sort last"""
+
+    def __init__(self):
+        self.values = np.empty(0, dtype=np.float64)
+        self.rows = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return int(self.rows.shape[0])
+
+    def _positions(self, values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Positions of (value, row) pairs in (value, row) order"""
+        left = np.searchsorted(self.values, values, "left").tolist()
+        right = np.searchsorted(self.values, values, "right").tolist()
+        return np.fromiter(
+            (start + int(np.searchsorted(self.rows[start:end], row)) for start, end, row in zip(left, right, rows.tolist())),
+            dtype=np.int64,
+            count=len(left)
+        )
+
+    def update(self, removed: Tuple[np.ndarray, np.ndarray], added: Tuple[np.ndarray, np.ndarray]) -> None:
+        """Remove and then add (values, rows) pairs; removed pairs must be present"""
+        removed_values, removed_rows = removed
+        added_values, added_rows = added
+        if removed_rows.shape[0] + added_rows.shape[0] > len(self) * RESORT_SHARE:
+            keep = ~np.isin(self.rows, removed_rows)
+            values = np.concatenate([self.values[keep], added_values])
+            rows = np.concatenate([self.rows[keep], added_rows])
+            order = np.lexsort((rows, values))
+            self.values, self.rows = values[order], rows[order]
+            return
+
+        if removed_rows.shape[0]:
+            positions = self._positions(removed_values, removed_rows)
+            self.values = np.delete(self.values, positions)
+            self.rows = np.delete(self.rows, positions)
+        if added_rows.shape[0]:
+            order = np.lexsort((added_rows, added_values))
+            added_values, added_rows = added_values[order], added_rows[order]
+            positions = self._positions(added_values, added_rows)
+            self.values = np.insert(self.values, positions, added_values)
+            self.rows = np.insert(self.rows, positions, added_rows)
+
+    def between(self, low: float, high: float, side: str) -> np.ndarray:
+        """Rows with values in [low, high) (side 'left') or (low, high] (side 'right')"""
+        start, end = np.searchsorted(self.values, [low, high], side)
+        return self.rows[start:end]
+
+@dataclass
+class ThresholdChange:
+    """One changed threshold of a rule diff and the holders its range selected"""
+    scheme: SchemeType
+    parameter: str
+    attribute: str
+    before: float
+    after: float
+    candidates: int
+
+@dataclass
+class StatusChange:
+    """A holder whose status for a scheme differs under the proposed rules"""
+    holder_id: str
+    scheme: SchemeType
+    before: EligibilityStatus
+    after: EligibilityStatus
+
+@dataclass
+class RuleImpact:
+    """Holders whose eligibility a rule diff changes"""
+    rules_version: str
+    holders_indexed: int
+    thresholds: List[ThresholdChange] = field(default_factory=list)
+    holders_examined: int = 0
+    changes: List[StatusChange] = field(default_factory=list)
+
+    def transitions(self) -> Dict[str, Dict[str, int]]:
+        """Changed holders per scheme and 'BEFORE -> AFTER' status transition"""
+        counts = Counter((change.scheme.value, f"{change.before.value} -> {change.after.value}") for change in self.changes)
+        transitions: Dict[str, Dict[str, int]] = {}
+        for (scheme, transition), count in sorted(counts.items()):
+            transitions.setdefault(scheme, {})[transition] = count
+        return transitions
+
+    def to_dict(self, max_listed: Optional[int] = None) -> Dict[str, Any]:
+        listed = self.changes if max_listed is None else self.changes[:max_listed]
+        return {
+            "rules_version": self.rules_version,
+            "holders_indexed": self.holders_indexed,
+            "holders_examined": self.holders_examined,
+            "holders_changed": len({change.holder_id for change in self.changes}),
+            "thresholds": [
+                {
+                    "scheme": threshold.scheme.value,
+                    "parameter": threshold.parameter,
+                    "attribute": threshold.attribute,
+                    "before": threshold.before,
+                    "after": threshold.after,
+                    "candidates": threshold.candidates
+                }
+                for threshold in self.thresholds
+            ],
+            "transitions": self.transitions(),
+            "changes": [
+                {"holder_id": change.holder_id, "scheme": change.scheme.value, "before": change.before.value, "after": change.after.value}
+                for change in listed
+            ],
+            "listed": len(listed)
+        }
+
+class HolderAttributeIndex:
+    """Sorted income, land area and age indexes over stored holders, maintained under upserts and deletes"""
+
+    def __init__(self, engine: DSSEngine = dss_engine):
+        self.engine = engine
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._holders: List[Optional[FRAHolder]] = []
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._columns: Dict[str, SortedColumn] = {attribute: SortedColumn() for attribute in INDEXED_ATTRIBUTES}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, holder_id: str) -> bool:
+        return holder_id in self._rows
+
+    def _replace(self, rows: List[int], previous: List[Optional[FRAHolder]], current: List[Optional[FRAHolder]]) -> None:
+        """Swap rows' entries in every attribute index from their previous to their current holders"""
+        removed = [(row, holder) for row, holder in zip(rows, previous) if holder is not None]
+        added = [(row, holder) for row, holder in zip(rows, current) if holder is not None]
+        removed_rows = np.array([row for row, _ in removed], dtype=np.int64)
+        added_rows = np.array([row for row, _ in added], dtype=np.int64)
+        removed_holders = [holder for _, holder in removed]
+        added_holders = [holder for _, holder in added]
+        for attribute, column in self._columns.items():
+            column.update(
+                (_attribute_values(removed_holders, attribute), removed_rows),
+                (_attribute_values(added_holders, attribute), added_rows)
+            )
+
+    def upsert_many(self, holders: Sequence[FRAHolder]) -> None:
+        """Index holders, replacing earlier versions with the same holder_id"""
+        # With duplicate holders in one batch the last occurrence wins
+        latest = {holder.holder_id: holder for holder in holders}
+        with self._lock:
+            rows, previous = [], []
+            for holder_id, holder in latest.items():
+                row = self._rows.get(holder_id)
+                if row is None:
+                    row = self._free.pop() if self._free else len(self._holders)
+                    if row == len(self._holders):
+                        self._holders.append(None)
+                    self._rows[holder_id] = row
+                rows.append(row)
+                previous.append(self._holders[row])
+                self._holders[row] = holder
+            self._replace(rows, previous, list(latest.values()))
+
+    def upsert(self, holder: FRAHolder) -> None:
+        self.upsert_many([holder])
+
+    def delete_many(self, holder_ids: Sequence[str]) -> int:
+        """Drop holders from every attribute index; returns how many were indexed"""
+        with self._lock:
+            rows = sorted({self._rows.pop(holder_id) for holder_id in holder_ids if holder_id in self._rows})
+            previous = [self._holders[row] for row in rows]
+            for row in rows:
+                self._holders[row] = None
+                self._free.append(row)
+            self._replace(rows, previous, [None] * len(rows))
+            return len(rows)
+
+    def delete(self, holder_id: str) -> bool:
+        return self.delete_many([holder_id]) == 1
+
+    def rebuild(self, holders: Sequence[FRAHolder]) -> None:
+        """Replace the index with the given holders"""
+        latest = {holder.holder_id: holder for holder in holders}
+        with self._lock:
+            self._reset()
+            self._holders = list(latest.values())
+            self._rows = {holder_id: row for row, holder_id in enumerate(latest)}
+            self._replace(list(range(len(self._holders))), [None] * len(self._holders), self._holders)
+
+    def between(self, attribute: str, low: float, high: float, side: str = "left") -> List[FRAHolder]:
+        """Indexed holders whose attribute lies in [low, high) (side 'left') or (low, high] (side 'right')"""
+        with self._lock:
+            return [self._holders[row] for row in self._columns[attribute].between(low, high, side).tolist()]
+
+    def impact(self, overrides: Dict[SchemeType, Dict[str, Any]]) -> RuleImpact:
+        """
+        Holders whose status changes if the scheme rules are overridden
+
+        Only changed threshold parameters are considered; each selects the
+        holders between its current and proposed value, and those holders are
+        re-assessed for that scheme under both rule sets.
+        """
+        base_rules = self.engine.scheme_rules
+        proposed_rules = apply_overrides(base_rules, overrides, "schemes")
+        result = RuleImpact(rules_version=self.engine.scheme_rules_version(), holders_indexed=len(self))
+
+        candidates: Dict[SchemeType, Dict[int, FRAHolder]] = {}
+        with self._lock:
+            for scheme, parameters in overrides.items():
+                for parameter, proposed in parameters.items():
+                    threshold = THRESHOLD_RULES.get((scheme, parameter))
+                    if threshold is None:
+                        raise ValueError(
+                            f"{scheme.value}.{parameter} is not a threshold on an indexed holder attribute "
+                            f"({', '.join(INDEXED_ATTRIBUTES)}); compare it with a scenario instead"
+                        )
+                    if not _is_number(proposed):
+                        raise ValueError(f"{scheme.value}.{parameter} must be a number")
+                    current = base_rules.get(scheme, {}).get(parameter, threshold.default)
+                    if proposed == current:
+                        continue
+                    rows = self._columns[threshold.attribute].between(min(current, proposed), max(current, proposed), threshold.side)
+                    selected = candidates.setdefault(scheme, {})
+                    for row in rows.tolist():
+                        selected[row] = self._holders[row]
+                    result.thresholds.append(ThresholdChange(scheme, parameter, threshold.attribute, current, proposed, int(rows.shape[0])))
+
+        for scheme, selected in candidates.items():
+            rows = sorted(selected)
+            holders = [selected[row] for row in rows]
+            if not holders:
+                continue
+            columns = HolderColumns.from_holders(holders)
+            before = evaluate_eligibility_columns(columns, base_rules, [scheme]).status[0]
+            after = evaluate_eligibility_columns(columns, proposed_rules, [scheme]).status[0]
+            result.holders_examined += len(holders)
+            for position in np.flatnonzero(before != after).tolist():
+                result.changes.append(StatusChange(
+                    holder_id=holders[position].holder_id,
+                    scheme=scheme,
+                    before=STATUS_CODES[before[position]],
+                    after=STATUS_CODES[after[position]]
+                ))
+
+        logger.info(f"Rule diff over {len(result.thresholds)} thresholds examined {result.holders_examined} of {result.holders_indexed} holders, {len(result.changes)} status changes")
+        return result
+
+# Shared attribute index over the holders stored through the DSS routes
+holder_attribute_index = HolderAttributeIndex(dss_engine)
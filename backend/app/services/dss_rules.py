@@ -0,0 +1,346 @@
+"""
+Trigger condition compiler for DSS intervention rules
+
+Trigger expressions in DSSEngine.intervention_rules such as "water_index < 40" or
+"road_connectivity_index < 30 and (health_facility_index < 40 or st_population > 500)"
+are parsed once into predicate objects. A compiled predicate evaluates a single
+VillageProfile or, vectorized, a mapping of field name to NumPy column.
+
+Grammar:
+    expression := and_expr ("or" and_expr)*
+    and_expr   := not_expr ("and" not_expr)*
+    not_expr   := "not" not_expr | "(" expression ")" | comparison
+    comparison := operand ("<" | "<=" | ">" | ">=" | "==" | "!=") operand
+    operand    := VillageProfile field | number | quoted string
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union, get_args, get_origin, get_type_hints
+from functools import lru_cache, reduce
+import operator
+import re
+import numpy as np
+
+if TYPE_CHECKING:
+    # dss_service compiles its rules with this module, so VillageProfile is only imported lazily at runtime
+    from .dss_service import VillageProfile
+
+@lru_cache(maxsize=None)
+def village_field_types() -> Dict[str, type]:
+    """Value type (float, int or str, Optional unwrapped) of every VillageProfile field"""
+    from .dss_service import VillageProfile
+
+    field_types = {}
+    for name, hint in get_type_hints(VillageProfile).items():
+        if get_origin(hint) is Union:
+            hint = next(arg for arg in get_args(hint) if arg is not type(None))
+        field_types[name] = hint
+    return field_types
+
+# Fields on a 0-100 scale; a satisfied comparison on one of them contributes an
+# impact factor of (100 - value) / 100 to the intervention priority score
+SCALED_VILLAGE_FIELDS: Set[str] = {
+    "water_index",
+    "electricity_index",
+    "road_connectivity_index",
+    "health_facility_index",
+    "education_index",
+    "livelihood_index",
+    "forest_cover_percent",
+    "agricultural_land_percent"
+}
+
+COMPARISON_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne
+}
+
+# Operator to use when the literal is on the left-hand side ("40 > water_index")
+MIRRORED_OPERATORS = {"<": ">", "<=": ">=", ">": "<", ">=": "<=", "==": "==", "!=": "!="}
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<number>-?\d+(?:\.\d+)?)|(?P<string>'[^']*'|\"[^\"]*\")|(?P<op><=|>=|==|!=|<|>)"
+    r"|(?P<paren>[()])|(?P<name>[A-Za-z_][A-Za-z0-9_]*))"
+)
+
+class RuleSyntaxError(ValueError):
+    """Raised when a trigger expression cannot be compiled"""
+
+class Predicate:
+    """Compiled trigger condition"""
+
+    def evaluate(self, village: "VillageProfile") -> bool:
+        raise NotImplementedError
+
+    def evaluate_columns(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        raise NotImplementedError
+
+    def collect_impacts(self, village: "VillageProfile", impact_factors: List[float]) -> None:
+        """Append impact factors of the satisfied comparisons"""
+        raise NotImplementedError
+
+    def impact_columns(self, columns: Mapping[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-row sum and count of impact factors of the satisfied comparisons"""
+        raise NotImplementedError
+
+    def fields(self) -> Set[str]:
+        raise NotImplementedError
+
+class Comparison(Predicate):
+    """field <op> literal"""
+
+    def __init__(self, field: str, op: str, value: Any):
+        self.field = field
+        self.op = op
+        self.value = value
+        self._compare = COMPARISON_OPERATORS[op]
+        self._scaled = field in SCALED_VILLAGE_FIELDS
+
+    def evaluate(self, village: "VillageProfile") -> bool:
+        value = getattr(village, self.field)
+        return value is not None and bool(self._compare(value, self.value))
+
+    def evaluate_columns(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        return np.asarray(self._compare(columns[self.field], self.value), dtype=bool)
+
+    def collect_impacts(self, village: "VillageProfile", impact_factors: List[float]) -> None:
+        if self._scaled and self.evaluate(village):
+            impact_factors.append((100 - getattr(village, self.field)) / 100)
+
+    def impact_columns(self, columns: Mapping[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        satisfied = self.evaluate_columns(columns)
+        if not self._scaled:
+            zeros = np.zeros(satisfied.shape)
+            return zeros, zeros
+        return np.where(satisfied, (100 - columns[self.field]) / 100, 0.0), satisfied.astype(np.float64)
+
+    def fields(self) -> Set[str]:
+        return {self.field}
+
+    def __repr__(self) -> str:
+        return f"{self.field} {self.op} {self.value!r}"
+
+class AllOf(Predicate):
+    """Conjunction of predicates"""
+
+    def __init__(self, children: Sequence[Predicate]):
+        self.children = list(children)
+
+    def evaluate(self, village: "VillageProfile") -> bool:
+        return all(child.evaluate(village) for child in self.children)
+
+    def evaluate_columns(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        # reduce() rather than np.logical_and.reduce so (variants, rows) and (rows,) results broadcast
+        return reduce(np.logical_and, (child.evaluate_columns(columns) for child in self.children))
+
+    def collect_impacts(self, village: "VillageProfile", impact_factors: List[float]) -> None:
+        for child in self.children:
+            child.collect_impacts(village, impact_factors)
+
+    def impact_columns(self, columns: Mapping[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        sums, counts = zip(*(child.impact_columns(columns) for child in self.children))
+        return reduce(np.add, sums), reduce(np.add, counts)
+
+    def fields(self) -> Set[str]:
+        return set().union(*(child.fields() for child in self.children))
+
+    def __repr__(self) -> str:
+        return "(" + " and ".join(repr(child) for child in self.children) + ")"
+
+class AnyOf(AllOf):
+    """Disjunction of predicates"""
+
+    def evaluate(self, village: "VillageProfile") -> bool:
+        return any(child.evaluate(village) for child in self.children)
+
+    def evaluate_columns(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        return reduce(np.logical_or, (child.evaluate_columns(columns) for child in self.children))
+
+    def __repr__(self) -> str:
+        return "(" + " or ".join(repr(child) for child in self.children) + ")"
+
+class Not(Predicate):
+    """Negated predicate; contributes no impact factors"""
+
+    def __init__(self, child: Predicate):
+        self.child = child
+
+    def evaluate(self, village: "VillageProfile") -> bool:
+        return not self.child.evaluate(village)
+
+    def evaluate_columns(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        return ~self.child.evaluate_columns(columns)
+
+    def collect_impacts(self, village: "VillageProfile", impact_factors: List[float]) -> None:
+        return None
+
+    def impact_columns(self, columns: Mapping[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        zeros = np.zeros(self.child.evaluate_columns(columns).shape)
+        return zeros, zeros
+
+    def fields(self) -> Set[str]:
+        return self.child.fields()
+
+    def __repr__(self) -> str:
+        return f"not {self.child!r}"
+
+class _Parser:
+    """Recursive-descent parser over the token list of one expression"""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = self._tokenize(expression)
+        self.position = 0
+
+    def _tokenize(self, expression: str) -> List[Tuple[str, str]]:
+        tokens = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _TOKEN_PATTERN.match(expression, position)
+            if not match or match.end() == position:
+                raise RuleSyntaxError(f"Unexpected character at position {position} in '{expression}'")
+            kind = match.lastgroup
+            text = match.group(kind)
+            if kind == "name" and text.lower() in ("and", "or", "not"):
+                kind, text = "keyword", text.lower()
+            tokens.append((kind, text))
+            position = match.end()
+        return tokens
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _take(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise RuleSyntaxError(f"Unexpected end of expression '{self.expression}'")
+        self.position += 1
+        return token
+
+    def parse(self) -> Predicate:
+        predicate = self._parse_or()
+        if self._peek() is not None:
+            raise RuleSyntaxError(f"Unexpected token '{self._peek()[1]}' in '{self.expression}'")
+        return predicate
+
+    def _parse_or(self) -> Predicate:
+        children = [self._parse_and()]
+        while self._peek() == ("keyword", "or"):
+            self._take()
+            children.append(self._parse_and())
+        return children[0] if len(children) == 1 else AnyOf(children)
+
+    def _parse_and(self) -> Predicate:
+        children = [self._parse_not()]
+        while self._peek() == ("keyword", "and"):
+            self._take()
+            children.append(self._parse_not())
+        return children[0] if len(children) == 1 else AllOf(children)
+
+    def _parse_not(self) -> Predicate:
+        token = self._peek()
+        if token == ("keyword", "not"):
+            self._take()
+            return Not(self._parse_not())
+        if token == ("paren", "("):
+            self._take()
+            predicate = self._parse_or()
+            if self._take() != ("paren", ")"):
+                raise RuleSyntaxError(f"Missing ')' in '{self.expression}'")
+            return predicate
+        return self._parse_comparison()
+
+    def _parse_operand(self) -> Tuple[str, Any]:
+        kind, text = self._take()
+        if kind == "number":
+            return "literal", float(text)
+        if kind == "string":
+            return "literal", text[1:-1]
+        if kind == "name":
+            if text not in village_field_types():
+                raise RuleSyntaxError(f"Unknown VillageProfile field '{text}' in '{self.expression}'")
+            return "field", text
+        raise RuleSyntaxError(f"Expected a field or value, got '{text}' in '{self.expression}'")
+
+    def _parse_comparison(self) -> Predicate:
+        left_kind, left = self._parse_operand()
+        kind, op = self._take()
+        if kind != "op":
+            raise RuleSyntaxError(f"Expected a comparison operator, got '{op}' in '{self.expression}'")
+        right_kind, right = self._parse_operand()
+
+        if left_kind == "field" and right_kind == "literal":
+            self._check_literal(left, right)
+            return Comparison(left, op, right)
+        if left_kind == "literal" and right_kind == "field":
+            self._check_literal(right, left)
+            return Comparison(right, MIRRORED_OPERATORS[op], left)
+        raise RuleSyntaxError(f"Comparison must be between a field and a value in '{self.expression}'")
+
+    def _check_literal(self, field: str, value: Any) -> None:
+        """Reject a number compared with a text field or a string compared with a numeric one"""
+        is_text_field = village_field_types()[field] is str
+        if is_text_field != isinstance(value, str):
+            expected = "a quoted string" if is_text_field else "a number"
+            raise RuleSyntaxError(f"Field '{field}' must be compared with {expected}, got {value!r} in '{self.expression}'")
+
+def compile_expression(expression: str) -> Predicate:
+    """Compile one trigger expression into a predicate"""
+    return _Parser(expression).parse()
+
+def compile_trigger_conditions(conditions: Sequence[str]) -> Optional[Predicate]:
+    """Compile a rule's trigger_conditions list; the conditions are alternatives (OR)"""
+    predicates = [compile_expression(condition) for condition in conditions]
+    if not predicates:
+        return None
+    return predicates[0] if len(predicates) == 1 else AnyOf(predicates)
+
+def compile_intervention_triggers(intervention_rules: Dict[str, Dict]) -> Dict[str, Optional[Predicate]]:
+    """Compile the trigger conditions of every intervention rule"""
+    return {
+        intervention_type: compile_trigger_conditions(rules.get("trigger_conditions", []))
+        for intervention_type, rules in intervention_rules.items()
+    }
+
+def stack_predicates(predicates: Sequence[Optional[Predicate]]) -> Optional[Predicate]:
+    """
+    Merge structurally identical predicates that differ only in their literals
+
+    The merged predicate compares each field against a (variants, 1) array of
+    literals, so evaluate_columns/impact_columns return (variants, rows) results
+    in one pass. Returns None when the predicates differ in structure (fields,
+    operators or nesting) and must be evaluated one by one.
+    """
+    if not predicates or any(predicate is None for predicate in predicates):
+        return None
+    first = predicates[0]
+    if any(type(predicate) is not type(first) for predicate in predicates):
+        return None
+
+    if isinstance(first, Comparison):
+        if any(p.field != first.field or p.op != first.op for p in predicates):
+            return None
+        values = [p.value for p in predicates]
+        if all(value == values[0] for value in values):
+            return Comparison(first.field, first.op, values[0])
+        if any(isinstance(value, str) != isinstance(values[0], str) for value in values):
+            return None
+        return Comparison(first.field, first.op, np.array(values).reshape(-1, 1))
+
+    if isinstance(first, Not):
+        child = stack_predicates([p.child for p in predicates])
+        return None if child is None else Not(child)
+
+    if isinstance(first, AllOf):
+        if any(len(p.children) != len(first.children) for p in predicates):
+            return None
+        children = [stack_predicates(group) for group in zip(*(p.children for p in predicates))]
+        if any(child is None for child in children):
+            return None
+        return type(first)(children)
+
+    return None
@@ -0,0 +1,248 @@
+"""
+What-if scenario sweeps over DSS rule parameters
+
+Planners compare variants of the engine's scheme_rules and intervention_rules
+("PM-KISAN max_annual_income = 250000", "water trigger water_index < 60")
+against one loaded population. Instead of re-running the engine per variant,
+the variants' parameters are stacked into (variants, 1) arrays and evaluated
+against the columnar holder and village tables in one broadcast pass, giving
+(variants, records) matrices that are reduced to per-variant eligibility counts,
+benefit totals and intervention costs.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+import logging
+import numpy as np
+
+from .dss_service import SchemeType, EligibilityStatus, FUNDED_PRIORITIES
+from .dss_columnar import (
+    ELIGIBLE,
+    PRIORITY_CODES,
+    PRIORITY_INDEX,
+    STATUS_CODES,
+    HolderColumns,
+    RuleVariants,
+    VillageColumns,
+    columnar_rule,
+    priority_codes,
+    st_population_factor
+)
+from .dss_rules import compile_trigger_conditions, stack_predicates
+
+logger = logging.getLogger(__name__)
+
+BASELINE_NAME = "baseline"
+
+_MISSING = object()
+
+@dataclass
+class ScenarioVariant:
+    """A named set of overrides on top of the engine's scheme and intervention rules"""
+    name: str
+    scheme_rules: Dict[SchemeType, Dict[str, Any]] = field(default_factory=dict)
+    intervention_rules: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+def apply_overrides(base_rules: Dict[Any, Dict], overrides: Dict[Any, Dict], kind: str) -> Dict[Any, Dict]:
+    """Base rules with a variant's per-key parameter overrides merged in"""
+    unknown = [key for key in overrides if key not in base_rules]
+    if unknown:
+        raise ValueError(f"Unknown {kind} in scenario overrides: {', '.join(str(key) for key in unknown)}")
+    return {key: {**rules, **overrides.get(key, {})} for key, rules in base_rules.items()}
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def stack_rule_parameters(variant_rules: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge one scheme's rules across variants into a single rule dict
+
+    Parameters equal in every variant stay scalars, differing numeric parameters
+    become (variants, 1) arrays and other differing parameters RuleVariants, so
+    the columnar rules broadcast their results to (variants, holders).
+    """
+    stacked: Dict[str, Any] = {}
+    for name in {name for rules in variant_rules for name in rules}:
+        values = [rules.get(name, _MISSING) for rules in variant_rules]
+        if any(value is _MISSING for value in values):
+            raise ValueError(f"Rule parameter '{name}' must be set in the base rules or in every variant")
+        if all(value == values[0] for value in values):
+            stacked[name] = values[0]
+        elif all(_is_number(value) for value in values):
+            stacked[name] = np.array(values, dtype=np.float64).reshape(-1, 1)
+        else:
+            stacked[name] = RuleVariants(values)
+    return stacked
+
+def _per_variant_counts(codes: np.ndarray, mask: Optional[np.ndarray], code_count: int) -> np.ndarray:
+    """(variants, code_count) histogram of a (variants, records) code matrix"""
+    variants = codes.shape[0]
+    offsets = codes.astype(np.int64) + np.arange(variants)[:, None] * code_count
+    if mask is not None:
+        offsets = offsets[mask]
+    return np.bincount(offsets.ravel(), minlength=variants * code_count).reshape(variants, code_count)
+
+def evaluate_eligibility_variants(
+    columns: HolderColumns,
+    scheme_rules_variants: Sequence[Dict[SchemeType, Dict]],
+    schemes: Optional[Sequence[SchemeType]] = None
+) -> Tuple[List[SchemeType], np.ndarray, np.ndarray]:
+    """
+    Evaluate every variant's scheme rules over a holder table
+
+    Returns the schemes, status counts of shape (variants, schemes, statuses) and
+    eligible amount totals of shape (variants, schemes).
+    """
+    schemes = list(schemes) if schemes is not None else list(SchemeType)
+    variant_count = len(scheme_rules_variants)
+    shape = (variant_count, len(columns))
+
+    counts = np.zeros((variant_count, len(schemes), len(STATUS_CODES)), dtype=np.int64)
+    amounts = np.zeros((variant_count, len(schemes)), dtype=np.float64)
+
+    for row, scheme in enumerate(schemes):
+        rule = columnar_rule(scheme)
+        rules = stack_rule_parameters([variant.get(scheme, {}) for variant in scheme_rules_variants])
+        status, _, amount, _ = rule(columns, rules)
+        status = np.broadcast_to(status, shape)
+        counts[:, row] = _per_variant_counts(status, None, len(STATUS_CODES))
+        amounts[:, row] = np.where(status == ELIGIBLE, np.nan_to_num(amount), 0.0).sum(axis=1)
+
+    return schemes, counts, amounts
+
+def evaluate_intervention_variants(
+    columns: VillageColumns,
+    intervention_rules_variants: Sequence[Dict[str, Dict]]
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Evaluate every variant's intervention triggers over a village table
+
+    Triggers that differ only in their thresholds are stacked and evaluated once;
+    structurally different triggers are evaluated per variant. Returns, per
+    intervention type, per-variant arrays of triggered/funded village counts,
+    priority counts, costs and beneficiaries.
+    """
+    variant_count = len(intervention_rules_variants)
+    shape = (variant_count, len(columns))
+    st_factor = st_population_factor(columns)
+    beneficiaries = np.minimum(columns.st_households, columns.total_households)
+    funded_codes = [PRIORITY_INDEX[priority] for priority in FUNDED_PRIORITIES]
+
+    results: Dict[str, Dict[str, np.ndarray]] = {}
+    for intervention_type in intervention_rules_variants[0]:
+        variant_rules = [rules[intervention_type] for rules in intervention_rules_variants]
+        triggers = [compile_trigger_conditions(rules.get("trigger_conditions", [])) for rules in variant_rules]
+
+        stacked = stack_predicates(triggers)
+        if stacked is not None:
+            triggered = np.broadcast_to(stacked.evaluate_columns(columns), shape)
+            impact_sum, impact_count = (np.broadcast_to(a, shape) for a in stacked.impact_columns(columns))
+        else:
+            triggered = np.zeros(shape, dtype=bool)
+            impact_sum = np.zeros(shape)
+            impact_count = np.zeros(shape)
+            for variant, trigger in enumerate(triggers):
+                if trigger is not None:
+                    triggered[variant] = trigger.evaluate_columns(columns)
+                    impact_sum[variant], impact_count[variant] = trigger.impact_columns(columns)
+
+        average_impact = np.divide(impact_sum, impact_count, out=np.full(shape, 0.5), where=impact_count > 0)
+        impact_score = np.where(triggered, average_impact * 0.6 + st_factor * 0.4, 0.0)
+        priority = priority_codes(impact_score)
+        funded = triggered & np.isin(priority, funded_codes)
+
+        cost = np.array([float(rules.get("average_cost_per_village", 500000)) for rules in variant_rules])
+        triggered_villages = triggered.sum(axis=1)
+        funded_villages = funded.sum(axis=1)
+        results[intervention_type] = {
+            "triggered_villages": triggered_villages,
+            "funded_villages": funded_villages,
+            "priority_counts": _per_variant_counts(priority, triggered, len(PRIORITY_CODES)),
+            "estimated_cost": triggered_villages * cost,
+            "funded_cost": funded_villages * cost,
+            "estimated_beneficiaries": np.where(triggered, beneficiaries, 0).sum(axis=1)
+        }
+
+    return results
+
+def run_scenarios(
+    engine,
+    holders: HolderColumns,
+    villages: VillageColumns,
+    variants: Sequence[ScenarioVariant],
+    include_baseline: bool = True,
+    schemes: Optional[Sequence[SchemeType]] = None
+) -> Dict[str, Any]:
+    """
+    Compare rule variants against one population
+
+    Each variant overrides parameters of the engine's current rules. With
+    include_baseline the engine's unmodified rules are reported first and every
+    variant carries its differences from the baseline.
+    """
+    variants = list(variants)
+    if include_baseline:
+        variants.insert(0, ScenarioVariant(name=BASELINE_NAME))
+    if not variants:
+        raise ValueError("At least one scenario variant is required")
+
+    scheme_rules_variants = [apply_overrides(engine.scheme_rules, v.scheme_rules, "scheme") for v in variants]
+    intervention_rules_variants = [
+        apply_overrides(engine.intervention_rules, v.intervention_rules, "intervention type") for v in variants
+    ]
+
+    schemes, status_counts, eligible_amounts = evaluate_eligibility_variants(holders, scheme_rules_variants, schemes)
+    interventions = evaluate_intervention_variants(villages, intervention_rules_variants)
+
+    eligible_code = STATUS_CODES.index(EligibilityStatus.ELIGIBLE)
+    reports = []
+    for index, variant in enumerate(variants):
+        intervention_report = {
+            intervention_type: {
+                "triggered_villages": int(metrics["triggered_villages"][index]),
+                "funded_villages": int(metrics["funded_villages"][index]),
+                "priority_counts": {
+                    priority.value: int(metrics["priority_counts"][index, code]) for code, priority in enumerate(PRIORITY_CODES)
+                },
+                "estimated_cost": float(metrics["estimated_cost"][index]),
+                "funded_cost": float(metrics["funded_cost"][index]),
+                "estimated_beneficiaries": int(metrics["estimated_beneficiaries"][index])
+            }
+            for intervention_type, metrics in interventions.items()
+        }
+        reports.append({
+            "name": variant.name,
+            "eligibility": {
+                scheme.value: {status.value: int(status_counts[index, row, code]) for code, status in enumerate(STATUS_CODES)}
+                for row, scheme in enumerate(schemes)
+            },
+            "eligible_holders": {scheme.value: int(status_counts[index, row, eligible_code]) for row, scheme in enumerate(schemes)},
+            "eligible_amount": {scheme.value: float(eligible_amounts[index, row]) for row, scheme in enumerate(schemes)},
+            "total_eligible_amount": float(eligible_amounts[index].sum()),
+            "interventions": intervention_report,
+            "total_intervention_cost": sum(m["estimated_cost"] for m in intervention_report.values()),
+            "funded_intervention_cost": sum(m["funded_cost"] for m in intervention_report.values())
+        })
+
+    if include_baseline:
+        baseline = reports[0]
+        for report in reports:
+            report["delta_vs_baseline"] = {
+                "eligible_holders": {
+                    scheme: count - baseline["eligible_holders"][scheme] for scheme, count in report["eligible_holders"].items()
+                },
+                "total_eligible_amount": report["total_eligible_amount"] - baseline["total_eligible_amount"],
+                "triggered_villages": {
+                    intervention_type: metrics["triggered_villages"] - baseline["interventions"][intervention_type]["triggered_villages"]
+                    for intervention_type, metrics in report["interventions"].items()
+                },
+                "total_intervention_cost": report["total_intervention_cost"] - baseline["total_intervention_cost"],
+                "funded_intervention_cost": report["funded_intervention_cost"] - baseline["funded_intervention_cost"]
+            }
+
+    logger.info(f"Evaluated {len(variants)} scenario variants over {len(holders)} holders and {len(villages)} villages")
+    return {
+        "total_fra_holders": len(holders),
+        "total_villages": len(villages),
+        "variants": reports
+    }
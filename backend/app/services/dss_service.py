@@ -7,9 +7,13 @@ This module implements a rule-based + AI-enhanced DSS engine that:
 3. Generates policy recommendations for decision-makers
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Collection, Dict, Iterable, List, Optional, Any, Tuple
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
+import hashlib
+import heapq
+import json
 import logging
 from datetime import datetime, date
 import numpy as np
@@ -37,7 +41,7 @@ class InterventionPriority(str, Enum):
     MEDIUM = "MEDIUM"     # Within 1 year
     LOW = "LOW"          # Within 2-3 years
 
-@dataclass
+@dataclass(slots=True)
 class FRAHolder:
     """FRA Patta Holder Information"""
     holder_id: str
@@ -60,7 +64,7 @@ class FRAHolder:
     water_source: str
     mobile_number: Optional[str]
     
-@dataclass 
+@dataclass(slots=True)
 class VillageProfile:
     """Village-level demographic and infrastructure data"""
     village_code: str
@@ -86,18 +90,19 @@ class VillageProfile:
     latitude: Optional[float]
     longitude: Optional[float]
     
-@dataclass
+@dataclass(slots=True)
 class SchemeEligibility:
     """Individual scheme eligibility result"""
     scheme: SchemeType
     status: EligibilityStatus
     confidence_score: float  # 0-1
     eligible_amount: Optional[float]
-    reasons: List[str]
-    required_documents: List[str]
+    # Immutable tuples; constant reason/document sets are shared between results
+    reasons: Tuple[str, ...]
+    required_documents: Tuple[str, ...]
     timeline_months: Optional[int]
 
-@dataclass
+@dataclass(slots=True)
 class InterventionRecommendation:
     """Village-level intervention recommendation"""
     village_code: str
@@ -111,13 +116,201 @@ class InterventionRecommendation:
     impact_score: float
     reasoning: str
 
+# Priority score band [low, high) of each priority level, matching _get_priority_level
+PRIORITY_SCORE_BANDS: Dict[InterventionPriority, Tuple[float, float]] = {
+    InterventionPriority.CRITICAL: (0.8, float("inf")),
+    InterventionPriority.HIGH: (0.6, 0.8),
+    InterventionPriority.MEDIUM: (0.4, 0.6),
+    InterventionPriority.LOW: (float("-inf"), 0.4)
+}
+
+# Distinct reason/document tuples, so results with the same codes share one tuple
+_INTERNED_CODE_SETS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+def intern_codes(codes: Iterable[str]) -> Tuple[str, ...]:
+    """Return the shared tuple for a sequence of reason or document strings"""
+    key = tuple(codes)
+    return _INTERNED_CODE_SETS.setdefault(key, key)
+
+# Infrastructure gap thresholds used in coverage gap analysis: gap name -> (village index, threshold)
+COVERAGE_GAP_THRESHOLDS: Dict[str, tuple] = {
+    "water": ("water_index", 50),
+    "electricity": ("electricity_index", 50),
+    "roads": ("road_connectivity_index", 40),
+    "health": ("health_facility_index", 50),
+    "education": ("education_index", 50)
+}
+
+# Implementation timeline phase for each intervention priority
+PHASE_BY_PRIORITY: Dict[InterventionPriority, str] = {
+    InterventionPriority.CRITICAL: "Phase 1 (0-6 months)",
+    InterventionPriority.HIGH: "Phase 2 (6-12 months)",
+    InterventionPriority.MEDIUM: "Phase 3 (12-24 months)",
+    InterventionPriority.LOW: "Phase 4 (24+ months)"
+}
+
+# Priorities listed under regional priority interventions and funded in resource allocation
+FUNDED_PRIORITIES = (InterventionPriority.CRITICAL, InterventionPriority.HIGH)
+
+def priority_listing_entry(village: VillageProfile, intervention: InterventionRecommendation) -> Dict[str, Any]:
+    """Entry for the regional priority interventions section of the policy report"""
+    return {
+        "village": village.village_name,
+        "district": village.district,
+        "intervention": intervention.intervention_type,
+        "priority": intervention.priority.value,
+        "cost": intervention.estimated_cost,
+        "beneficiaries": intervention.estimated_beneficiaries
+    }
+
+def timeline_listing_entry(village: VillageProfile, intervention: InterventionRecommendation) -> str:
+    """Entry for the implementation timeline section of the policy report"""
+    return f"{village.village_name}: {intervention.intervention_type}"
+
+def matches_region(village: VillageProfile, state: Optional[str], district: Optional[str]) -> bool:
+    """Whether a village lies in the given state and district (None matches any)"""
+    return (state is None or village.state == state) and (district is None or village.district == district)
+
+def select_top_interventions(
+    evaluated_villages: Iterable[Tuple[VillageProfile, List[InterventionRecommendation]]],
+    k: int,
+    intervention_type: Optional[str] = None
+) -> List[InterventionRecommendation]:
+    """Top-k interventions by impact_score using a bounded heap (O(n log k), no full sort)"""
+    candidates = (
+        intervention
+        for _, interventions in evaluated_villages
+        for intervention in interventions
+        if intervention_type is None or intervention.intervention_type == intervention_type
+    )
+    return heapq.nlargest(k, candidates, key=lambda intervention: intervention.impact_score)
+
+def select_top_villages(
+    evaluated_villages: Iterable[Tuple[VillageProfile, List[InterventionRecommendation]]],
+    k: int,
+    intervention_type: Optional[str] = None
+) -> List[Tuple[VillageProfile, List[InterventionRecommendation]]]:
+    """Top-k villages by their highest intervention impact_score using a bounded heap"""
+    candidates = (
+        (village, [i for i in interventions if intervention_type is None or i.intervention_type == intervention_type])
+        for village, interventions in evaluated_villages
+    )
+    return heapq.nlargest(
+        k,
+        (candidate for candidate in candidates if candidate[1]),
+        key=lambda candidate: max(i.impact_score for i in candidate[1])
+    )
+
+class PolicyReportAccumulator:
+    """
+    Single-pass accumulator for policy report sections
+
+    Each village is added once with its already computed interventions and each
+    holder once with its eligibilities; every report section (coverage gaps,
+    regional priorities, resource allocation, timeline) is fed from that pass.
+    """
+
+    def __init__(self, intervention_rules: Dict[str, Dict], max_listed_per_section: Optional[int] = None):
+        # With max_listed_per_section set, regional priority and timeline listings are
+        # capped so memory stays constant; counts and totals remain exact
+        self.max_listed_per_section = max_listed_per_section
+        self.total_villages = 0
+        self.total_fra_holders = 0
+        self.high_priority_villages = 0
+        self.gap_villages: Dict[str, int] = {gap: 0 for gap in COVERAGE_GAP_THRESHOLDS}
+        self.water_gap_states: Counter = Counter()
+        self.holders_without_accounts = 0
+        self.holders_without_aadhaar = 0
+        self.priority_interventions: Dict[str, List[Dict]] = {}
+        self.resource_allocation: Dict[str, float] = {intervention_type: 0.0 for intervention_type in intervention_rules}
+        self.resource_allocation["individual_benefits"] = 0.0
+        self.implementation_timeline: Dict[str, List[str]] = {phase: [] for phase in PHASE_BY_PRIORITY.values()}
+        self.priority_intervention_counts: Counter = Counter()
+        self.timeline_counts: Counter = Counter()
+
+    def _has_room(self, listed: List) -> bool:
+        return self.max_listed_per_section is None or len(listed) < self.max_listed_per_section
+
+    def add_village(self, village: VillageProfile, interventions: List[InterventionRecommendation], high_priority: bool) -> None:
+        """Feed one village and its interventions into every report section"""
+        self.total_villages += 1
+        if high_priority:
+            self.high_priority_villages += 1
+
+        for gap, (index_name, threshold) in COVERAGE_GAP_THRESHOLDS.items():
+            if getattr(village, index_name) < threshold:
+                self.gap_villages[gap] += 1
+                if gap == "water":
+                    self.water_gap_states[village.state] += 1
+
+        state_priorities = self.priority_interventions.setdefault(village.state, [])
+        for intervention in interventions:
+            if intervention.priority in FUNDED_PRIORITIES:
+                self.priority_intervention_counts[village.state] += 1
+                if self._has_room(state_priorities):
+                    state_priorities.append(priority_listing_entry(village, intervention))
+                self.resource_allocation[intervention.intervention_type] += intervention.estimated_cost
+
+            phase = PHASE_BY_PRIORITY[intervention.priority]
+            self.timeline_counts[phase] += 1
+            if self._has_room(self.implementation_timeline[phase]):
+                self.implementation_timeline[phase].append(timeline_listing_entry(village, intervention))
+
+    def add_holder(self, holder: FRAHolder, eligibilities: List[SchemeEligibility]) -> None:
+        """Feed one FRA holder and its scheme eligibilities into the report"""
+        self.total_fra_holders += 1
+        if not holder.has_bank_account:
+            self.holders_without_accounts += 1
+        if not holder.aadhaar_linked:
+            self.holders_without_aadhaar += 1
+
+        for eligibility in eligibilities:
+            if eligibility.status == EligibilityStatus.ELIGIBLE and eligibility.eligible_amount:
+                self.resource_allocation["individual_benefits"] += eligibility.eligible_amount
+
+    def coverage_gaps(self, top_n: int = 5) -> Dict[str, Any]:
+        """Gaps in scheme coverage and infrastructure from the accumulated counts"""
+        infrastructure_gaps: Dict[str, Dict[str, Any]] = {}
+        for gap, affected in self.gap_villages.items():
+            infrastructure_gaps[gap] = {
+                "villages_affected": affected,
+                "percentage": affected / self.total_villages * 100 if self.total_villages else 0
+            }
+        infrastructure_gaps["water"]["priority_states"] = [state for state, _ in self.water_gap_states.most_common(top_n)]
+
+        return {
+            "infrastructure_gaps": infrastructure_gaps,
+            "eligibility_gaps": {
+                "banking": {
+                    "holders_without_accounts": self.holders_without_accounts,
+                    "percentage": self.holders_without_accounts / self.total_fra_holders * 100 if self.total_fra_holders else 0
+                },
+                "aadhaar": {
+                    "holders_without_aadhaar": self.holders_without_aadhaar,
+                    "percentage": self.holders_without_aadhaar / self.total_fra_holders * 100 if self.total_fra_holders else 0
+                }
+            }
+        }
+
 class DSSEngine:
     """Decision Support System Engine for CSS Scheme Layering"""
     
     def __init__(self):
         self.scheme_rules = self._initialize_scheme_rules()
         self.intervention_rules = self._initialize_intervention_rules()
+        self.compile_intervention_rules()
         
+    def scheme_rules_version(self) -> str:
+        """Stable fingerprint of scheme_rules; changes whenever any rule value changes"""
+        rules = {getattr(scheme, "value", scheme): rule for scheme, rule in self.scheme_rules.items()}
+        encoded = json.dumps(rules, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+    
+    def compile_intervention_rules(self) -> None:
+        """Parse intervention trigger conditions once into predicates; call again after editing intervention_rules"""
+        from .dss_rules import compile_intervention_triggers
+        self.intervention_triggers = compile_intervention_triggers(self.intervention_rules)
+    
     def _initialize_scheme_rules(self) -> Dict[SchemeType, Dict]:
         """Initialize eligibility rules for each scheme"""
         return {
@@ -142,7 +335,8 @@ class DSSEngine:
                 "guaranteed_days": 100,
                 "adult_members_eligible": True,
                 "daily_wage_varies_by_state": True,
-                "priority_for_st_sc": True
+                "priority_for_st_sc": True,
+                "min_age": 18
             },
             SchemeType.DAJGUA: {
                 "st_villages_only": True,
@@ -160,6 +354,7 @@ class DSSEngine:
             },
             SchemeType.AYUSHMAN_BHARAT: {
                 "coverage_amount": 500000,
+                "max_annual_income": 250000,  # Exclusive
                 "family_based": True,
                 "priority_for_vulnerable": True,
                 "excludes_income_tax_payers": True
@@ -206,16 +401,35 @@ class DSSEngine:
             }
         }
     
-    def assess_individual_eligibility(self, fra_holder: FRAHolder) -> List[SchemeEligibility]:
-        """Assess individual FRA holder eligibility for all CSS schemes"""
+    def assess_individual_eligibility(self, fra_holder: FRAHolder, schemes: Optional[Collection[SchemeType]] = None) -> List[SchemeEligibility]:
+        """Assess individual FRA holder eligibility for all CSS schemes, or only the given schemes"""
         eligibilities = []
         
         for scheme_type in SchemeType:
+            if schemes is not None and scheme_type not in schemes:
+                continue
             eligibility = self._check_scheme_eligibility(fra_holder, scheme_type)
             eligibilities.append(eligibility)
             
         return eligibilities
-    
+
+    def assess_eligibility_columnar(self, holders, schemes: Optional[List[SchemeType]] = None):
+        """
+        Assess eligibility for a whole holder table in one vectorized pass
+
+        Accepts a HolderColumns table, a NumPy structured array with FRAHolder
+        field names, or a list of FRAHolder records. Returns a ColumnarEligibility
+        with status/confidence/amount arrays of shape (schemes, holders).
+        """
+        from .dss_columnar import HolderColumns, evaluate_eligibility_columns
+
+        if isinstance(holders, np.ndarray):
+            holders = HolderColumns.from_structured(holders)
+        elif not isinstance(holders, HolderColumns):
+            holders = HolderColumns.from_holders(holders)
+
+        return evaluate_eligibility_columns(holders, self.scheme_rules, schemes)
+
     def _check_scheme_eligibility(self, fra_holder: FRAHolder, scheme: SchemeType) -> SchemeEligibility:
         """Check eligibility for a specific scheme"""
         rules = self.scheme_rules.get(scheme, {})
@@ -239,8 +453,8 @@ class DSSEngine:
                 status=EligibilityStatus.REQUIRES_VERIFICATION,
                 confidence_score=0.5,
                 eligible_amount=None,
-                reasons=["Scheme rules not implemented"],
-                required_documents=[],
+                reasons=("Scheme rules not implemented",),
+                required_documents=(),
                 timeline_months=6
             )
     
@@ -287,21 +501,22 @@ class DSSEngine:
             status=status,
             confidence_score=confidence,
             eligible_amount=eligible_amount,
-            reasons=reasons,
-            required_documents=required_docs,
+            reasons=intern_codes(reasons),
+            required_documents=intern_codes(required_docs),
             timeline_months=3 if status == EligibilityStatus.ELIGIBLE else 6
         )
     
-    def _check_mgnrega_eligibility(self, fra_holder: FRAHolder, rules: Dict) -> SchemeEligibility:  # noqa: ARG002
+    def _check_mgnrega_eligibility(self, fra_holder: FRAHolder, rules: Dict) -> SchemeEligibility:
         """Check MGNREGA eligibility"""
-        if fra_holder.age >= 18:
+        min_age = rules.get("min_age", 18)
+        if fra_holder.age >= min_age:
             return SchemeEligibility(
                 scheme=SchemeType.MGNREGA,
                 status=EligibilityStatus.ELIGIBLE,
                 confidence_score=1.0,
                 eligible_amount=100 * 200,  # 100 days * avg daily wage
-                reasons=["Adult member eligible for 100 days employment"],
-                required_documents=["Job card application"],
+                reasons=("Adult member eligible for 100 days employment",),
+                required_documents=("Job card application",),
                 timeline_months=1
             )
         else:
@@ -310,8 +525,8 @@ class DSSEngine:
                 status=EligibilityStatus.NOT_ELIGIBLE,
                 confidence_score=0.0,
                 eligible_amount=None,
-                reasons=["Below 18 years age"],
-                required_documents=[],
+                reasons=(f"Below {min_age:g} years age",),
+                required_documents=(),
                 timeline_months=0
             )
     
@@ -323,8 +538,8 @@ class DSSEngine:
                 status=EligibilityStatus.ELIGIBLE,
                 confidence_score=1.0,
                 eligible_amount=None,  # Village-level scheme
-                reasons=["ST community eligible for village-level interventions"],
-                required_documents=["Community certificate"],
+                reasons=("ST community eligible for village-level interventions",),
+                required_documents=("Community certificate",),
                 timeline_months=6
             )
         else:
@@ -333,8 +548,8 @@ class DSSEngine:
                 status=EligibilityStatus.NOT_ELIGIBLE,
                 confidence_score=0.0,
                 eligible_amount=None,
-                reasons=["Only for Scheduled Tribe communities"],
-                required_documents=[],
+                reasons=("Only for Scheduled Tribe communities",),
+                required_documents=(),
                 timeline_months=0
             )
     
@@ -345,8 +560,8 @@ class DSSEngine:
             status=EligibilityStatus.ELIGIBLE,
             confidence_score=1.0,
             eligible_amount=None,  # Village-level scheme
-            reasons=["Universal household tap connection eligible"],
-            required_documents=["Village enrollment"],
+            reasons=("Universal household tap connection eligible",),
+            required_documents=("Village enrollment",),
             timeline_months=12
         )
     
@@ -358,8 +573,8 @@ class DSSEngine:
                 status=EligibilityStatus.ELIGIBLE,
                 confidence_score=0.8,
                 eligible_amount=rules.get("assistance_amount", 130000),
-                reasons=["Eligible for housing assistance"],
-                required_documents=["Housing assessment", "Income certificate"],
+                reasons=("Eligible for housing assistance",),
+                required_documents=("Housing assessment", "Income certificate",),
                 timeline_months=6
             )
         else:
@@ -368,21 +583,21 @@ class DSSEngine:
                 status=EligibilityStatus.REQUIRES_VERIFICATION,
                 confidence_score=0.7,
                 eligible_amount=None,
-                reasons=["Housing condition verification needed"],
-                required_documents=["Detailed housing assessment"],
+                reasons=("Housing condition verification needed",),
+                required_documents=("Detailed housing assessment",),
                 timeline_months=3
             )
     
     def _check_health_eligibility(self, fra_holder: FRAHolder, rules: Dict) -> SchemeEligibility:
         """Check Ayushman Bharat eligibility"""
-        if fra_holder.annual_income and fra_holder.annual_income < 250000:
+        if fra_holder.annual_income and fra_holder.annual_income < rules.get("max_annual_income", 250000):
             return SchemeEligibility(
                 scheme=SchemeType.AYUSHMAN_BHARAT,
                 status=EligibilityStatus.ELIGIBLE,
                 confidence_score=0.9,
                 eligible_amount=rules.get("coverage_amount", 500000),
-                reasons=["Eligible for health insurance coverage"],
-                required_documents=["Income certificate", "Family card"],
+                reasons=("Eligible for health insurance coverage",),
+                required_documents=("Income certificate", "Family card",),
                 timeline_months=2
             )
         else:
@@ -391,17 +606,28 @@ class DSSEngine:
                 status=EligibilityStatus.REQUIRES_VERIFICATION,
                 confidence_score=0.6,
                 eligible_amount=None,
-                reasons=["Income verification for health insurance"],
-                required_documents=["Income verification documents"],
+                reasons=("Income verification for health insurance",),
+                required_documents=("Income verification documents",),
                 timeline_months=4
             )
     
-    def prioritize_village_interventions(self, village: VillageProfile) -> List[InterventionRecommendation]:
-        """Generate prioritized intervention recommendations for a village"""
+    def prioritize_village_interventions(
+        self,
+        village: VillageProfile,
+        priority_filter: Optional[InterventionPriority] = None
+    ) -> List[InterventionRecommendation]:
+        """
+        Generate prioritized intervention recommendations for a village
+        
+        With priority_filter only interventions of that priority are built, and villages
+        whose score bounds cannot reach it are skipped before any trigger is evaluated.
+        """
         recommendations = []
+        if priority_filter is not None and not self._can_reach_priority(village, priority_filter):
+            return recommendations
         
         for intervention_type, rules in self.intervention_rules.items():
-            priority = self._calculate_intervention_priority(village, intervention_type, rules)
+            priority = self._calculate_intervention_priority(village, intervention_type, rules, priority_filter)
             if priority:
                 recommendations.append(priority)
                 
@@ -410,18 +636,175 @@ class DSSEngine:
         
         return recommendations
     
-    def _calculate_intervention_priority(self, village: VillageProfile, intervention_type: str, rules: Dict) -> Optional[InterventionRecommendation]:
-        """Calculate priority for a specific intervention"""
-        triggers = rules.get("trigger_conditions", [])
+    def prioritize_interventions_columnar(self, villages):
+        """
+        Evaluate every intervention trigger over a whole village table in one vectorized pass
+
+        Accepts a VillageColumns table or a list of VillageProfile records and returns
+        ColumnarInterventions with trigger masks, impact scores and priority codes of
+        shape (intervention types, villages).
+        """
+        from .dss_columnar import VillageColumns, evaluate_intervention_columns
+
+        if not isinstance(villages, VillageColumns):
+            villages = VillageColumns.from_villages(villages)
+
+        return evaluate_intervention_columns(villages, self.intervention_rules, self.intervention_triggers)
+    
+    def run_what_if_scenarios(self, villages, fra_holders, variants, include_baseline: bool = True) -> Dict[str, Any]:
+        """
+        Compare variants of the scheme and intervention rules in one vectorized pass
+
+        villages/fra_holders are VillageColumns/HolderColumns tables or lists of
+        records; variants are dss_scenarios.ScenarioVariant overrides of this
+        engine's rules. Returns per-variant eligibility counts, benefit totals and
+        intervention costs.
+        """
+        from .dss_columnar import HolderColumns, VillageColumns
+        from .dss_scenarios import run_scenarios
+
+        if not isinstance(villages, VillageColumns):
+            villages = VillageColumns.from_villages(villages)
+        if isinstance(fra_holders, np.ndarray):
+            fra_holders = HolderColumns.from_structured(fra_holders)
+        elif not isinstance(fra_holders, HolderColumns):
+            fra_holders = HolderColumns.from_holders(fra_holders)
+
+        return run_scenarios(self, fra_holders, villages, variants, include_baseline)
+    
+    def coverage_gap_cube(self, villages, fra_holders=None):
+        """
+        Roll coverage gap metrics up state -> district -> block in one grouped pass
+
+        villages/fra_holders are VillageColumns/HolderColumns tables or lists of
+        records. Returns a dss_gaps.GapCube; use .to_dict() for the nested cube or
+        .node(state, district, block) for one drill-down level.
+        """
+        from .dss_columnar import HolderColumns, VillageColumns
+        from .dss_gaps import build_gap_cube
+
+        if not isinstance(villages, VillageColumns):
+            villages = VillageColumns.from_villages(villages)
+        if fra_holders is not None and not isinstance(fra_holders, HolderColumns):
+            fra_holders = HolderColumns.from_holders(fra_holders)
+
+        return build_gap_cube(villages, fra_holders)
+    
+    def optimize_budget(
+        self,
+        villages,
+        budgets: Dict[str, float],
+        group_by: str = "ministry",
+        years: int = 1,
+        intervention_types: Optional[List[str]] = None
+    ):
+        """
+        Fund the interventions maximizing impact x success x beneficiaries within budgets
+
+        villages is a VillageColumns table or a list of VillageProfile records; budgets
+        are per implementing ministry or per state (group_by), annual when years > 1.
+        Returns a dss_budget.BudgetPlan; use .to_dict() for the report.
+        """
+        from .dss_columnar import VillageColumns
+        from .dss_budget import optimize_budget
+
+        if not isinstance(villages, VillageColumns):
+            villages = VillageColumns.from_villages(villages)
+
+        interventions = self.prioritize_interventions_columnar(villages)
+        return optimize_budget(villages, interventions, self.intervention_rules, budgets, group_by, years, intervention_types)
+
+    def cluster_priority_villages(
+        self,
+        villages,
+        priorities: Optional[List[InterventionPriority]] = None,
+        intervention_types: Optional[List[str]] = None,
+        eps_km: float = 5.0,
+        min_villages: int = 3
+    ):
+        """
+        Group neighbouring villages needing the same priority interventions for bundled procurement
+
+        villages is a VillageColumns table or a list of VillageProfile records; those with
+        a triggered intervention of the given priorities (CRITICAL by default) and types are
+        clustered DBSCAN-style within eps_km. Returns a dss_clustering.InterventionClusters;
+        use .to_dict() for the report.
+        """
+        from .dss_columnar import VillageColumns
+        from .dss_clustering import cluster_priority_villages
+
+        if not isinstance(villages, VillageColumns):
+            villages = VillageColumns.from_villages(villages)
+
+        interventions = self.prioritize_interventions_columnar(villages)
+        return cluster_priority_villages(
+            villages, interventions, self.intervention_rules, priorities, intervention_types, eps_km, min_villages
+        )
+
+    def village_views(self, villages: Iterable[VillageProfile], fra_holders: Iterable[FRAHolder], village_codes: Optional[List[str]] = None):
+        """
+        Combined per-village views joining FRA holders to their village on village_code
+
+        Each dss_join.VillageView pairs the village's interventions and their cost with
+        the individual benefit total and per-scheme eligibility counts of its holders.
+        """
+        from .dss_join import VillageHolderIndex
+
+        return VillageHolderIndex.build(villages, fra_holders).views(self, village_codes)
+    
+    def top_priority_interventions(
+        self,
+        villages: Iterable[VillageProfile],
+        k: int,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        intervention_type: Optional[str] = None
+    ) -> List[InterventionRecommendation]:
+        """
+        Top-k interventions across villages by impact_score
+        
+        Villages outside the state/district filter are skipped before evaluation and
+        selection keeps only a k-sized heap instead of sorting the whole country.
+        """
+        return select_top_interventions(self._evaluate_region(villages, state, district), k, intervention_type)
+    
+    def top_priority_villages(
+        self,
+        villages: Iterable[VillageProfile],
+        k: int,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        intervention_type: Optional[str] = None
+    ) -> List[Tuple[VillageProfile, List[InterventionRecommendation]]]:
+        """Top-k villages by their highest intervention impact_score, with their interventions"""
+        return select_top_villages(self._evaluate_region(villages, state, district), k, intervention_type)
+    
+    def _evaluate_region(self, villages: Iterable[VillageProfile], state: Optional[str], district: Optional[str]):
+        for village in villages:
+            if matches_region(village, state, district):
+                yield village, self.prioritize_village_interventions(village)
+    
+    def _calculate_intervention_priority(
+        self,
+        village: VillageProfile,
+        intervention_type: str,
+        rules: Dict,
+        priority_filter: Optional[InterventionPriority] = None
+    ) -> Optional[InterventionRecommendation]:
+        """Calculate priority for a specific intervention, or None if not triggered (or filtered out)"""
+        trigger = self.intervention_triggers.get(intervention_type)
         
         # Check if intervention is needed
-        needs_intervention, impact_factors = self._check_intervention_triggers(village, intervention_type, triggers)
-        if not needs_intervention:
+        if trigger is None or not trigger.evaluate(village):
             return None
+        impact_factors: List[float] = []
+        trigger.collect_impacts(village, impact_factors)
             
         # Calculate priority metrics
         priority_score = self._calculate_priority_score(village, impact_factors)
         priority = self._get_priority_level(priority_score)
+        if priority_filter is not None and priority != priority_filter:
+            return None
         
         # Estimate intervention details
         estimated_beneficiaries = min(village.st_households, village.total_households)
@@ -440,80 +823,26 @@ class DSSEngine:
             reasoning=f"Village {village.village_name} requires {intervention_type} intervention due to low infrastructure indices. Priority: {priority.value}, Expected impact: {priority_score:.2f}"
         )
     
-    def _check_intervention_triggers(self, village: VillageProfile, intervention_type: str, triggers: List[str]) -> tuple[bool, List[float]]:
-        """Check if intervention triggers are met"""
-        needs_intervention = False
-        impact_factors = []
-        
-        trigger_checks = {
-            "water_infrastructure": lambda: self._check_water_trigger(village, triggers, impact_factors),
-            "electricity_infrastructure": lambda: self._check_electricity_trigger(village, triggers, impact_factors),
-            "road_connectivity": lambda: self._check_road_trigger(village, triggers, impact_factors),
-            "health_infrastructure": lambda: self._check_health_trigger(village, triggers, impact_factors),
-            "education_infrastructure": lambda: self._check_education_trigger(village, triggers, impact_factors)
-        }
-        
-        if intervention_type in trigger_checks:
-            needs_intervention = trigger_checks[intervention_type]()
-        
-        return needs_intervention, impact_factors
-    
-    def _check_water_trigger(self, village: VillageProfile, triggers: List[str], impact_factors: List[float]) -> bool:
-        """Check water infrastructure triggers"""
-        for condition in triggers:
-            if "water_index" in condition:
-                threshold = float(condition.split("<")[1].strip())
-                if village.water_index < threshold:
-                    impact_factors.append((100 - village.water_index) / 100)
-                    return True
-        return False
-    
-    def _check_electricity_trigger(self, village: VillageProfile, triggers: List[str], impact_factors: List[float]) -> bool:
-        """Check electricity infrastructure triggers"""
-        for condition in triggers:
-            if "electricity_index" in condition:
-                threshold = float(condition.split("<")[1].strip())
-                if village.electricity_index < threshold:
-                    impact_factors.append((100 - village.electricity_index) / 100)
-                    return True
-        return False
-    
-    def _check_road_trigger(self, village: VillageProfile, triggers: List[str], impact_factors: List[float]) -> bool:
-        """Check road connectivity triggers"""
-        for condition in triggers:
-            if "road_connectivity_index" in condition:
-                threshold = float(condition.split("<")[1].strip())
-                if village.road_connectivity_index < threshold:
-                    impact_factors.append((100 - village.road_connectivity_index) / 100)
-                    return True
-        return False
-    
-    def _check_health_trigger(self, village: VillageProfile, triggers: List[str], impact_factors: List[float]) -> bool:
-        """Check health infrastructure triggers"""
-        for condition in triggers:
-            if "health_facility_index" in condition:
-                threshold = float(condition.split("<")[1].strip())
-                if village.health_facility_index < threshold:
-                    impact_factors.append((100 - village.health_facility_index) / 100)
-                    return True
-        return False
-    
-    def _check_education_trigger(self, village: VillageProfile, triggers: List[str], impact_factors: List[float]) -> bool:
-        """Check education infrastructure triggers"""
-        for condition in triggers:
-            if "education_index" in condition:
-                threshold = float(condition.split("<")[1].strip())
-                if village.education_index < threshold:
-                    impact_factors.append((100 - village.education_index) / 100)
-                    return True
-        return False
-    
     def _calculate_priority_score(self, village: VillageProfile, impact_factors: List[float]) -> float:
         """Calculate intervention priority score"""
-        avg_impact = float(np.mean(impact_factors)) if impact_factors else 0.5
+        # Plain arithmetic; np.mean costs more than the rule itself on a handful of factors
+        avg_impact = sum(impact_factors) / len(impact_factors) if impact_factors else 0.5
         st_population_factor = village.st_population / village.total_population if village.total_population > 0 else 0
         return avg_impact * 0.6 + st_population_factor * 0.4
     
+    def _can_reach_priority(self, village: VillageProfile, priority: InterventionPriority) -> bool:
+        """
+        Whether any intervention of this village can score into the priority's band
+        
+        Impact factors lie in [0, 1] for indices within 0-100 (as the request models
+        enforce), so a score lies between the ST population term alone and that term
+        plus the full 0.6 impact weight.
+        """
+        lowest = self._calculate_priority_score(village, [0.0])
+        highest = self._calculate_priority_score(village, [1.0])
+        low, high = PRIORITY_SCORE_BANDS[priority]
+        return highest >= low and lowest < high
+    
     def _get_priority_level(self, priority_score: float) -> InterventionPriority:
         """Get priority level based on score"""
         if priority_score >= 0.8:
@@ -532,165 +861,66 @@ class DSSEngine:
             1.0 if village.electricity_index > 50 else 0.5,
             0.8  # General implementation success rate
         ]
-        return float(np.mean(success_factors))
+        return sum(success_factors) / len(success_factors)
     
     def generate_policy_recommendations(self, villages: List[VillageProfile], fra_holders: List[FRAHolder]) -> Dict[str, Any]:
         """Generate high-level policy recommendations based on aggregate analysis"""
-        
-        # Aggregate statistics
-        total_villages = len(villages)
-        total_fra_holders = len(fra_holders)
-        
-        # Calculate coverage gaps
-        coverage_gaps = self._analyze_coverage_gaps(villages, fra_holders)
-        
-        # Priority interventions by state/district
-        priority_interventions = self._prioritize_interventions_by_region(villages)
-        
-        # Resource allocation recommendations
-        resource_allocation = self._recommend_resource_allocation(villages, fra_holders)
-        
-        # Timeline recommendations
-        implementation_timeline = self._create_implementation_timeline(villages)
-        
-        return {
-            "summary": {
-                "total_villages_analyzed": total_villages,
-                "total_fra_holders": total_fra_holders,
-                "high_priority_villages": len([v for v in villages if self._is_high_priority_village(v)]),
-                "estimated_total_investment": sum(resource_allocation.values())
-            },
-            "coverage_gaps": coverage_gaps,
-            "priority_interventions": priority_interventions,
-            "resource_allocation": resource_allocation,
-            "implementation_timeline": implementation_timeline,
-            "key_recommendations": self._generate_key_policy_points(coverage_gaps, priority_interventions)
-        }
+        report = PolicyReportAccumulator(self.intervention_rules)
+        self._feed_policy_report(report, villages, fra_holders)
+        return self._build_policy_report(report)
     
-    def _analyze_coverage_gaps(self, villages: List[VillageProfile], fra_holders: List[FRAHolder]) -> Dict[str, Any]:
-        """Analyze gaps in scheme coverage and infrastructure"""
-        
-        # Infrastructure gaps by type
-        water_gap_villages = [v for v in villages if v.water_index < 50]
-        electricity_gap_villages = [v for v in villages if v.electricity_index < 50]
-        road_gap_villages = [v for v in villages if v.road_connectivity_index < 40]
-        health_gap_villages = [v for v in villages if v.health_facility_index < 50]
-        education_gap_villages = [v for v in villages if v.education_index < 50]
-        
-        # FRA holder eligibility gaps
-        no_bank_account = [h for h in fra_holders if not h.has_bank_account]
-        no_aadhaar = [h for h in fra_holders if not h.aadhaar_linked]
-        
-        return {
-            "infrastructure_gaps": {
-                "water": {
-                    "villages_affected": len(water_gap_villages),
-                    "percentage": len(water_gap_villages) / len(villages) * 100 if villages else 0,
-                    "priority_states": self._get_top_states([v.state for v in water_gap_villages])
-                },
-                "electricity": {
-                    "villages_affected": len(electricity_gap_villages),
-                    "percentage": len(electricity_gap_villages) / len(villages) * 100 if villages else 0
-                },
-                "roads": {
-                    "villages_affected": len(road_gap_villages),
-                    "percentage": len(road_gap_villages) / len(villages) * 100 if villages else 0
-                },
-                "health": {
-                    "villages_affected": len(health_gap_villages),
-                    "percentage": len(health_gap_villages) / len(villages) * 100 if villages else 0
-                },
-                "education": {
-                    "villages_affected": len(education_gap_villages),
-                    "percentage": len(education_gap_villages) / len(villages) * 100 if villages else 0
-                }
-            },
-            "eligibility_gaps": {
-                "banking": {
-                    "holders_without_accounts": len(no_bank_account),
-                    "percentage": len(no_bank_account) / len(fra_holders) * 100 if fra_holders else 0
-                },
-                "aadhaar": {
-                    "holders_without_aadhaar": len(no_aadhaar),
-                    "percentage": len(no_aadhaar) / len(fra_holders) * 100 if fra_holders else 0
-                }
-            }
-        }
+    def generate_policy_recommendations_streaming(
+        self,
+        villages: Iterable[VillageProfile],
+        fra_holders: Iterable[FRAHolder],
+        max_listed_per_section: Optional[int] = 1000
+    ) -> Dict[str, Any]:
+        """
+        Generate policy recommendations from iterators of villages and holders
+        
+        Records are consumed one at a time (e.g. from dss_streaming.iter_villages over an
+        NDJSON or CSV file), so memory is bounded by the accumulators. Regional priority
+        and timeline listings are capped at max_listed_per_section entries; the full counts
+        are reported under summary["section_totals"].
+        """
+        report = PolicyReportAccumulator(self.intervention_rules, max_listed_per_section)
+        self._feed_policy_report(report, villages, fra_holders)
+        return self._build_policy_report(report)
     
-    def _prioritize_interventions_by_region(self, villages: List[VillageProfile]) -> Dict[str, List[Dict]]:
-        """Prioritize interventions by state and district"""
-        state_priorities = {}
-        
+    def _feed_policy_report(self, report: "PolicyReportAccumulator", villages: Iterable[VillageProfile], fra_holders: Iterable[FRAHolder]) -> None:
+        """Single pass: each village and holder is evaluated once and feeds every report section"""
         for village in villages:
-            if village.state not in state_priorities:
-                state_priorities[village.state] = []
-            
-            # Generate interventions for this village
-            interventions = self.prioritize_village_interventions(village)
-            for intervention in interventions:
-                if intervention.priority in [InterventionPriority.CRITICAL, InterventionPriority.HIGH]:
-                    state_priorities[village.state].append({
-                        "village": village.village_name,
-                        "district": village.district,
-                        "intervention": intervention.intervention_type,
-                        "priority": intervention.priority.value,
-                        "cost": intervention.estimated_cost,
-                        "beneficiaries": intervention.estimated_beneficiaries
-                    })
+            report.add_village(village, self.prioritize_village_interventions(village), self._is_high_priority_village(village))
         
-        return state_priorities
+        for holder in fra_holders:
+            report.add_holder(holder, self.assess_individual_eligibility(holder))
     
-    def _recommend_resource_allocation(self, villages: List[VillageProfile], fra_holders: List[FRAHolder]) -> Dict[str, float]:
-        """Recommend budget allocation across different intervention types"""
-        
-        allocation: Dict[str, float] = {
-            "water_infrastructure": 0.0,
-            "electricity_infrastructure": 0.0,
-            "road_connectivity": 0.0,
-            "health_infrastructure": 0.0,
-            "education_infrastructure": 0.0,
-            "individual_benefits": 0.0
+    def _build_policy_report(self, report: "PolicyReportAccumulator") -> Dict[str, Any]:
+        """Assemble the policy report from accumulated section state"""
+        coverage_gaps = report.coverage_gaps()
+        priority_interventions = report.priority_interventions
+        resource_allocation = report.resource_allocation
+        
+        summary = {
+            "total_villages_analyzed": report.total_villages,
+            "total_fra_holders": report.total_fra_holders,
+            "high_priority_villages": report.high_priority_villages,
+            "estimated_total_investment": sum(resource_allocation.values())
         }
+        if report.max_listed_per_section is not None:
+            summary["section_totals"] = {
+                "priority_interventions": dict(report.priority_intervention_counts),
+                "implementation_timeline": {phase: report.timeline_counts[phase] for phase in report.implementation_timeline}
+            }
         
-        for village in villages:
-            interventions = self.prioritize_village_interventions(village)
-            for intervention in interventions:
-                if intervention.priority in [InterventionPriority.CRITICAL, InterventionPriority.HIGH]:
-                    allocation[intervention.intervention_type] += intervention.estimated_cost
-        
-        # Individual scheme benefits
-        for holder in fra_holders:
-            eligibilities = self.assess_individual_eligibility(holder)
-            for eligibility in eligibilities:
-                if eligibility.status == EligibilityStatus.ELIGIBLE and eligibility.eligible_amount:
-                    allocation["individual_benefits"] += eligibility.eligible_amount
-        
-        return allocation
-    
-    def _create_implementation_timeline(self, villages: List[VillageProfile]) -> Dict[str, List[str]]:
-        """Create phased implementation timeline"""
-        timeline = {
-            "Phase 1 (0-6 months)": [],
-            "Phase 2 (6-12 months)": [],
-            "Phase 3 (12-24 months)": [],
-            "Phase 4 (24+ months)": []
+        return {
+            "summary": summary,
+            "coverage_gaps": coverage_gaps,
+            "priority_interventions": priority_interventions,
+            "resource_allocation": resource_allocation,
+            "implementation_timeline": report.implementation_timeline,
+            "key_recommendations": self._generate_key_policy_points(coverage_gaps, priority_interventions)
         }
-        
-        for village in villages:
-            interventions = self.prioritize_village_interventions(village)
-            for intervention in interventions:
-                village_intervention = f"{village.village_name}: {intervention.intervention_type}"
-                
-                if intervention.priority == InterventionPriority.CRITICAL:
-                    timeline["Phase 1 (0-6 months)"].append(village_intervention)
-                elif intervention.priority == InterventionPriority.HIGH:
-                    timeline["Phase 2 (6-12 months)"].append(village_intervention)
-                elif intervention.priority == InterventionPriority.MEDIUM:
-                    timeline["Phase 3 (12-24 months)"].append(village_intervention)
-                else:
-                    timeline["Phase 4 (24+ months)"].append(village_intervention)
-        
-        return timeline
     
     def _generate_key_policy_points(self, coverage_gaps: Dict, priority_interventions: Dict) -> List[str]:  # noqa: ARG002
         """Generate key policy recommendations"""
@@ -734,12 +964,6 @@ class DSSEngine:
         ]
         
         return sum(critical_indices) >= 2
-    
-    def _get_top_states(self, state_list: List[str], top_n: int = 5) -> List[str]:
-        """Get top N states by frequency"""
-        from collections import Counter
-        state_counts = Counter(state_list)
-        return [state for state, count in state_counts.most_common(top_n)]
 
 # Initialize global DSS engine instance
 dss_engine = DSSEngine()
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""
+Streaming input for DSS policy recommendations
+
+Villages and FRA holders are read lazily from NDJSON or CSV sources, validated and converted
+to domain records one at a time, so that DSSEngine.generate_policy_recommendations_streaming
+can consume national-scale inputs with memory bounded by its accumulators rather
+than by the number of records. NDJSON inputs can likewise be consumed in batches of
+lines, for endpoints that stream one result line back per input line.
+
+Configuration (environment):
+    DSS_STREAM_BATCH_SIZE  NDJSON lines evaluated per batch by streaming endpoints (default 256)
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple, Type, TypeVar, Union, get_args, get_type_hints
+from dataclasses import fields
+from pathlib import Path
+import csv
+import json
+import logging
+import math
+import os
+
+from .dss_service import FRAHolder, VillageProfile
+from .dss_ingest import FALSE_VALUES, HOLDER_CHOICES, HOLDER_RANGES, TRUE_VALUES, VILLAGE_CHOICES, VILLAGE_RANGES
+
+logger = logging.getLogger(__name__)
+
+Record = TypeVar("Record", FRAHolder, VillageProfile)
+
+DEFAULT_STREAM_BATCH_SIZE = int(os.getenv("DSS_STREAM_BATCH_SIZE", "256"))
+
+NDJSON_FORMAT = "ndjson"
+CSV_FORMAT = "csv"
+
+_FORMAT_BY_SUFFIX = {
+    ".ndjson": NDJSON_FORMAT,
+    ".jsonl": NDJSON_FORMAT,
+    ".json": NDJSON_FORMAT,
+    ".csv": CSV_FORMAT
+}
+
+def _parse_str(value: Any) -> str:
+    if not isinstance(value, str):
+        raise ValueError("not a string")
+    return value
+
+def _parse_float(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError("not a number")
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError("not a number") from None
+    if not math.isfinite(number):
+        raise ValueError("not a number")
+    return number
+
+def _parse_int(value: Any) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    number = _parse_float(value)
+    if not number.is_integer():
+        raise ValueError("not a whole number")
+    return int(number)
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError("not a boolean")
+
+_PARSERS: Dict[Any, Callable[[Any], Any]] = {
+    str: _parse_str,
+    int: _parse_int,
+    float: _parse_float,
+    bool: _parse_bool,
+    Optional[str]: _parse_str,
+    Optional[int]: _parse_int,
+    Optional[float]: _parse_float
+}
+
+def _field_parsers(record_type: Type) -> Dict[str, Callable[[Any], Any]]:
+    hints = get_type_hints(record_type)
+    return {f.name: _PARSERS[hints[f.name]] for f in fields(record_type)}
+
+def _optional_fields(record_type: Type) -> Set[str]:
+    hints = get_type_hints(record_type)
+    return {f.name for f in fields(record_type) if type(None) in get_args(hints[f.name])}
+
+_RECORD_PARSERS = {
+    FRAHolder: _field_parsers(FRAHolder),
+    VillageProfile: _field_parsers(VillageProfile)
+}
+
+_RECORD_OPTIONAL_FIELDS = {
+    FRAHolder: _optional_fields(FRAHolder),
+    VillageProfile: _optional_fields(VillageProfile)
+}
+
+# Field bounds and allowed values, shared with the table ingest and matching the request models
+_RECORD_RANGES = {FRAHolder: HOLDER_RANGES, VillageProfile: VILLAGE_RANGES}
+_RECORD_CHOICES = {FRAHolder: HOLDER_CHOICES, VillageProfile: VILLAGE_CHOICES}
+
+def _field_problem(record_type: Type[Record], name: str, value: Any) -> Optional[str]:
+    """Why a parsed field value violates the request model's constraints, or None"""
+    if name in _RECORD_RANGES[record_type]:
+        low, high = _RECORD_RANGES[record_type][name]
+        if not low <= value <= high:
+            return f"outside [{low}, {high}]"
+    choices = _RECORD_CHOICES[record_type].get(name)
+    if choices is not None and value not in choices:
+        return f"not one of {', '.join(choices)}"
+    if (name.endswith("_id") or name.endswith("_code")) and not value.strip():
+        return "missing value"
+    return None
+
+def record_from_mapping(record_type: Type[Record], row: Dict[str, Any]) -> Record:
+    """
+    Validate one NDJSON object or CSV row and convert it into a domain record
+
+    Fields are checked against the same types, bounds and allowed values as the
+    JSON request models; nothing is coerced (blank booleans, null numbers and
+    fractional counts are rejected). Raises ValueError listing every bad field.
+    """
+    values = {}
+    problems = []
+    for name, parse in _RECORD_PARSERS[record_type].items():
+        value = row.get(name)
+        if value is None or (isinstance(value, str) and not value.strip() and parse is not _parse_str):
+            if name in _RECORD_OPTIONAL_FIELDS[record_type]:
+                values[name] = None
+            else:
+                problems.append(f"{name}: missing value")
+            continue
+        try:
+            values[name] = parse(value)
+        except ValueError as e:
+            problems.append(f"{name}: {e}")
+            continue
+        problem = _field_problem(record_type, name, values[name])
+        if problem is not None:
+            problems.append(f"{name}: {problem}")
+    if problems:
+        raise ValueError(f"Invalid {record_type.__name__}: {'; '.join(problems)}")
+    return record_type(**values)
+
+def detect_format(name: Optional[str], content_type: Optional[str] = None) -> str:
+    """Pick NDJSON or CSV from a file name or content type"""
+    if content_type:
+        if "csv" in content_type:
+            return CSV_FORMAT
+        if "ndjson" in content_type or "jsonl" in content_type:
+            return NDJSON_FORMAT
+    suffix = Path(name or "").suffix.lower()
+    if suffix in _FORMAT_BY_SUFFIX:
+        return _FORMAT_BY_SUFFIX[suffix]
+    raise ValueError(f"Cannot determine input format for '{name}'; use .ndjson, .jsonl or .csv")
+
+def iter_mappings(lines: Iterable[str], input_format: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Lazily yield (NDJSON line number or 1-based CSV data row, mapping) per record"""
+    if input_format == CSV_FORMAT:
+        yield from enumerate(csv.DictReader(lines), start=1)
+    elif input_format == NDJSON_FORMAT:
+        for line_number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e.msg}") from e
+            if not isinstance(row, dict):
+                raise ValueError(f"Line {line_number}: expected a JSON object")
+            yield line_number, row
+    else:
+        raise ValueError(f"Unsupported input format '{input_format}'")
+
+def iter_records(record_type: Type[Record], lines: Iterable[str], input_format: str) -> Iterator[Record]:
+    """Lazily yield validated domain records from NDJSON or CSV lines; a bad record raises ValueError naming its line or row"""
+    label = "Line" if input_format == NDJSON_FORMAT else "Row"
+    for number, row in iter_mappings(lines, input_format):
+        try:
+            yield record_from_mapping(record_type, row)
+        except ValueError as e:
+            raise ValueError(f"{label} {number}: {e}") from e
+
+def iter_villages(source: Union[str, Path, TextIO], input_format: Optional[str] = None) -> Iterator[VillageProfile]:
+    """Stream VillageProfile records from a file path or an open text stream"""
+    return _iter_source(VillageProfile, source, input_format)
+
+def iter_holders(source: Union[str, Path, TextIO], input_format: Optional[str] = None) -> Iterator[FRAHolder]:
+    """Stream FRAHolder records from a file path or an open text stream"""
+    return _iter_source(FRAHolder, source, input_format)
+
+def _iter_source(record_type: Type[Record], source: Union[str, Path, TextIO], input_format: Optional[str]) -> Iterator[Record]:
+    if isinstance(source, (str, Path)):
+        input_format = input_format or detect_format(str(source))
+        with open(source, "r", encoding="utf-8", newline="") as handle:
+            yield from iter_records(record_type, handle, input_format)
+    else:
+        input_format = input_format or detect_format(getattr(source, "name", None))
+        yield from iter_records(record_type, source, input_format)
+
+def iter_line_batches(lines: Iterable[str], batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> Iterator[List[Tuple[int, str]]]:
+    """
+    Group the non-blank lines of a text stream into batches of (line number, line)
+
+    Only the current batch is held in memory, so NDJSON inputs of any size can be
+    evaluated and answered batch by batch.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    batch: List[Tuple[int, str]] = []
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        batch.append((line_number, line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,181 @@
+"""
+Server-side village profile store
+
+Village indices change rarely, yet every intervention request used to carry
+full 20-field village profiles. The store keeps the current VillageProfile per
+village_code, loaded in bulk and kept current with upserts, so requests can name
+villages by code or by admin filter (state, district, block) instead. Each
+village carries a version that is bumped only when its profile actually
+changes, and the store's version counts every change, so clients can tell
+whether their copy is current. Hash indexes on village_code and on each admin
+level make lookups proportional to the number of villages returned; derived
+indexes (such as the peer index) subscribe to changes.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import threading
+
+from .dss_service import VillageProfile
+
+logger = logging.getLogger(__name__)
+
+# Called with a village_code and its new profile, or None when it is deleted
+ChangeListener = Callable[[str, Optional[VillageProfile]], None]
+
+@dataclass(slots=True)
+class StoredVillage:
+    """A village profile with its version and last change time"""
+    profile: VillageProfile
+    version: int
+    updated_at: str
+
+class VillageProfileStore:
+    """Versioned village profiles indexed by village_code, state, district and block"""
+
+    def __init__(self):
+        self._villages: Dict[str, StoredVillage] = {}
+        self._by_state: Dict[str, Set[str]] = {}
+        self._by_district: Dict[Tuple[str, str], Set[str]] = {}
+        self._by_block: Dict[Tuple[str, str, str], Set[str]] = {}
+        self.version = 0
+        self._listeners: List[ChangeListener] = []
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._villages)
+
+    def __contains__(self, village_code: str) -> bool:
+        return village_code in self._villages
+
+    # Indexes
+
+    @staticmethod
+    def _keys(village: VillageProfile) -> Tuple[str, Tuple[str, str], Tuple[str, str, str]]:
+        return village.state, (village.state, village.district), (village.state, village.district, village.block)
+
+    def _index(self, village: VillageProfile) -> None:
+        state, district, block = self._keys(village)
+        self._by_state.setdefault(state, set()).add(village.village_code)
+        self._by_district.setdefault(district, set()).add(village.village_code)
+        self._by_block.setdefault(block, set()).add(village.village_code)
+
+    def _unindex(self, village: VillageProfile) -> None:
+        for index, key in zip((self._by_state, self._by_district, self._by_block), self._keys(village)):
+            codes = index[key]
+            codes.discard(village.village_code)
+            if not codes:
+                del index[key]
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Call listener with every stored village now, then with every later change"""
+        with self._lock:
+            self._listeners.append(listener)
+            for stored in self._villages.values():
+                listener(stored.profile.village_code, stored.profile)
+
+    def _notify(self, village_code: str, village: Optional[VillageProfile]) -> None:
+        for listener in self._listeners:
+            listener(village_code, village)
+
+    # Writes
+
+    def upsert(self, village: VillageProfile) -> Tuple[int, bool]:
+        """Insert or replace a profile; returns its version and whether anything changed"""
+        with self._lock:
+            stored = self._villages.get(village.village_code)
+            if stored is not None and stored.profile == village:
+                return stored.version, False
+            if stored is not None:
+                self._unindex(stored.profile)
+            self.version += 1
+            version = stored.version + 1 if stored is not None else 1
+            self._villages[village.village_code] = StoredVillage(village, version, datetime.now().isoformat())
+            self._index(village)
+            self._notify(village.village_code, village)
+            return version, True
+
+    def bulk_load(self, villages: Iterable[VillageProfile], replace: bool = False) -> Dict[str, int]:
+        """
+        Upsert many profiles under one lock
+
+        With replace, villages missing from the load are deleted, so the store
+        mirrors the loaded set exactly. Returns inserted/updated/unchanged/deleted counts.
+        """
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+        with self._lock:
+            loaded: Set[str] = set()
+            for village in villages:
+                existed = village.village_code in self._villages
+                _, changed = self.upsert(village)
+                loaded.add(village.village_code)
+                counts["unchanged" if not changed else "updated" if existed else "inserted"] += 1
+            if replace:
+                for village_code in [code for code in self._villages if code not in loaded]:
+                    self.delete(village_code)
+                    counts["deleted"] += 1
+        logger.info(f"Village store bulk load: {counts} (store version {self.version})")
+        return counts
+
+    def delete(self, village_code: str) -> bool:
+        """Remove a village; returns False if it was not stored"""
+        with self._lock:
+            stored = self._villages.pop(village_code, None)
+            if stored is None:
+                return False
+            self._unindex(stored.profile)
+            self.version += 1
+            self._notify(village_code, None)
+            return True
+
+    # Reads
+
+    def get(self, village_code: str) -> Optional[StoredVillage]:
+        return self._villages.get(village_code)
+
+    def get_many(self, village_codes: Iterable[str]) -> Tuple[List[VillageProfile], List[str]]:
+        """Profiles for the given codes in request order, plus the codes not in the store"""
+        found, missing = [], []
+        for village_code in village_codes:
+            stored = self._villages.get(village_code)
+            if stored is None:
+                missing.append(village_code)
+            else:
+                found.append(stored.profile)
+        return found, missing
+
+    def select(self, state: Optional[str] = None, district: Optional[str] = None, block: Optional[str] = None) -> List[VillageProfile]:
+        """
+        Profiles in an admin region, ordered by village_code
+
+        Regions are addressed top-down: a district needs its state and a block its
+        state and district. With no filter every stored village is returned.
+        """
+        if (block is not None and district is None) or (district is not None and state is None):
+            raise ValueError("Admin filters require the parent levels: state for a district, state and district for a block")
+        with self._lock:
+            if block is not None:
+                codes = self._by_block.get((state, district, block), set())
+            elif district is not None:
+                codes = self._by_district.get((state, district), set())
+            elif state is not None:
+                codes = self._by_state.get(state, set())
+            else:
+                codes = self._villages.keys()
+            return [self._villages[code].profile for code in sorted(codes)]
+
+    def stats(self) -> Dict[str, Any]:
+        """Store size, version and per-state village counts"""
+        with self._lock:
+            return {
+                "villages": len(self._villages),
+                "version": self.version,
+                "states": {state: len(codes) for state, codes in sorted(self._by_state.items())},
+                "districts": len(self._by_district),
+                "blocks": len(self._by_block)
+            }
+
+# Shared village profile store served by the DSS routes
+village_store = VillageProfileStore()
@@ -0,0 +1,49 @@
+"""
+Benchmark: budget optimizer over a national village table
+
+Funds the interventions of --villages villages within a budget per implementing
+ministry (or per state), single-year and phased over --years years, and reports
+candidates, runtime and the worst optimality gap against the LP upper bound.
+Budgets are set to --budget-share of each group's total candidate cost per year.
+
+Run from the backend directory:
+    python -m benchmarks.bench_budget --villages 170000 --years 5
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.dss_budget import GROUP_BY_CHOICES, budget_candidates
+from app.services.dss_columnar import VillageColumns
+from app.services.dss_service import DSSEngine
+from benchmarks.population import village_columns
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--villages", type=int, default=170000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--group-by", choices=GROUP_BY_CHOICES, default="ministry")
+    parser.add_argument("--budget-share", type=float, default=0.1, help="Annual budget as a share of each group's candidate cost")
+    args = parser.parse_args()
+
+    engine = DSSEngine()
+    villages = VillageColumns.from_arrays(**village_columns(args.villages))
+    candidates = budget_candidates(villages, engine.prioritize_interventions_columnar(villages), engine.intervention_rules, args.group_by)
+    groups, codes = np.unique(candidates.group, return_inverse=True)
+    totals = np.bincount(codes.ravel(), weights=candidates.cost, minlength=len(groups))
+    budgets = {str(group): float(total * args.budget_share) for group, total in zip(groups, totals)}
+    print(f"{len(villages):,d} villages, {len(candidates):,d} candidate interventions, {len(budgets)} {args.group_by} budgets")
+
+    for years in sorted({1, args.years}):
+        start = time.perf_counter()
+        plan = engine.optimize_budget(villages, budgets, args.group_by, years)
+        report = plan.to_dict()
+        seconds = time.perf_counter() - start
+        worst_gap = max(group["optimality_gap"] for group in report["groups"].values())
+        summary = report["summary"]
+        print(f"  years={years}: {seconds:6.3f}s  funded {summary['funded']:,d}  spent {summary['total_spent']:,.0f}  worst gap {worst_gap:.4%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Benchmark: bulk eligibility throughput across process-pool worker counts
+
+Run from the backend directory:
+    python -m benchmarks.bench_bulk_eligibility --holders 200000 --workers 1 2 4 8
+"""
+
+import argparse
+import time
+
+from app.services.dss_parallel import ShardedEligibilityExecutor
+from benchmarks.population import make_holders
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--holders", type=int, default=200000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--shard-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    holders = make_holders(args.holders)
+    print(f"holders={args.holders} shard_size={args.shard_size}")
+
+    for workers in args.workers:
+        executor = ShardedEligibilityExecutor(shard_size=args.shard_size, max_workers=workers)
+        # Warm the pool so worker start-up is not counted
+        executor.assess(holders[:args.shard_size * workers + 1])
+
+        start = time.perf_counter()
+        results = executor.assess(holders)
+        elapsed = time.perf_counter() - start
+        executor.shutdown()
+
+        assert len(results) == len(holders)
+        print(f"workers={workers:2d}  {elapsed:7.2f}s  {len(holders) / elapsed:12,.0f} holders/sec")
+
+if __name__ == "__main__":
+    main()
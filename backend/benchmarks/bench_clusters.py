@@ -0,0 +1,70 @@
+"""
+Benchmark: spatial clustering of priority villages
+
+Evaluates --villages villages, then clusters those with CRITICAL interventions
+at each --eps-km radius and reports runtime, cluster count and the share of
+cost bundled into clusters. The grid neighbour search is compared with a
+chunked brute-force haversine scan over all pairs on --sample villages.
+
+Run from the backend directory:
+    python -m benchmarks.bench_clusters --villages 170000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.dss_clustering import dbscan_labels, haversine_km, neighbour_pairs
+from app.services.dss_columnar import VillageColumns
+from app.services.dss_service import DSSEngine
+from benchmarks.population import village_columns
+
+def _brute_force_pairs(latitude: np.ndarray, longitude: np.ndarray, eps_km: float) -> int:
+    pairs = 0
+    for start in range(0, latitude.shape[0], 1024):
+        distances = haversine_km(latitude[start:start + 1024, None], longitude[start:start + 1024, None], latitude, longitude)
+        pairs += int((distances <= eps_km).sum()) - distances.shape[0]
+    return pairs // 2
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--villages", type=int, default=170000)
+    parser.add_argument("--eps-km", type=float, nargs="+", default=[2.0, 5.0, 10.0])
+    parser.add_argument("--min-villages", type=int, default=3)
+    parser.add_argument("--sample", type=int, default=5000, help="Villages compared against the brute-force scan")
+    args = parser.parse_args()
+
+    engine = DSSEngine()
+    villages = VillageColumns.from_arrays(**village_columns(args.villages))
+    print(f"{len(villages):,d} villages")
+
+    for eps_km in args.eps_km:
+        start = time.perf_counter()
+        report = engine.cluster_priority_villages(villages, eps_km=eps_km, min_villages=args.min_villages).to_dict(max_listed_villages=0)
+        seconds = time.perf_counter() - start
+        summary = report["summary"]
+        bundled = summary["clustered_cost"] / max(summary["clustered_cost"] + summary["unbundled_cost"], 1.0)
+        largest = report["clusters"][0]["villages"] if report["clusters"] else 0
+        print(
+            f"  eps={eps_km:5.1f} km: {seconds:6.3f}s  {summary['candidate_villages']:,d} candidates  "
+            f"{summary['clusters']:,d} clusters (largest {largest:,d} villages)  {bundled:.1%} of cost bundled"
+        )
+
+    rng = np.random.default_rng(0)
+    sample = rng.choice(len(villages), min(args.sample, len(villages)), replace=False)
+    latitude, longitude = villages.latitude[sample], villages.longitude[sample]
+    eps_km = max(args.eps_km)
+    start = time.perf_counter()
+    grid_pairs = sum(first.shape[0] for first, _ in neighbour_pairs(latitude, longitude, eps_km))
+    grid_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    scan_pairs = _brute_force_pairs(latitude, longitude, eps_km)
+    scan_seconds = time.perf_counter() - start
+    print(f"  {len(sample):,d} villages at eps={eps_km:g} km: grid {grid_seconds:.3f}s vs. scan {scan_seconds:.3f}s ({grid_pairs:,d} / {scan_pairs:,d} pairs)")
+    start = time.perf_counter()
+    labels = dbscan_labels(latitude, longitude, eps_km, args.min_villages)
+    print(f"  dbscan over the sample: {time.perf_counter() - start:.3f}s, {len(np.unique(labels[labels >= 0])):,d} clusters")
+
+if __name__ == "__main__":
+    main()
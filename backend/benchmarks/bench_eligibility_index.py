@@ -0,0 +1,81 @@
+"""
+Benchmark: eligibility bitmap index over stored FRA holders
+
+Builds the index over --holders holders, then times:
+    cohort        AND/OR/AND-NOT cohort queries on the bitmaps
+    scan          the same cohorts as a NumPy scan of the per-row status matrix
+    reassess      the same cohorts by re-assessing every holder columnarly
+    upsert        incremental re-indexing of --changed holders
+    save/load     persisting the index and holder records to an .npz file
+
+Run from the backend directory:
+    python -m benchmarks.bench_eligibility_index --holders 1000000 --changed 10000
+"""
+
+from typing import Callable
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.dss_columnar import SCHEME_INDEX, STATUS_INDEX, HolderColumns
+from app.services.dss_eligibility_index import EligibilityIndex
+from app.services.dss_service import DSSEngine, EligibilityStatus, SchemeType
+from benchmarks.population import make_holders
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--holders", type=int, default=1000000)
+    parser.add_argument("--villages", type=int, default=10000)
+    parser.add_argument("--changed", type=int, default=10000, help="Holders re-indexed in the incremental update")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = DSSEngine()
+    holders = make_holders(args.holders, args.villages)
+    state = holders[0].state
+    path = os.path.join(tempfile.mkdtemp(), "eligibility_index.npz")
+    index = EligibilityIndex(engine, path)
+
+    start = time.perf_counter()
+    index.rebuild(holders)
+    print(f"{len(index):,d} holders indexed in {time.perf_counter() - start:.2f}s, {index.stats()['bitmap_bytes'] / 2**20:.1f} MiB of bitmaps")
+
+    all_of = [(SchemeType.PM_KISAN, EligibilityStatus.ELIGIBLE)]
+    any_of = [(SchemeType.PM_AWAS_GRAMIN, EligibilityStatus.ELIGIBLE), (SchemeType.AYUSHMAN_BHARAT, EligibilityStatus.ELIGIBLE)]
+    none_of = [(SchemeType.MGNREGA, EligibilityStatus.NOT_ELIGIBLE)]
+    state_code = index._state_codes[state]
+
+    def scan(status: np.ndarray, states: np.ndarray) -> int:
+        def matches(term):
+            return status[:, SCHEME_INDEX[term[0]]] == STATUS_INDEX[term[1]]
+        mask = (states == state_code) & matches(all_of[0]) & (matches(any_of[0]) | matches(any_of[1])) & ~matches(none_of[0])
+        return int(np.count_nonzero(mask))
+
+    rows = len(index._holder_ids)
+    count = len(index.cohort(all_of, any_of, none_of, state))
+    assert count == scan(index._status[:rows], index._state[:rows])
+    print(f"cohort in {state}: {count:,d} holders")
+    print(f"  cohort      {_best_of(args.repeat, lambda: index.cohort(all_of, any_of, none_of, state)) * 1000:10.3f} ms")
+    print(f"  scan        {_best_of(args.repeat, lambda: scan(index._status[:rows], index._state[:rows])) * 1000:10.3f} ms")
+    columns = HolderColumns.from_holders(holders)
+    print(f"  reassess    {_best_of(1, lambda: engine.assess_eligibility_columnar(columns)) * 1000:10.3f} ms (assessment only)")
+
+    changed = holders[:args.changed]
+    eligibilities = [engine.assess_individual_eligibility(holder) for holder in changed]
+    print(f"  upsert      {_best_of(1, lambda: index.upsert_many(changed, eligibilities)) * 1000:10.3f} ms for {len(changed):,d} holders")
+    print(f"  save        {_best_of(1, index.save) * 1000:10.3f} ms, {os.path.getsize(path) / 2**20:.1f} MiB on disk")
+    print(f"  load        {_best_of(1, lambda: EligibilityIndex(engine, path)) * 1000:10.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: cost of filtered bulk DSS requests
+
+Compares, for /eligibility/bulk and /interventions/bulk shaped work:
+    post_filter   evaluate everything, then drop the unrequested schemes/priorities
+    pushed_down   pass schemes_filter/priority_filter to the engine
+    projected     pushed_down, encoded without reasons/required_documents (reasoning)
+
+Timings include JSON encoding with dss_json.dumps.
+
+Run from the backend directory:
+    python -m benchmarks.bench_filters --holders 20000 --villages 20000
+"""
+
+from typing import Callable, Dict
+import argparse
+import time
+
+from app.services.dss_json import dumps, projection
+from app.services.dss_service import DSSEngine, InterventionPriority, InterventionRecommendation, SchemeEligibility, SchemeType
+from benchmarks.population import make_holders, make_villages
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _report(name: str, records: int, timings: Dict[str, float]) -> None:
+    print(f"{name}: {records:,d} records")
+    baseline = timings["post_filter"]
+    for variant, seconds in timings.items():
+        print(f"  {variant:12s} {seconds:8.3f}s  {records / seconds:12,.0f} records/sec  {seconds / baseline:6.1%} of post_filter")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--holders", type=int, default=20000)
+    parser.add_argument("--villages", type=int, default=20000)
+    parser.add_argument("--scheme", default=SchemeType.MGNREGA.value, help="Scheme requested in schemes_filter")
+    parser.add_argument("--priority", default=InterventionPriority.CRITICAL.value, help="Priority requested in priority_filter")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = DSSEngine()
+
+    holders = make_holders(args.holders)
+    schemes = [SchemeType(args.scheme)]
+    drop_details = projection(SchemeEligibility, ("reasons", "required_documents"))
+    _report(f"eligibility/bulk schemes_filter={args.scheme}", len(holders), {
+        "post_filter": _best_of(args.repeat, lambda: dumps({
+            holder.holder_id: [e for e in engine.assess_individual_eligibility(holder) if e.scheme in schemes]
+            for holder in holders
+        })),
+        "pushed_down": _best_of(args.repeat, lambda: dumps({
+            holder.holder_id: engine.assess_individual_eligibility(holder, schemes) for holder in holders
+        })),
+        "projected": _best_of(args.repeat, lambda: dumps({
+            holder.holder_id: [drop_details(e) for e in engine.assess_individual_eligibility(holder, schemes)]
+            for holder in holders
+        }))
+    })
+
+    villages = make_villages(args.villages)
+    priority = InterventionPriority(args.priority)
+    drop_reasoning = projection(InterventionRecommendation, ("reasoning",))
+    _report(f"interventions/bulk priority_filter={args.priority}", len(villages), {
+        "post_filter": _best_of(args.repeat, lambda: dumps({
+            village.village_code: [i for i in engine.prioritize_village_interventions(village) if i.priority == priority]
+            for village in villages
+        })),
+        "pushed_down": _best_of(args.repeat, lambda: dumps({
+            village.village_code: engine.prioritize_village_interventions(village, priority) for village in villages
+        })),
+        "projected": _best_of(args.repeat, lambda: dumps({
+            village.village_code: [drop_reasoning(i) for i in engine.prioritize_village_interventions(village, priority)]
+            for village in villages
+        }))
+    })
+
+if __name__ == "__main__":
+    main()
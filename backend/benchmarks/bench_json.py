@@ -0,0 +1,88 @@
+"""
+Benchmark: response encoding share of bulk DSS request latency
+
+Compares, for /eligibility/bulk and /interventions/bulk shaped responses:
+    response_model   convert_* to pydantic response models, validate against the
+                     route's response_model and dump to JSON (FastAPI's default path)
+    direct           dss_json.dumps over the engine dataclasses
+
+and reports each encoder's share of engine + encoding time.
+
+Run from the backend directory:
+    python -m benchmarks.bench_json --holders 20000 --villages 20000
+"""
+
+from typing import Callable, Dict, List
+import argparse
+import time
+
+from pydantic import TypeAdapter
+
+from app.api.dss_routes import (
+    InterventionRecommendationResponse,
+    SchemeEligibilityResponse,
+    convert_eligibility_response,
+    convert_intervention_response
+)
+from app.services.dss_json import ENCODER_NAME, dumps
+from app.services.dss_service import DSSEngine
+from benchmarks.population import make_holders, make_villages
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _report(name: str, records: int, engine_seconds: float, encoders: Dict[str, float]) -> None:
+    print(f"{name}: {records:,d} records, engine {engine_seconds:.3f}s")
+    for encoder, seconds in encoders.items():
+        share = seconds / (engine_seconds + seconds)
+        print(f"  {encoder:15s} {seconds:8.3f}s  {records / seconds:12,.0f} records/sec  {share:6.1%} of latency")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--holders", type=int, default=20000)
+    parser.add_argument("--villages", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = DSSEngine()
+    print(f"direct encoder: {ENCODER_NAME}")
+
+    holders = make_holders(args.holders)
+    start = time.perf_counter()
+    eligibility = {holder.holder_id: engine.assess_individual_eligibility(holder) for holder in holders}
+    engine_seconds = time.perf_counter() - start
+
+    eligibility_adapter = TypeAdapter(Dict[str, List[SchemeEligibilityResponse]])
+    def eligibility_response_model() -> bytes:
+        content = {holder_id: [convert_eligibility_response(e) for e in results] for holder_id, results in eligibility.items()}
+        return eligibility_adapter.dump_json(eligibility_adapter.validate_python(content))
+
+    assert eligibility_response_model() == dumps(eligibility)
+    _report("eligibility/bulk", len(holders), engine_seconds, {
+        "response_model": _best_of(args.repeat, eligibility_response_model),
+        "direct": _best_of(args.repeat, lambda: dumps(eligibility))
+    })
+
+    villages = make_villages(args.villages)
+    start = time.perf_counter()
+    interventions = {village.village_code: engine.prioritize_village_interventions(village) for village in villages}
+    engine_seconds = time.perf_counter() - start
+
+    intervention_adapter = TypeAdapter(Dict[str, List[InterventionRecommendationResponse]])
+    def intervention_response_model() -> bytes:
+        content = {code: [convert_intervention_response(i) for i in results] for code, results in interventions.items()}
+        return intervention_adapter.dump_json(intervention_adapter.validate_python(content))
+
+    assert intervention_response_model() == dumps(interventions)
+    _report("interventions/bulk", len(villages), engine_seconds, {
+        "response_model": _best_of(args.repeat, intervention_response_model),
+        "direct": _best_of(args.repeat, lambda: dumps(interventions))
+    })
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: memory per FRA holder for domain records and bulk eligibility results
+
+Compares the previous representation (dict-backed dataclasses, a fresh list of
+reason/document strings per result) with slotted dataclasses sharing interned
+reason/document tuples, and with the array-backed EligibilityResultSet.
+
+Run from the backend directory:
+    python -m benchmarks.bench_memory --holders 1000000
+"""
+
+from dataclasses import fields, make_dataclass
+from operator import attrgetter
+import argparse
+import gc
+import tracemalloc
+
+from app.services.dss_columnar import EligibilityResultSet
+from app.services.dss_service import FRAHolder, SchemeEligibility, dss_engine
+from benchmarks.population import make_holders
+
+# Dict-backed replicas of the domain dataclasses as they were before slots
+LegacyFRAHolder = make_dataclass("LegacyFRAHolder", [(f.name, f.type) for f in fields(FRAHolder)])
+LegacySchemeEligibility = make_dataclass("LegacySchemeEligibility", [(f.name, f.type) for f in fields(SchemeEligibility)])
+
+# Field values without copying them (dataclasses.astuple would copy the shared tuples)
+holder_values = attrgetter(*(f.name for f in fields(FRAHolder)))
+eligibility_values = attrgetter(*(f.name for f in fields(SchemeEligibility)))
+
+def _legacy_eligibility(eligibility: SchemeEligibility):
+    """Rebuild a result the old way, with its own reason/document lists"""
+    return LegacySchemeEligibility(
+        eligibility.scheme,
+        eligibility.status,
+        eligibility.confidence_score,
+        eligibility.eligible_amount,
+        list(eligibility.reasons),
+        list(eligibility.required_documents),
+        eligibility.timeline_months
+    )
+
+def measure(build) -> tuple:
+    """Bytes allocated and still live after build(), and the built object"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--holders", type=int, default=1000000)
+    args = parser.parse_args()
+    count = args.holders
+
+    holders = make_holders(count)
+    print(f"holders={count}")
+
+    def report(label: str, size: int) -> None:
+        print(f"{label:42s} {size / count:10,.1f} bytes/holder  {size / 2**20:10,.1f} MiB")
+
+    # Holder records: only the record objects themselves, field values are shared
+    legacy_size, legacy_holders = measure(lambda: [LegacyFRAHolder(*holder_values(h)) for h in holders])
+    del legacy_holders
+    slotted_size, slotted_holders = measure(lambda: [FRAHolder(*holder_values(h)) for h in holders])
+    del slotted_holders
+    report("FRAHolder (dict-backed)", legacy_size)
+    report("FRAHolder (slots)", slotted_size)
+
+    # Eligibility results: computed once, then held in each representation
+    results = [dss_engine.assess_individual_eligibility(h) for h in holders]
+
+    legacy_size, legacy_results = measure(lambda: [[_legacy_eligibility(e) for e in r] for r in results])
+    del legacy_results
+    slotted_size, slotted_results = measure(lambda: [[SchemeEligibility(*eligibility_values(e)) for e in r] for r in results])
+    del slotted_results
+    packed_size, packed = measure(lambda: EligibilityResultSet.from_results((h.holder_id for h in holders), results))
+
+    report("Eligibility results (dict-backed, lists)", legacy_size)
+    report("Eligibility results (slots, shared tuples)", slotted_size)
+    report("EligibilityResultSet (arrays)", packed_size)
+
+    assert packed[count - 1] == results[count - 1]
+
+if __name__ == "__main__":
+    main()
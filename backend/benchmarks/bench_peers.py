@@ -0,0 +1,70 @@
+"""
+Benchmark: peer village k-NN search
+
+Loads --villages villages into a profile store followed by the peer index, then
+reports the index build time, per-query latency (median and p99) of k-nearest
+peer queries for each scope against a NumPy brute-force scan, and the cost of
+incremental profile updates.
+
+Run from the backend directory:
+    python -m benchmarks.bench_peers --villages 170000 --k 10
+"""
+
+import argparse
+import dataclasses
+import time
+
+import numpy as np
+
+from app.services.dss_peers import PEER_FEATURES, SCOPES, VillagePeerIndex
+from app.services.dss_village_store import VillageProfileStore
+from benchmarks.population import make_villages
+
+def _latencies(func, arguments) -> np.ndarray:
+    timings = []
+    for argument in arguments:
+        start = time.perf_counter()
+        func(argument)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1e6
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--villages", type=int, default=170000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--updates", type=int, default=5000, help="Profiles changed in the incremental update")
+    args = parser.parse_args()
+
+    villages = make_villages(args.villages)
+    store = VillageProfileStore()
+    index = VillagePeerIndex(store)
+    store.bulk_load(villages)
+    start = time.perf_counter()
+    index.rebuild()
+    print(f"{len(index):,d} villages indexed in {time.perf_counter() - start:.2f}s: {index.stats()}")
+
+    rng = np.random.default_rng(0)
+    codes = [villages[i].village_code for i in rng.choice(len(villages), args.queries)]
+    points = np.array([[getattr(village, feature) for feature in PEER_FEATURES] for village in villages])
+
+    def brute_force(code: str) -> np.ndarray:
+        offsets = points - points[index._rows[code]]
+        return np.argpartition(np.einsum("ij,ij->i", offsets, offsets), args.k)[:args.k + 1]
+
+    for scope in SCOPES:
+        timings = _latencies(lambda code: index.nearest(code, args.k, scope), codes)
+        print(f"  {scope:9s} median {np.median(timings):8.1f} us  p99 {np.percentile(timings, 99):8.1f} us")
+    timings = _latencies(brute_force, codes[:200])
+    print(f"  {'scan':9s} median {np.median(timings):8.1f} us  (national brute force)")
+
+    changed = [dataclasses.replace(village, water_index=float(rng.uniform(0, 100))) for village in villages[:args.updates]]
+    start = time.perf_counter()
+    for village in changed:
+        store.upsert(village)
+    print(f"  {len(changed):,d} profile updates applied in {(time.perf_counter() - start) * 1000:.1f} ms: {index.stats()}")
+    timings = _latencies(lambda code: index.nearest(code, args.k), codes)
+    print(f"  {'buffered':9s} median {np.median(timings):8.1f} us  p99 {np.percentile(timings, 99):8.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: single-pass policy report vs. the previous multi-pass pipeline
+
+The multi-pass reference below reproduces the old generate_policy_recommendations
+cost profile: prioritize_village_interventions three times per village (regional
+priorities, resource allocation, timeline) plus separate scans of the village list
+for each coverage gap and the high-priority count.
+
+Run from the backend directory:
+    python -m benchmarks.bench_policy_report --villages 100000 --holders 100000
+"""
+
+import argparse
+import time
+
+from app.services.dss_service import DSSEngine, InterventionPriority, EligibilityStatus
+from benchmarks.population import make_villages, make_holders
+
+def multi_pass_report(engine: DSSEngine, villages, holders) -> None:
+    """Evaluation pattern of the previous report pipeline"""
+    for threshold_check in (
+        lambda v: v.water_index < 50,
+        lambda v: v.electricity_index < 50,
+        lambda v: v.road_connectivity_index < 40,
+        lambda v: v.health_facility_index < 50,
+        lambda v: v.education_index < 50,
+    ):
+        [v for v in villages if threshold_check(v)]
+    [h for h in holders if not h.has_bank_account]
+    [h for h in holders if not h.aadhaar_linked]
+
+    # Regional priorities, resource allocation and timeline each re-ran the interventions
+    for _ in range(3):
+        for village in villages:
+            for intervention in engine.prioritize_village_interventions(village):
+                intervention.priority in (InterventionPriority.CRITICAL, InterventionPriority.HIGH)
+
+    for holder in holders:
+        for eligibility in engine.assess_individual_eligibility(holder):
+            eligibility.status == EligibilityStatus.ELIGIBLE
+
+    [v for v in villages if engine._is_high_priority_village(v)]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--villages", type=int, default=100000)
+    parser.add_argument("--holders", type=int, default=100000)
+    args = parser.parse_args()
+
+    engine = DSSEngine()
+    villages = make_villages(args.villages)
+    holders = make_holders(args.holders, village_count=args.villages)
+
+    start = time.perf_counter()
+    multi_pass_report(engine, villages, holders)
+    multi_pass_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.generate_policy_recommendations(villages, holders)
+    single_pass_seconds = time.perf_counter() - start
+
+    print(f"villages={args.villages} holders={args.holders}")
+    print(f"multi-pass:  {multi_pass_seconds:8.2f}s")
+    print(f"single-pass: {single_pass_seconds:8.2f}s")
+    print(f"speedup:     {multi_pass_seconds / single_pass_seconds:8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+DSS benchmark suite: throughput and peak memory of the core engine calls
+
+Cases:
+    eligibility      DSSEngine.assess_individual_eligibility per FRA holder
+    interventions    DSSEngine.prioritize_village_interventions per village
+    policy           DSSEngine.generate_policy_recommendations over holders
+                     and one village per HOLDERS_PER_VILLAGE holders
+
+Each (case, size) runs in a fresh process so peak RSS is per case. Records are
+generated from the seeded synthetic population (benchmarks.population) outside
+the timed region; eligibility and interventions consume them chunk by chunk so
+10M-record runs keep memory bounded.
+
+Timing: a warm-up pass over WARMUP_RECORDS records is discarded, then --repeat
+samples are taken and the best is reported. A sample repeats the case until at
+least --min-seconds have been timed, so small sizes are not measured from a
+single 10 ms pass. Large sizes take one pass per sample; use --repeat 1 for
+10M-record runs if the time matters more than the noise.
+
+Run from the backend directory:
+    python -m benchmarks.bench_suite --sizes 1000 100000 1000000 10000000
+    python -m benchmarks.bench_suite --save benchmarks/baseline.json
+    python -m benchmarks.bench_suite --baseline benchmarks/baseline.json --threshold 0.15
+
+With --baseline the suite exits non-zero when any case's records/sec falls more
+than --threshold below the baseline or its peak RSS grows more than
+--rss-threshold above it. Cases whose sample (in this run or the baseline)
+timed less than --min-seconds are reported as skipped rather than compared.
+"""
+
+from typing import Any, Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+
+import numpy as np
+
+from app.services.dss_service import DSSEngine
+from benchmarks.population import PopulationConfig, iter_holder_chunks, iter_village_chunks, make_holders, make_villages
+
+CASES = ("eligibility", "interventions", "policy")
+DEFAULT_SIZES = (1000, 100000, 1000000, 10000000)
+HOLDERS_PER_VILLAGE = 50
+WARMUP_RECORDS = 1000
+DEFAULT_REPEAT = 3
+DEFAULT_MIN_SECONDS = 1.0
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+def _village_count(size: int) -> int:
+    return max(size // HOLDERS_PER_VILLAGE, 1)
+
+def _timed_pass(engine: DSSEngine, case: str, size: int, config: PopulationConfig, policy_inputs: Tuple[List, List]) -> Tuple[int, float]:
+    """Records processed and seconds spent in the engine for one pass over a case"""
+    elapsed = 0.0
+    if case == "eligibility":
+        for chunk in iter_holder_chunks(size, _village_count(size), config):
+            start = time.perf_counter()
+            for holder in chunk:
+                engine.assess_individual_eligibility(holder)
+            elapsed += time.perf_counter() - start
+        return size, elapsed
+    if case == "interventions":
+        for chunk in iter_village_chunks(size, config):
+            start = time.perf_counter()
+            for village in chunk:
+                engine.prioritize_village_interventions(village)
+            elapsed += time.perf_counter() - start
+        return size, elapsed
+    if case == "policy":
+        villages, holders = policy_inputs
+        start = time.perf_counter()
+        engine.generate_policy_recommendations(villages, holders)
+        return len(villages) + len(holders), time.perf_counter() - start
+    raise ValueError(f"Unknown benchmark case '{case}'")
+
+def _policy_inputs(case: str, size: int, config: PopulationConfig) -> Tuple[List, List]:
+    if case != "policy":
+        return [], []
+    return make_villages(_village_count(size), config=config), make_holders(size, _village_count(size), config=config)
+
+def _run_case(case: str, size: int, seed: int, repeat: int = DEFAULT_REPEAT, min_seconds: float = DEFAULT_MIN_SECONDS) -> Dict[str, Any]:
+    """Run one case in the current (fresh) process: a warm-up pass, then the best of repeat samples"""
+    engine = DSSEngine()
+    config = PopulationConfig(seed=seed)
+
+    warmup_size = min(size, WARMUP_RECORDS)
+    _timed_pass(engine, case, warmup_size, config, _policy_inputs(case, warmup_size, config))
+
+    policy_inputs = _policy_inputs(case, size, config)
+    samples = []
+    for _ in range(max(repeat, 1)):
+        records, elapsed, passes = 0, 0.0, 0
+        while passes == 0 or elapsed < min_seconds:
+            pass_records, pass_seconds = _timed_pass(engine, case, size, config, policy_inputs)
+            records += pass_records
+            elapsed += pass_seconds
+            passes += 1
+        samples.append((records / elapsed if elapsed else float("inf"), elapsed, passes))
+
+    records_per_sec, sample_seconds, passes = max(samples)
+    return {
+        "records": pass_records,
+        "seconds": sample_seconds / passes,
+        "records_per_sec": records_per_sec,
+        "sample_seconds": sample_seconds,
+        "passes_per_sample": passes,
+        "samples": [rate for rate, _, _ in samples],
+        "peak_rss_mb": _peak_rss_mb()
+    }
+
+def run_suite(
+    cases: List[str],
+    sizes: List[int],
+    seed: int,
+    repeat: int = DEFAULT_REPEAT,
+    min_seconds: float = DEFAULT_MIN_SECONDS
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Run every (case, size) in its own spawned process"""
+    results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    context = multiprocessing.get_context("spawn")
+    for case in cases:
+        results[case] = {}
+        for size in sizes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(_run_case, case, size, seed, repeat, min_seconds).result()
+            results[case][str(size)] = result
+            print(
+                f"{case:14s} {size:>10,d}  {result['seconds']:9.2f}s  "
+                f"{result['records_per_sec']:12,.0f} records/sec (best of {len(result['samples'])})  "
+                f"{result['peak_rss_mb']:9,.1f} MiB peak RSS",
+                flush=True
+            )
+    return results
+
+def compare(
+    results: Dict,
+    baseline: Dict,
+    threshold: float,
+    rss_threshold: float,
+    min_seconds: float = DEFAULT_MIN_SECONDS
+) -> Tuple[List[str], List[str]]:
+    """
+    Regressions of results against a baseline run, and the cases skipped as too short to compare
+
+    A case is skipped when its sample in either run timed less than min_seconds
+    (e.g. a baseline saved by an older suite that timed a single pass).
+    """
+    regressions, skipped = [], []
+    for case, by_size in results.items():
+        for size, result in by_size.items():
+            reference = baseline.get(case, {}).get(size)
+            if reference is None:
+                continue
+            timed = min(result.get("sample_seconds", result["seconds"]), reference.get("sample_seconds", reference["seconds"]))
+            if timed < min_seconds:
+                skipped.append(f"{case} @ {size}: sample timed {timed:.3f}s, below --min-seconds {min_seconds:g}")
+                continue
+            speed = result["records_per_sec"] / reference["records_per_sec"] - 1
+            memory = result["peak_rss_mb"] / reference["peak_rss_mb"] - 1
+            if speed < -threshold:
+                regressions.append(f"{case} @ {size}: records/sec {speed:+.1%} ({reference['records_per_sec']:,.0f} -> {result['records_per_sec']:,.0f})")
+            if memory > rss_threshold:
+                regressions.append(f"{case} @ {size}: peak RSS {memory:+.1%} ({reference['peak_rss_mb']:,.1f} -> {result['peak_rss_mb']:,.1f} MiB)")
+    return regressions, skipped
+
+def _environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed samples per case; the best is reported")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS, help="Minimum timed duration of each sample")
+    parser.add_argument("--save", help="Write results (with environment details) to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a JSON file written by --save")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed records/sec drop vs. baseline (fraction)")
+    parser.add_argument("--rss-threshold", type=float, default=0.25, help="Allowed peak RSS growth vs. baseline (fraction)")
+    args = parser.parse_args()
+
+    results = run_suite(args.cases, args.sizes, args.seed, args.repeat, args.min_seconds)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump({"environment": _environment(), "seed": args.seed, "results": results}, handle, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        if baseline.get("seed") != args.seed:
+            print(f"Warning: baseline was recorded with seed {baseline.get('seed')}, this run used {args.seed}")
+        regressions, skipped = compare(results, baseline["results"], args.threshold, args.rss_threshold, args.min_seconds)
+        for case in skipped:
+            print(f"Warning: not compared, {case}")
+        if regressions:
+            print("Performance regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Seeded synthetic FRA holder and village populations for DSS benchmarks
+
+Populations are generated with NumPy in fixed-size chunks, each seeded from
+(seed, record kind, chunk index), so the same configuration always yields the
+same records regardless of how many are requested or how they are consumed.
+Records can be taken as columns (for the columnar engine), as lists, or as
+chunk iterators that keep memory bounded at 10M-record scale.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
+import numpy as np
+
+from app.services.dss_service import FRAHolder, VillageProfile
+
+# Records generated per seeded chunk
+CHUNK_SIZE = 100000
+
+# Share of generated villages/holders per state (normalized)
+DEFAULT_STATE_MIX: Dict[str, float] = {
+    "Odisha": 0.18,
+    "Chhattisgarh": 0.17,
+    "Madhya Pradesh": 0.17,
+    "Jharkhand": 0.14,
+    "Maharashtra": 0.12,
+    "Telangana": 0.08,
+    "Gujarat": 0.07,
+    "Rajasthan": 0.07,
+}
+
+# Beta(a, b) distribution of each 0-100 village index and land-use percentage
+DEFAULT_INDEX_DISTRIBUTIONS: Dict[str, Tuple[float, float]] = {
+    "water_index": (2.0, 2.5),
+    "electricity_index": (2.5, 2.0),
+    "road_connectivity_index": (1.8, 2.2),
+    "health_facility_index": (1.6, 2.4),
+    "education_index": (2.2, 2.2),
+    "livelihood_index": (1.8, 2.6),
+    "forest_cover_percent": (1.5, 2.0),
+    "agricultural_land_percent": (2.0, 2.0),
+}
+
+DEFAULT_SOCIAL_CATEGORY_MIX: Dict[str, float] = {"ST": 0.6, "SC": 0.15, "OBC": 0.15, "General": 0.1}
+DEFAULT_OCCUPATION_MIX: Dict[str, float] = {
+    "farmer": 0.45,
+    "forest_gatherer": 0.25,
+    "labourer": 0.18,
+    "artisan": 0.08,
+    "teacher": 0.03,
+    "doctor": 0.01,
+}
+
+_VILLAGE_KIND = 1
+_HOLDER_KIND = 2
+
+@dataclass
+class PopulationConfig:
+    """Shape of a synthetic population"""
+    seed: int = 42
+    # Seeds the village -> state/district/block assignment; holders and villages generated
+    # with different seeds still join on village_code as long as this matches
+    geography_seed: int = 42
+    state_mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_STATE_MIX))
+    districts_per_state: int = 30
+    blocks_per_district: int = 12
+    index_distributions: Dict[str, Tuple[float, float]] = field(default_factory=lambda: dict(DEFAULT_INDEX_DISTRIBUTIONS))
+    social_category_mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_SOCIAL_CATEGORY_MIX))
+    occupation_mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_OCCUPATION_MIX))
+    bank_account_rate: float = 0.8
+    aadhaar_rate: float = 0.85
+    toilet_rate: float = 0.5
+    electricity_rate: float = 0.7
+    unknown_income_rate: float = 0.1
+    median_income: float = 90000.0
+
+def _choice(rng: np.random.Generator, mix: Dict[str, float], size: int) -> np.ndarray:
+    labels = np.array(list(mix))
+    weights = np.array(list(mix.values()), dtype=np.float64)
+    return labels[rng.choice(len(labels), size=size, p=weights / weights.sum())]
+
+def _chunks(count: int) -> Iterator[Tuple[int, int, int]]:
+    """(chunk index, first record, record count) of each seeded chunk"""
+    for index, start in enumerate(range(0, count, CHUNK_SIZE)):
+        yield index, start, min(CHUNK_SIZE, count - start)
+
+def _rng(config: PopulationConfig, kind: int, chunk: int) -> np.random.Generator:
+    return np.random.default_rng([config.seed, kind, chunk])
+
+def _hash_uniform(config: PopulationConfig, numbers: np.ndarray, salt: int) -> np.ndarray:
+    """Deterministic uniform [0, 1) value per record number (SplitMix64)"""
+    x = numbers.astype(np.uint64) + np.uint64((config.geography_seed * 0x9E3779B9 + salt * 0x85EBCA6B) % 2**64)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x = x ^ (x >> np.uint64(31))
+    return (x >> np.uint64(11)).astype(np.float64) / 2**53
+
+def _admin_units(config: PopulationConfig, village_numbers: np.ndarray) -> Dict[str, np.ndarray]:
+    """State, district and block of each village, derived from its number so holders can join to it"""
+    states = np.array(list(config.state_mix))
+    weights = np.cumsum(np.array(list(config.state_mix.values()), dtype=np.float64))
+    state = states[np.minimum(np.searchsorted(weights / weights[-1], _hash_uniform(config, village_numbers, 1), side="right"), len(states) - 1)]
+    district_number = (_hash_uniform(config, village_numbers, 2) * config.districts_per_state).astype(np.int64) + 1
+    block_number = (_hash_uniform(config, village_numbers, 3) * config.blocks_per_district).astype(np.int64) + 1
+    district = np.char.add(np.char.add(state, " District "), district_number.astype(str))
+    block = np.char.add(np.char.add(district, " Block "), block_number.astype(str))
+    return {"state": state, "district": district, "block": block}
+
+def _village_codes(numbers: np.ndarray) -> np.ndarray:
+    return np.char.add("V", np.char.zfill(numbers.astype(str), 8))
+
+def village_chunk(config: PopulationConfig, chunk: int, start: int, size: int) -> Dict[str, np.ndarray]:
+    """Columns of one seeded chunk of villages"""
+    columns = _village_chunk(config, chunk, start)
+    return {name: column[:size] for name, column in columns.items()}
+
+def _village_chunk(config: PopulationConfig, chunk: int, start: int) -> Dict[str, np.ndarray]:
+    # Always draw a full chunk so a record does not depend on how many were requested
+    rng = _rng(config, _VILLAGE_KIND, chunk)
+    size = CHUNK_SIZE
+    numbers = np.arange(start, start + size)
+    households = rng.integers(40, 600, size)
+    population = households * rng.integers(4, 7, size)
+    st_share = rng.beta(3.0, 2.0, size)
+
+    columns = _admin_units(config, numbers)
+    columns.update({
+        "village_code": _village_codes(numbers),
+        "village_name": np.char.add("Village ", numbers.astype(str)),
+        "total_households": households,
+        "st_households": (households * st_share).astype(np.int64),
+        "sc_households": (households * rng.uniform(0.0, 0.25, size)).astype(np.int64),
+        "total_population": population,
+        "st_population": (population * st_share).astype(np.int64),
+        "latitude": rng.uniform(17.0, 25.0, size),
+        "longitude": rng.uniform(73.0, 87.0, size),
+    })
+    for index_name, (a, b) in config.index_distributions.items():
+        columns[index_name] = rng.beta(a, b, size) * 100
+    return columns
+
+def holder_chunk(config: PopulationConfig, chunk: int, start: int, size: int, village_count: int) -> Dict[str, np.ndarray]:
+    """Columns of one seeded chunk of FRA holders spread over village_count villages"""
+    columns = _holder_chunk(config, chunk, start, village_count)
+    return {name: column[:size] for name, column in columns.items()}
+
+def _holder_chunk(config: PopulationConfig, chunk: int, start: int, village_count: int) -> Dict[str, np.ndarray]:
+    rng = _rng(config, _HOLDER_KIND, chunk)
+    size = CHUNK_SIZE
+    numbers = np.arange(start, start + size)
+    income = np.round(rng.lognormal(np.log(config.median_income), 0.6, size), -2)
+    income[rng.random(size) < config.unknown_income_rate] = np.nan
+    village_numbers = rng.integers(0, max(village_count, 1), size)
+
+    # Holders share the admin units of the village they live in
+    columns = _admin_units(config, village_numbers)
+    del columns["block"]
+    columns.update({
+        "holder_id": np.char.add("H", np.char.zfill(numbers.astype(str), 9)),
+        "name": np.char.add("Holder ", numbers.astype(str)),
+        "family_size": rng.integers(1, 11, size),
+        "land_area_hectares": np.round(rng.gamma(2.0, 0.6, size), 2),
+        "annual_income": income,
+        "social_category": _choice(rng, config.social_category_mix, size),
+        "has_bank_account": rng.random(size) < config.bank_account_rate,
+        "aadhaar_linked": rng.random(size) < config.aadhaar_rate,
+        "village_code": _village_codes(village_numbers),
+        "age": rng.integers(16, 86, size),
+        "gender": np.where(rng.random(size) < 0.5, "Male", "Female"),
+        "education_level": np.array(["none", "primary", "secondary"])[rng.integers(0, 3, size)],
+        "occupation": _choice(rng, config.occupation_mix, size),
+        "has_electricity": rng.random(size) < config.electricity_rate,
+        "has_toilet": rng.random(size) < config.toilet_rate,
+        "water_source": np.array(["well", "hand_pump", "river", "tap"])[rng.integers(0, 4, size)],
+    })
+    return columns
+
+def _records(record_type, columns: Dict[str, np.ndarray], optional: Tuple[str, ...] = ()) -> List:
+    names = [f for f in record_type.__dataclass_fields__]
+    values = []
+    for name in names:
+        if name in columns:
+            column = columns[name].tolist()
+            if name in optional:
+                column = [None if value != value else value for value in column]  # NaN -> None
+            values.append(column)
+        else:
+            values.append([None] * len(next(iter(columns.values()))))
+    return [record_type(*row) for row in zip(*values)]
+
+def iter_village_chunks(count: int, config: Optional[PopulationConfig] = None) -> Iterator[List[VillageProfile]]:
+    """Villages in seeded chunks of up to CHUNK_SIZE records"""
+    config = config or PopulationConfig()
+    for chunk, start, size in _chunks(count):
+        yield _records(VillageProfile, village_chunk(config, chunk, start, size))
+
+def iter_holder_chunks(count: int, village_count: int, config: Optional[PopulationConfig] = None) -> Iterator[List[FRAHolder]]:
+    """FRA holders in seeded chunks of up to CHUNK_SIZE records"""
+    config = config or PopulationConfig()
+    for chunk, start, size in _chunks(count):
+        yield _records(FRAHolder, holder_chunk(config, chunk, start, size, village_count), optional=("annual_income",))
+
+def village_columns(count: int, config: Optional[PopulationConfig] = None) -> Dict[str, np.ndarray]:
+    """All villages as columns, e.g. for VillageColumns.from_arrays"""
+    config = config or PopulationConfig()
+    chunks = [village_chunk(config, chunk, start, size) for chunk, start, size in _chunks(count)]
+    return {name: np.concatenate([c[name] for c in chunks]) for name in chunks[0]} if chunks else {}
+
+def holder_columns(count: int, village_count: int, config: Optional[PopulationConfig] = None) -> Dict[str, np.ndarray]:
+    """All FRA holders as columns, e.g. for HolderColumns.from_arrays"""
+    config = config or PopulationConfig()
+    chunks = [holder_chunk(config, chunk, start, size, village_count) for chunk, start, size in _chunks(count)]
+    return {name: np.concatenate([c[name] for c in chunks]) for name in chunks[0]} if chunks else {}
+
+def make_villages(count: int, seed: int = 42, config: Optional[PopulationConfig] = None) -> List[VillageProfile]:
+    """Generate a reproducible list of village profiles"""
+    config = config or PopulationConfig(seed=seed)
+    return [village for chunk in iter_village_chunks(count, config) for village in chunk]
+
+def make_holders(count: int, village_count: int = 1000, seed: int = 7, config: Optional[PopulationConfig] = None) -> List[FRAHolder]:
+    """Generate a reproducible list of FRA holders spread over village_count villages"""
+    config = config or PopulationConfig(seed=seed)
+    return [holder for chunk in iter_holder_chunks(count, village_count, config) for holder in chunk]